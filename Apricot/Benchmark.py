@@ -0,0 +1,260 @@
+# Import system
+import sys
+
+# Import argument parser library
+import argparse
+
+# Import json library
+import json
+
+# Import statistics library
+import statistics
+
+# Import time library
+import time
+
+# Import memory tracing library
+import tracemalloc
+
+# Import numpy library
+import numpy as np
+
+# Import environment ( module folders on the path )
+import Environment
+
+# Import functions
+from ModelInput import ModelInput
+from Batch import Batch
+from FEM import FEM
+from Material import materials
+from Correlation import scalarRates
+
+############
+# FIXTURES #
+############
+
+# Reference model input ( same values as InputData.xlsx , no file access )
+FIXTURE = { 'kernelDiameter': 500.0 , 'bufferThickness': 100.0 , 'IPyCThickness': 40.0 , 'SiCThickness': 35.0 , 'OPyCThickness': 40.0 ,
+            'kernelDensity': 10.8 , 'bufferDensity': 0.95 , 'IPyCDensity': 1.9 , 'SiCDensity': 3.2 , 'OPyCDensity': 1.9 ,
+            'IPyCBAF': 1.03 , 'OPyCBAF': 1.03 , 'EFDP': 1000.0 , 'endLifeBumup': 10.0 , 'endLifeFluence': 3.0 , 'irridiationTemperature': 1000.0 ,
+            'endLifeInternalPressure': 26.2 , 'ambientPressure': 0.1 , 'Nelements': 2 , 'beta': 1.0 }
+
+# In memory model input with Nelements elements in total ( 4 regions )
+def fixture( Nelements: int, **values ):
+    
+    # Return model input
+    return ModelInput.fromDict( { **FIXTURE , 'Nelements': max( int( Nelements ) // 4 , 1 ) , **values } )
+
+##########
+# LADDER #
+##########
+
+# Mesh sizes ( total number of elements )
+MESH_SIZES = ( 10**2 , 10**3 , 10**4 , 10**5 , 10**6 )
+
+# Population sizes ( number of particles , 10**5 needs about 3.5 GB )
+BATCH_SIZES = ( 10**2 , 10**3 , 10**4 )
+
+# Material sizes ( number of PyC / SiC pairs with distinct fluences )
+MATERIAL_SIZES = ( 10**1 , 10**2 , 10**3 )
+
+# Benchmark phases
+PHASES = ( 'materials' , 'init' , 'assembly' , 'solve' , 'post' , 'batch' )
+
+###########
+# MEASURE #
+###########
+
+# Measure a phase - setup() builds the phase input ( not measured ) and run( state ) is the measured phase
+# Returns the median and minimum wall time over repeats and the traced peak memory of one extra run
+def measure( setup, run, repeats: int = 3 ):
+    
+    # Wall times
+    times = [ ]
+    
+    # Loop over repeats ( no tracing overhead on the timings )
+    for _ in range( repeats ):
+        state = setup()
+        start = time.perf_counter()
+        run( state )
+        times.append( time.perf_counter() - start )
+    
+    # Traced run ( numpy allocations are reported to tracemalloc )
+    state = setup()
+    tracemalloc.start()
+    run( state )
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    # Return timings and peak memory [ bytes ]
+    return statistics.median( times ), min( times ), peak
+
+##########
+# PHASES #
+##########
+
+# Solved finite element problem of a fixture
+def solved( model: ModelInput, PyC, SiC ):
+    
+    # Finite element initialization , assembly and solve
+    fem = FEM( model, PyC, SiC )
+    fem.assembly()
+    fem.solve()
+    
+    # Return finite element problem
+    return fem
+
+# Setup and measured run of the material initialization and irridiation correlation ( size = number of material pairs )
+def materialPhase( size: int ):
+    
+    # Distinct fluences
+    phi = np.linspace( 1.0 , 10.0 , int( size ) )
+    
+    # Return setup and run ( the setup clears the memoized correlation so every repeat evaluates it )
+    return ( lambda: scalarRates.cache_clear() ), ( lambda state: [ materials( value , 1000.0 , 'b' ) for value in phi ] )
+
+# Setup and measured run per mesh phase ( size = number of elements )
+def meshPhase( phase: str, size: int ):
+    
+    # Fixture and materials
+    model = fixture( size )
+    PyC, SiC = materials( 10.0 , 1000.0 , 'b' )
+    
+    # Finite element initialization ( mesh , material matrices , element views )
+    if( phase == 'init' ):
+        return ( lambda: None ), ( lambda state: FEM( model, PyC, SiC ) )
+    
+    # Element kernel and global assembly
+    if( phase == 'assembly' ):
+        return ( lambda: FEM( model, PyC, SiC ) ), ( lambda fem: fem.assembly() )
+    
+    # Factorization and solve
+    if( phase == 'solve' ):
+        def setup():
+            fem = FEM( model, PyC, SiC )
+            fem.assembly()
+            return fem
+        return setup, ( lambda fem: fem.solve() )
+    
+    # Gauss point and nodal strains , stresses and peak stresses
+    return ( lambda: solved( model, PyC, SiC ) ), ( lambda fem: fem.postProcessing() )
+
+# Setup and measured run of a population ( size = number of particles with 4 x 25 elements )
+def batchPhase( size: int ):
+    
+    # Fixture and materials
+    model = fixture( 100 )
+    PyC, SiC = materials( 10.0 , 1000.0 , 'b' )
+    
+    # Particle fluences ( distinct values exercise the material state table )
+    phi = np.linspace( 1.0 , 10.0 , int( size ) )
+    
+    # Batch initialization , assembly and solve
+    def run( state ):
+        batch = Batch( model, PyC, SiC, phi = phi )
+        batch.assembly()
+        batch.solve()
+    
+    # Return setup and run
+    return ( lambda: None ), run
+
+#######
+# RUN #
+#######
+
+# Run the benchmark ladder - Returns one row per phase and size
+def benchmark( phases: tuple = PHASES, meshSizes: tuple = MESH_SIZES, batchSizes: tuple = BATCH_SIZES, repeats: int = 3, progress: bool = True ):
+    
+    # Benchmark rows
+    rows = [ ]
+    
+    # Loop over phases
+    for phase in phases:
+        
+        # Phase sizes , throughput unit and setup
+        if( phase == 'materials' ):
+            sizes, unit, phaseSetup = MATERIAL_SIZES, 'materials', materialPhase
+        elif( phase == 'batch' ):
+            sizes, unit, phaseSetup = batchSizes, 'particles', batchPhase
+        else:
+            sizes, unit, phaseSetup = meshSizes, 'elements', ( lambda size: meshPhase( phase , size ) )
+        
+        # Loop over sizes
+        for size in sizes:
+            
+            # Phase setup and run
+            setup, run = phaseSetup( size )
+            
+            # Measure
+            median, best, peak = measure( setup , run , repeats )
+            
+            # Row allocation
+            row = { 'phase': phase , 'size': int( size ) , 'unit': unit , 'time': median , 'best': best , 'peakMB': peak / 2**20 , 'throughput': size / max( median , 1.0e-12 ) }
+            rows.append( row )
+            
+            # Progress
+            if( progress ):
+                print( '%-10s %9d %-9s time = %.4e s  best = %.4e s  peak = %9.2f MB  %.3e %s / s' % ( phase , size , unit , median , best , row[ 'peakMB' ] , row[ 'throughput' ] , unit ) , file = sys.stderr , flush = True )
+    
+    # Return rows
+    return rows
+
+###############
+# REGRESSIONS #
+###############
+
+# Rows slower than the baseline by more than tolerance ( relative ) - Rows missing from the baseline are skipped
+def regressions( rows: list, baseline: list, tolerance: float = 0.2 ):
+    
+    # Baseline times per phase and size
+    reference = { ( row[ 'phase' ] , row[ 'size' ] ): row[ 'time' ] for row in baseline }
+    
+    # Return regressed rows ( row , baseline time )
+    return [ ( row , reference[ ( row[ 'phase' ] , row[ 'size' ] ) ] ) for row in rows if ( row[ 'phase' ] , row[ 'size' ] ) in reference and row[ 'time' ] > ( 1.0 + tolerance ) * reference[ ( row[ 'phase' ] , row[ 'size' ] ) ] ]
+
+#######################
+# COMMAND LINE DRIVER #
+#######################
+
+# Command line driver
+def main( argv: list = None ):
+    
+    # Argument parser
+    parser = argparse.ArgumentParser( description = 'APRICOT benchmark ladder for initialization, assembly, solve, post processing and populations' )
+    parser.add_argument( '--phases' , nargs = '+' , default = list( PHASES ) , choices = PHASES , help = 'phases to measure' )
+    parser.add_argument( '--sizes' , type = int , nargs = '+' , default = list( MESH_SIZES ) , help = 'mesh sizes [ elements ]' )
+    parser.add_argument( '--batch' , type = int , nargs = '+' , default = list( BATCH_SIZES ) , help = 'population sizes [ particles ]' )
+    parser.add_argument( '--repeats' , type = int , default = 3 , help = 'timed repeats per phase and size' )
+    parser.add_argument( '--output' , default = None , help = 'output json file with the benchmark rows' )
+    parser.add_argument( '--baseline' , default = None , help = 'baseline json file to check regressions against' )
+    parser.add_argument( '--tolerance' , type = float , default = 0.2 , help = 'allowed relative slowdown against the baseline' )
+    parser.add_argument( '--quiet' , action = 'store_true' , help = 'no progress reporting' )
+    args = parser.parse_args( argv )
+    
+    # Run benchmark
+    rows = benchmark( args.phases , args.sizes , args.batch , args.repeats , not args.quiet )
+    
+    # Write rows
+    if( args.output is not None ):
+        with open( args.output , 'w' ) as file:
+            json.dump( rows , file , indent = 1 )
+    
+    # No baseline
+    if( args.baseline is None ):
+        return 0
+    
+    # Baseline rows
+    with open( args.baseline ) as file:
+        baseline = json.load( file )
+    
+    # Loop over regressions
+    slower = regressions( rows , baseline , args.tolerance )
+    for row, reference in slower:
+        print( 'REGRESSION %-10s %9d %s time = %.4e s ( baseline %.4e s , %+.0f%% )' % ( row[ 'phase' ] , row[ 'size' ] , row[ 'unit' ] , row[ 'time' ] , reference , 100.0 * ( ( row[ 'time' ] / reference ) - 1.0 ) ) )
+    
+    # Exit status ( 1 on regressions )
+    return 1 if slower else 0
+
+# Run from the command line
+if( __name__ == '__main__' ):
+    sys.exit( main() )
@@ -0,0 +1,25 @@
+# Import system
+import sys
+
+# Import operating system library
+import os
+
+###############
+# MODULE PATH #
+###############
+
+# Apricot root folder ( folder of this file )
+ROOT = os.path.dirname( os.path.abspath( __file__ ) )
+
+# Module folders imported by bare module name
+FOLDERS = ( 'Material' , 'ModelInput' , 'FEM' , 'Failure' , 'Profiler' )
+
+# Append path of the functions ( independent of the working folder )
+for folder in FOLDERS:
+    
+    # Folder path
+    path = os.path.join( ROOT , folder )
+    
+    # Append path only once
+    if( path not in sys.path ):
+        sys.path.append( path )
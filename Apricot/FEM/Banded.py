@@ -0,0 +1,210 @@
+# Import numpy library
+import numpy as np
+
+# Import banded solver library
+from scipy.linalg import solve_banded, get_lapack_funcs
+
+#########################
+# BANDED MATRIX STORAGE #
+#########################
+
+# Banded storage follows the LAPACK convention used by scipy.linalg.solve_banded:
+# the entry K[ i , j ] of the full matrix is stored in Kb[ upper + i - j , j ]
+
+#####################
+# BANDED ALLOCATION #
+#####################
+
+# Allocate banded storage for a square matrix of size N
+def zerosBanded( N: int, lower: int, upper: int ):
+    
+    # Banded storage initialization
+    return np.zeros( ( lower + upper + 1 , N ) )
+
+###################
+# BANDED TO DENSE #
+###################
+
+# Expand banded storage into the full matrix ( verification only )
+def bandedToDense( Kb: np.ndarray, lower: int, upper: int ):
+    
+    # Matrix size
+    N = Kb.shape[ 1 ]
+    
+    # Dense matrix initialization
+    K = np.zeros( ( N , N ) )
+    
+    # Loop over diagonals
+    for k in range( - lower , upper + 1 ):
+        
+        # Diagonal offset in banded storage
+        row = upper - k
+        
+        # Copy diagonal ( super diagonals are stored right aligned, sub diagonals left aligned )
+        if( k >= 0 ):
+            K[ np.arange( N - k ) , np.arange( k , N ) ] = Kb[ row , k: ]
+        else:
+            K[ np.arange( - k , N ) , np.arange( N + k ) ] = Kb[ row , :N + k ]
+    
+    # Return dense matrix
+    return K
+
+###################
+# DENSE TO BANDED #
+###################
+
+# Compress the full matrix into banded storage
+def denseToBanded( K: np.ndarray, lower: int, upper: int ):
+    
+    # Matrix size
+    N = K.shape[ 0 ]
+    
+    # Banded storage initialization
+    Kb = zerosBanded( N, lower, upper )
+    
+    # Loop over diagonals
+    for k in range( - lower , upper + 1 ):
+        
+        # Diagonal offset in banded storage
+        row = upper - k
+        
+        # Copy diagonal
+        if( k >= 0 ):
+            Kb[ row , k: ] = np.diagonal( K , k )
+        else:
+            Kb[ row , :N + k ] = np.diagonal( K , k )
+    
+    # Return banded storage
+    return Kb
+
+##################
+# BANDED PRODUCT #
+##################
+
+# Matrix vector product K.u with K in banded storage
+def bandedProduct( Kb: np.ndarray, u: np.ndarray, lower: int, upper: int ):
+    
+    # Matrix size
+    N = Kb.shape[ 1 ]
+    
+    # Product initialization
+    F = np.zeros( N )
+    
+    # Loop over diagonals
+    for k in range( - lower , upper + 1 ):
+        
+        # Diagonal offset in banded storage
+        row = upper - k
+        
+        # Diagonal product ( super diagonals are stored right aligned, sub diagonals left aligned )
+        if( k >= 0 ):
+            F[ :N - k ] += Kb[ row , k: ] * u[ k: ]
+        else:
+            F[ - k: ] += Kb[ row , :N + k ] * u[ :N + k ]
+    
+    # Return product
+    return F
+
+################
+# BANDED SOLVE #
+################
+
+# Solve K.u = F with K in banded storage
+def solveBanded( Kb: np.ndarray, F: np.ndarray, lower: int, upper: int ):
+    
+    # Solve banded system ( LAPACK gbsv )
+    return solve_banded( ( lower , upper ) , Kb , F , check_finite = False )
+
+########################
+# BANDED FACTORIZATION #
+########################
+
+# LU factorization of K in banded storage ( LAPACK gbtrf )
+def factorBanded( Kb: np.ndarray, lower: int, upper: int ):
+    
+    # LAPACK routines for the matrix type
+    gbtrf, = get_lapack_funcs( ( 'gbtrf' , ) , ( Kb , ) )
+    
+    # Factorization storage needs lower extra rows for the fill in of the pivoting
+    ab = np.zeros( ( ( 2 * lower ) + upper + 1 , Kb.shape[ 1 ] ) , dtype = Kb.dtype )
+    ab[ lower: , : ] = Kb
+    
+    # LU factorization
+    lu, piv, info = gbtrf( ab , lower , upper , overwrite_ab = True )
+    
+    # Check singular matrix
+    if( info > 0 ):
+        raise np.linalg.LinAlgError( 'Singular global stiffness ( zero pivot on row %d )' % info )
+    
+    # Return factorization
+    return lu, piv
+
+#######################
+# BANDED FACTOR SOLVE #
+#######################
+
+# Solve K.u = F from the LU factorization of K ( LAPACK gbtrs ) - F can hold several right hand sides as columns
+def solveFactoredBanded( factorization: tuple, F: np.ndarray, lower: int, upper: int ):
+    
+    # Factorization
+    lu, piv = factorization
+    
+    # LAPACK routines for the matrix type
+    gbtrs, = get_lapack_funcs( ( 'gbtrs' , ) , ( lu , ) )
+    
+    # Back substitution
+    u, info = gbtrs( lu , lower , upper , F , piv )
+    
+    # Return solution
+    return u
+
+#############################
+# BATCHED TRIDIAGONAL SOLVE #
+#############################
+
+# Solve a stack of tridiagonal systems K.u = F with the Thomas algorithm vectorized over the stack
+# Kb has shape ( ..., 3, N ) in banded storage with lower = upper = 1 and F has shape ( ..., N )
+# No pivoting is done - the FEM stiffness matrices are diagonally dominant
+def solveTridiagonalBatch( Kb: np.ndarray, F: np.ndarray ):
+    
+    # Number of unknowns
+    N = Kb.shape[ -1 ]
+    
+    # Super diagonal ( K[ i , i + 1 ] )
+    c = Kb[ ..., 0 , 1: ]
+    
+    # Diagonal ( K[ i , i ] )
+    b = Kb[ ..., 1 , : ]
+    
+    # Sub diagonal ( K[ i + 1 , i ] )
+    a = Kb[ ..., 2 , :-1 ]
+    
+    # Modified super diagonal and right hand side initialization
+    cp = np.zeros( F.shape[ :-1 ] + ( N - 1 , ) )
+    dp = np.zeros( F.shape )
+    
+    # Forward elimination - first row
+    cp[ ..., 0 ] = c[ ..., 0 ] / b[ ..., 0 ]
+    dp[ ..., 0 ] = F[ ..., 0 ] / b[ ..., 0 ]
+    
+    # Forward elimination - remaining rows
+    for i in range( 1 , N ):
+        
+        # Pivot
+        m = b[ ..., i ] - ( a[ ..., i - 1 ] * cp[ ..., i - 1 ] )
+        
+        # Modified super diagonal
+        if( i < N - 1 ):
+            cp[ ..., i ] = c[ ..., i ] / m
+        
+        # Modified right hand side
+        dp[ ..., i ] = ( F[ ..., i ] - ( a[ ..., i - 1 ] * dp[ ..., i - 1 ] ) ) / m
+    
+    # Back substitution
+    u = np.zeros( F.shape )
+    u[ ..., N - 1 ] = dp[ ..., N - 1 ]
+    for i in range( N - 2 , -1 , -1 ):
+        u[ ..., i ] = dp[ ..., i ] - ( cp[ ..., i ] * u[ ..., i + 1 ] )
+    
+    # Return solution
+    return u
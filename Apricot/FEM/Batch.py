@@ -0,0 +1,440 @@
+# Import dataclass library
+from dataclasses import dataclass
+
+# Import list library
+import typing
+
+# Import copy library
+import copy
+
+# Import namespace library
+from types import SimpleNamespace
+
+# Import numpy library
+import numpy as np
+
+# Import functions
+from ModelInput import ModelInput
+from Material import Material
+from Correlation import CORRELATIONS, irridiationRates
+from Mesh import REGIONS, PROJECTIONS, projectToNodes, averageToNodes, elementToNodes
+from Element import constitutiveMatrix, irridiationMatrix, gMatrix
+from Kernel import elementKernel, stressKernel
+from Quadrature import quadrature
+from Mesher import MESHERS, uniformMesh, layerMesh
+from Banded import solveTridiagonalBatch
+from Profiler import timed
+
+############
+# GEOMETRY #
+############
+
+# Geometry parameters that can vary per particle
+GEOMETRY = ( 'kernelDiameter' , 'bufferThickness' , 'IPyCThickness' , 'SiCThickness' , 'OPyCThickness' )
+
+###################
+# MATERIAL STATES #
+###################
+
+# Material properties of every particle at its own fluence and temperature
+# Each distinct ( phi , T ) pair is evaluated once on a copy of the material struct , the irridiation correlation over all fluences at once
+def materialStates( material: Material, phi: np.ndarray, T: np.ndarray ):
+    
+    # Distinct fluence and temperature pairs
+    pairs, inverse = np.unique( np.stack( ( phi , T ) , axis = 1 ) , axis = 0 , return_inverse = True )
+    
+    # Properties initialization
+    properties = { name: np.zeros( pairs.shape[ 0 ] ) for name in ( 'E' , 'v' , 'K' , 'vc' , 'er' , 'et' ) }
+    
+    # Loop over distinct pairs
+    for i, ( phii, Ti ) in enumerate( pairs ):
+        
+        # Material copy on the particle conditions
+        state = copy.copy( material )
+        state.phi = phii
+        state.T = Ti
+        
+        # Update temperature dependent creep coefficient
+        state.setCreepDependent( state.K_temp )
+        
+        # Properties allocation
+        for name in properties:
+            properties[ name ][ i ] = getattr( state , name )
+    
+    # Irridiation correlation evaluated over every distinct fluence at once
+    if( material.irrCase in CORRELATIONS ):
+        properties[ 'er' ], properties[ 'et' ] = irridiationRates( material.irrCase , pairs[ :, 0 ] )
+    
+    # Return properties per particle
+    return { name: values[ inverse.ravel() ] for name, values in properties.items() }
+
+###############
+# BATCH CLASS #
+###############
+
+# Batch class initialization - Population of particles meshed, assembled and solved together
+@dataclass
+class Batch:
+    
+    #######################
+    # NUMBER OF PARTICLES #
+    #######################
+    
+    # Number of particles
+    Nparticles: int
+    
+    ##############################
+    # NUMBER OF ELEMENTS # NODES #
+    ##############################
+    
+    # Number of elements and nodes per particle
+    Nelements: int
+    Nnodes: int
+    
+    #####################
+    # METHOD MULTIPLIER #
+    #####################
+    
+    # Method multiplier ( 0 = explicit / 0.5 = Crank Nicholson / 1.0 = implicit )
+    beta: float
+    
+    ####################
+    # GAUSS QUADRATURE #
+    ####################
+    
+    # Number of gauss points per element ( 2 to 6 - a single point at r = 0 leaves the stiffness singular )
+    Ngauss: int
+    
+    ############
+    # GEOMETRY #
+    ############
+    
+    # Geometry parameters per particle ( Nparticles each )
+    geometry: 'typing.Any'
+    
+    #########################
+    # FLUENCE / TEMPERATURE #
+    #########################
+    
+    # Fast fluence and temperature per particle ( Nparticles )
+    phi: np.ndarray
+    T: np.ndarray
+    
+    #####################
+    # SURFACE PRESSURES #
+    #####################
+    
+    # Inner and outer surface pressures per particle [ MPa ] ( Nparticles x 2 )
+    pressure: np.ndarray
+    
+    ########
+    # MESH #
+    ########
+    
+    # Nodal radial coordinates ( Nparticles x Nnodes )
+    x: np.ndarray
+    
+    # Element connectivity ( Nelements x 2 )
+    connectivity: np.ndarray
+    
+    # Element region and material index ( Nelements )
+    region: np.ndarray
+    material: np.ndarray
+    
+    #############
+    # MATERIALS #
+    #############
+    
+    # Material properties per particle and material ( Nparticles x Nmaterials )
+    properties: 'typing.Any'
+    
+    ###########
+    # THERMAL #
+    ###########
+    
+    # Element irridiation creep coefficient per particle ( Nparticles x Nelements , None = material values , see Thermal.creepCoefficients )
+    elementK: 'typing.Any'
+    
+    ################
+    # NODAL FIELDS #
+    ################
+    
+    # Nodal D parameters and irridiation ( Nparticles x Nnodes )
+    d11: np.ndarray
+    d12: np.ndarray
+    er: np.ndarray
+    et: np.ndarray
+    
+    ##################
+    # GLOBAL SYSTEMS #
+    ##################
+    
+    # Stacked global stiffness in banded storage ( Nparticles x 3 x Nnodes )
+    K: np.ndarray
+    
+    # Stacked global force vectors ( Nparticles x Nnodes )
+    F: np.ndarray
+    
+    ###########
+    # RESULTS #
+    ###########
+    
+    # Nodal displacements ( Nparticles x Nnodes )
+    u: np.ndarray
+    
+    ###################
+    # POST PROCESSING #
+    ###################
+    
+    # Gauss point radial coordinates ( Nparticles x Nelements x Ngauss )
+    rGauss: np.ndarray
+    
+    # Gauss point strains and stresses ( Nparticles x Nelements x Ngauss x 2 )
+    epsilonGauss: np.ndarray
+    sigmaGauss: np.ndarray
+    
+    # Nodal strains and stresses ( Nparticles x Nnodes x 2 )
+    epsilonNodes: np.ndarray
+    sigmaNodes: np.ndarray
+    
+    # Peak ( maximum ) radial and tangential stresses per particle and region ( Nparticles x 4 x 2 )
+    peakStress: np.ndarray
+    
+    ##################
+    # INITIALIZATION #
+    ##################
+    
+    # Initialization - Geometry, fluence and temperature default to the model and material values
+    # Inner and outer pressures default to the model end of life internal pressure and ambient pressure
+    @timed( 'Batch.init' )
+    def __init__ ( self, model: ModelInput, PyC: Material, SiC: Material, phi: np.ndarray = None, T: np.ndarray = None, innerPressure: np.ndarray = None, outerPressure: np.ndarray = None, kernelDiameter: np.ndarray = None, bufferThickness: np.ndarray = None, IPyCThickness: np.ndarray = None, SiCThickness: np.ndarray = None, OPyCThickness: np.ndarray = None, Ngauss: int = 2, mesher: str = 'uniform', counts: tuple = None, grading: float = 1.0, projection: str = 'length', elementK: np.ndarray = None ):
+        
+        ############
+        # GEOMETRY #
+        ############
+        
+        # Geometry given per particle
+        given = dict( kernelDiameter = kernelDiameter , bufferThickness = bufferThickness , IPyCThickness = IPyCThickness , SiCThickness = SiCThickness , OPyCThickness = OPyCThickness )
+        
+        # Geometry arrays ( model value when not given )
+        geometry = { name: np.atleast_1d( np.asarray( getattr( model , name ) if given[ name ] is None else given[ name ] , dtype = float ) ) for name in GEOMETRY }
+        
+        # Fast fluence and temperature arrays ( material value when not given )
+        phi = np.atleast_1d( np.asarray( PyC.phi if phi is None else phi , dtype = float ) )
+        T = np.atleast_1d( np.asarray( PyC.T if T is None else T , dtype = float ) )
+        
+        # Inner and outer pressure arrays ( model value when not given )
+        innerPressure = np.atleast_1d( np.asarray( model.endLifeInternalPressure if innerPressure is None else innerPressure , dtype = float ) )
+        outerPressure = np.atleast_1d( np.asarray( model.ambientPressure if outerPressure is None else outerPressure , dtype = float ) )
+        
+        # Number of particles
+        self.Nparticles = int( np.broadcast_shapes( phi.shape , T.shape , innerPressure.shape , outerPressure.shape , *( value.shape for value in geometry.values() ) )[ 0 ] )
+        
+        # Broadcast every parameter to the number of particles
+        self.geometry = { name: np.broadcast_to( value , ( self.Nparticles , ) ) for name, value in geometry.items() }
+        self.phi = np.broadcast_to( phi , ( self.Nparticles , ) )
+        self.T = np.broadcast_to( T , ( self.Nparticles , ) )
+        self.pressure = np.stack( ( np.broadcast_to( innerPressure , ( self.Nparticles , ) ) , np.broadcast_to( outerPressure , ( self.Nparticles , ) ) ) , axis = 1 )
+        
+        # Method multiplier
+        self.beta = model.beta
+        
+        # Number of gauss points ( checked against the quadrature registry )
+        self.Ngauss = quadrature( Ngauss ).n
+        
+        # Check under integrated elements ( a single point at r = 0 leaves the stiffness singular )
+        if( self.Ngauss < 2 ):
+            raise ValueError( 'Linear elements need at least 2 gauss points ( got %d )' % self.Ngauss )
+        
+        ########
+        # MESH #
+        ########
+        
+        # Check mesher ( given nodes do not follow the per particle geometry )
+        if( mesher not in MESHERS[ :2 ] ):
+            
+            # Unknown mesher
+            raise ValueError( "Unknown batch mesher '%s' ( expected %s )" % ( mesher , ' or '.join( "'%s'" % name for name in MESHERS[ :2 ] ) ) )
+        
+        # Initial length ( Kernel radius )
+        Li = self.geometry[ 'kernelDiameter' ] / 2.0
+        
+        # Legacy mesh ( same spacing as FEM )
+        if( mesher == 'uniform' ):
+            
+            # Total length
+            L = self.geometry[ 'bufferThickness' ] + self.geometry[ 'IPyCThickness' ] + self.geometry[ 'SiCThickness' ] + self.geometry[ 'OPyCThickness' ]
+            
+            # Coordinates and regions ( Buffer / IPyC / SiC / OPyC with model.Nelements elements each )
+            self.x, region = uniformMesh( Li, L, model.Nelements )
+        
+        # Interface aligned mesh ( same element counts on every particle , nodes on each particle interfaces )
+        else:
+            
+            # Elements per layer
+            counts = ( int( model.Nelements ) , ) * 4 if counts is None else tuple( int( n ) for n in counts )
+            
+            # Coordinates and regions
+            self.x, region = layerMesh( Li, tuple( self.geometry[ name ] for name in GEOMETRY[ 1: ] ), counts, grading )
+        
+        # Number of elements and nodes per particle
+        self.Nelements = region.size
+        self.Nnodes = self.Nelements + 1
+        
+        # Element connectivity
+        self.connectivity = np.stack( ( np.arange( self.Nelements ) , np.arange( 1 , self.Nnodes ) ) , axis = 1 )
+        
+        # Region definition ( Buffer / IPyC / SiC / OPyC )
+        self.region = region.astype( np.int8 )
+        
+        # Material definition ( PyC everywhere except on the SiC region )
+        self.material = np.where( self.region == 2 , 1 , 0 ).astype( np.int8 )
+        
+        #############
+        # MATERIALS #
+        #############
+        
+        # Material properties per particle
+        states = [ materialStates( material , self.phi , self.T ) for material in ( PyC , SiC ) ]
+        
+        # Properties stacked per material ( Nparticles x Nmaterials )
+        self.properties = { name: np.stack( [ state[ name ] for state in states ] , axis = 1 ) for name in states[ 0 ] }
+        
+        # Check element creep coefficients
+        if( elementK is not None and ( np.ndim( elementK ) not in ( 1 , 2 ) or np.shape( elementK )[ -1 ] != self.Nelements ) ):
+            raise ValueError( 'Element creep coefficients must have %d values per particle ( got shape %s )' % ( self.Nelements , np.shape( elementK ) ) )
+        
+        # Element creep coefficients allocation ( shared by every particle when given once )
+        self.elementK = None if elementK is None else np.broadcast_to( np.asarray( elementK , dtype = float ) , ( self.Nparticles , self.Nelements ) )
+        
+        ######################
+        # INITIAL CONDITIONS #
+        ######################
+        
+        # Element properties ( Nparticles x Nelements )
+        E = self.properties[ 'E' ][ :, self.material ]
+        v = self.properties[ 'v' ][ :, self.material ]
+        
+        # Check nodal projection
+        if( projection not in PROJECTIONS ):
+            raise ValueError( "Unknown nodal projection '%s' ( expected %s )" % ( projection , ' or '.join( "'%s'" % name for name in PROJECTIONS ) ) )
+        
+        # Element to nodes projection ( element lengths per particle )
+        h = np.diff( self.x , axis = 1 )
+        toNodes = ( lambda values: projectToNodes( values , h ) ) if projection == 'length' else elementToNodes
+        
+        # Nodal D parameters
+        self.d11 = toNodes( E * ( 1.0 - v ) / ( ( 1.0 + v ) + ( 1.0 - ( 2.0 * v ) ) ) )
+        self.d12 = toNodes( E * ( 2.0 * v ) / ( ( 1.0 + v ) + ( 1.0 - ( 2.0 * v ) ) ) )
+        
+        # Nodal irridiation
+        self.er = toNodes( self.properties[ 'er' ][ :, self.material ] )
+        self.et = toNodes( self.properties[ 'et' ][ :, self.material ] )
+    
+    ############
+    # ASSEMBLY #
+    ############
+    
+    # Assembly of every particle system at once
+    @timed( 'Batch.assembly' )
+    def assembly( self ):
+        
+        # Element connectivity
+        connectivity = self.connectivity
+        
+        # Element poisson ratio ( Nparticles x Nelements )
+        v = self.properties[ 'v' ][ :, self.material ]
+        
+        # Evaluate all element matrices of all particles at once
+        Ke, Fei, Fee = elementKernel( self.x[ :, connectivity ], self.d11[ :, connectivity ], self.d12[ :, connectivity ], self.er[ :, connectivity ], self.et[ :, connectivity ], v, Ngauss = self.Ngauss )
+        
+        # Stacked global stiffness in banded storage ( K[ i , j ] is stored in K[ 1 + i - j , j ] )
+        self.K = np.zeros( ( self.Nparticles , 3 , self.Nnodes ) )
+        self.K[ :, 1 , :-1 ] += Ke[ ..., 0 , 0 ]
+        self.K[ :, 0 , 1:  ] += Ke[ ..., 0 , 1 ]
+        self.K[ :, 2 , :-1 ] += Ke[ ..., 1 , 0 ]
+        self.K[ :, 1 , 1:  ] += Ke[ ..., 1 , 1 ]
+        
+        # Stacked global force vectors ( internal plus external )
+        self.F = np.zeros( ( self.Nparticles , self.Nnodes ) )
+        self.F[ :, :-1 ] += Fei[ ..., 0 ] + Fee[ ..., 0 ]
+        self.F[ :, 1:  ] += Fei[ ..., 1 ] + Fee[ ..., 1 ]
+        
+        # Surface pressure loads ( inner surface pushed outwards and outer surface pushed inwards , see FEM.pressureForces )
+        self.F[ :, 0  ] += 4.0 * np.pi * self.pressure[ :, 0 ] / self.d11[ :, 0 ]
+        self.F[ :, -1 ] -= 4.0 * np.pi * self.pressure[ :, 1 ] / self.d11[ :, -1 ]
+    
+    #########
+    # SOLVE #
+    #########
+    
+    # Solve every particle system ( stresses are recovered by postProcessing )
+    @timed( 'Batch.solve' )
+    def solve( self ):
+        
+        ###################
+        # SOLVE # K.u = F #
+        ###################
+        
+        # Batched tridiagonal solve
+        self.u = solveTridiagonalBatch( self.K , self.F )
+    
+    #############################
+    # ELEMENT MATERIAL MATRICES #
+    #############################
+    
+    # Constitutive, irridiation and G matrices per particle and element ( Nparticles x Nelements x 2 x 2 )
+    # Element creep coefficients ( see elementK ) replace the material values in the irridiation and G matrices
+    def elementMaterialMatrices( self ):
+        
+        # Constitutive and irridiation matrices per particle and material - Equations (2) and (4)
+        C = constitutiveMatrix( SimpleNamespace( E = self.properties[ 'E' ] , v = self.properties[ 'v' ] ) )
+        A = irridiationMatrix( SimpleNamespace( K = self.properties[ 'K' ] , vc = self.properties[ 'vc' ] ) )
+        
+        # Matrices gathered per element
+        Ce, Ae = C[ :, self.material ], A[ :, self.material ]
+        
+        # Material G matrices gathered per element - Equation (8)
+        if( self.elementK is None ):
+            return Ce, Ae, gMatrix( C , A , self.beta , self.phi[ :, None ] )[ :, self.material ]
+        
+        # Irridiation matrices of the element creep coefficients - Equation (4)
+        Ae = irridiationMatrix( SimpleNamespace( K = self.elementK , vc = self.properties[ 'vc' ][ :, self.material ] ) )
+        
+        # Return element matrices with the element G matrices - Equation (8)
+        return Ce, Ae, gMatrix( Ce , Ae , self.beta , self.phi[ :, None ] )
+    
+    ###################
+    # POST PROCESSING #
+    ###################
+    
+    # Strains and stresses on every gauss point and node of every particle at once , nodal averages and peak stresses per region
+    @timed( 'Batch.postProcessing' )
+    def postProcessing( self ):
+        
+        # Element nodal arrays ( Nparticles x Nelements x 2 )
+        connectivity = self.connectivity
+        xe, ue, ere, ete = self.x[ :, connectivity ], self.u[ :, connectivity ], self.er[ :, connectivity ], self.et[ :, connectivity ]
+        
+        # Element G matrices per particle - Equation (8) ( element creep coefficients included )
+        _, _, Ge = self.elementMaterialMatrices()
+        
+        # Strains and stresses on the gauss points ( Nparticles x Nelements x Ngauss x 2 )
+        self.rGauss, self.epsilonGauss, self.sigmaGauss = stressKernel( xe, ue, ere, ete, Ge, quadrature( self.Ngauss ).points )
+        
+        # Strains and stresses on the element nodes
+        _, epsilonElementNodes, sigmaElementNodes = stressKernel( xe, ue, ere, ete, Ge, np.array( [ - 1.0 , + 1.0 ] ) )
+        
+        # Element length weighted nodal averages ( Nparticles x Nnodes x 2 )
+        h = np.diff( self.x , axis = 1 )
+        self.epsilonNodes = averageToNodes( epsilonElementNodes , connectivity , h , self.Nnodes )
+        self.sigmaNodes = averageToNodes( sigmaElementNodes , connectivity , h , self.Nnodes )
+        
+        # Largest stress of every element over its gauss points and nodes ( Nparticles x Nelements x 2 )
+        elementPeak = np.maximum( self.sigmaGauss.max( axis = 2 ) , sigmaElementNodes.max( axis = 2 ) )
+        
+        # Peak stresses per particle and region ( Nparticles x 4 x 2 )
+        self.peakStress = np.stack( [ elementPeak[ :, self.region == r ].max( axis = 1 ) for r in range( len( REGIONS ) ) ] , axis = 1 )
+        
+        # Return peak stresses
+        return self.peakStress
@@ -1,257 +1,359 @@
 # Import dataclass library
 from dataclasses import dataclass
 
+# Import list library
+import typing
+
 # Import numpy library
 import numpy as np
 
-# Import inverse library
-from numpy.linalg import inv
+# Import linear algebra error
+from numpy.linalg import LinAlgError
 
 # Import functions
 from Material import Material
 from Node import Node
+from Kernel import elementKernel
+
+#################################
+# MATERIAL MATRICES # FUNCTIONS #
+#################################
+
+# Constitutive matrix - According to equation (2)
+# Material properties may be arrays, in which case the matrices are stacked on the leading axes
+def constitutiveMatrix( material: Material ):
+    
+    # Initialize constitutive matrix
+    C = np.zeros( np.shape( material.E ) + ( 2 , 2 ) )
+    
+    # Allocate constitutive matrix
+    C[ ..., 0 , 0 ] = ( + 1.0 / material.E );
+    C[ ..., 0 , 1 ] = ( - 2.0 * material.v / material.E )
+    C[ ..., 1 , 0 ] = ( - 1.0 * material.v / material.E )
+    C[ ..., 1 , 1 ] = ( + ( 1.0 - material.v ) / material.E )
+    
+    # Return constitutive matrix
+    return C
+
+# Irridiation matrix - According to equation (4)
+# Material properties may be arrays, in which case the matrices are stacked on the leading axes
+def irridiationMatrix( material: Material ):
+    
+    # Initialize irridiation matrix
+    A = np.zeros( np.broadcast_shapes( np.shape( material.K ) , np.shape( material.vc ) ) + ( 2 , 2 ) )
+    
+    # Allocate irridiation matrix
+    A[ ..., 0 , 0 ] = ( + 1.0 * material.K );
+    A[ ..., 0 , 1 ] = ( - 2.0 * material.vc * material.K )
+    A[ ..., 1 , 0 ] = ( - 1.0 * material.vc * material.K )
+    A[ ..., 1 , 1 ] = ( + ( 1.0 - material.vc ) * material.K )
+    
+    # Return irridiation matrix
+    return A
+
+# G matrix - According to equation (8)
+def gMatrix( C: np.ndarray, A: np.ndarray, beta: float, phi: float ):
+    
+    # Calculate G matrix ( fluence may be an array matching the leading axes of C and A )
+    return inverse2x2( C + ( beta * np.asarray( phi )[ ..., None, None ] * A ) )
+
+# Closed form inverse of stacked 2x2 matrices ( ..., 2, 2 )
+def inverse2x2( M: np.ndarray ):
+    
+    # Determinants
+    det = ( M[ ..., 0 , 0 ] * M[ ..., 1 , 1 ] ) - ( M[ ..., 0 , 1 ] * M[ ..., 1 , 0 ] )
+    
+    # Check singular matrices
+    if( np.any( det == 0.0 ) ):
+        raise LinAlgError( 'Singular matrix' )
+    
+    # Initialize inverse
+    Minv = np.empty( np.shape( M ) )
+    
+    # Allocate inverse ( adjugate over determinant )
+    Minv[ ..., 0 , 0 ] = + M[ ..., 1 , 1 ] / det
+    Minv[ ..., 0 , 1 ] = - M[ ..., 0 , 1 ] / det
+    Minv[ ..., 1 , 0 ] = - M[ ..., 1 , 0 ] / det
+    Minv[ ..., 1 , 1 ] = + M[ ..., 0 , 0 ] / det
+    
+    # Return inverse
+    return Minv
+
+###########################
+# MATERIAL MATRICES CACHE #
+###########################
+
+# Shared constitutive, irridiation and G matrices ( ( E , v , K , vc , beta , phi ) -> ( C , A , G ) )
+MATRIX_CACHE = { }
+
+# Maximum number of cached entries ( oldest entries are dropped first )
+MATRIX_CACHE_SIZE = 4096
+
+# Constitutive, irridiation and G matrices of a material for beta and fluence phi ( read only , shared )
+def materialMatrices( material: Material, beta: float, phi: float ):
+    
+    # Cache key from the values the matrices depend on
+    key = ( float( material.E ) , float( material.v ) , float( material.K ) , float( material.vc ) , float( beta ) , float( phi ) )
+    
+    # Cached matrices
+    matrices = MATRIX_CACHE.get( key )
+    
+    # Compute matrices once
+    if( matrices is None ):
+        
+        # Constitutive and irridiation matrices - Equations (2) and (4)
+        C = constitutiveMatrix( material )
+        A = irridiationMatrix( material )
+        
+        # G matrix - Equation (8)
+        G = gMatrix( C, A, beta, phi )
+        
+        # Shared matrices are read only
+        for matrix in ( C , A , G ):
+            matrix.setflags( write = False )
+        
+        # Drop the oldest entry
+        if( len( MATRIX_CACHE ) >= MATRIX_CACHE_SIZE ):
+            MATRIX_CACHE.pop( next( iter( MATRIX_CACHE ) ) )
+        
+        # Cache allocation
+        matrices = MATRIX_CACHE[ key ] = ( C , A , G )
+    
+    # Return matrices
+    return matrices
 
 #################
 # ELEMENT CLASS #
 #################
 
-# Element class initialization
+# Element class initialization - Lightweight view on element i of a Mesh
 @dataclass
 class Element:
     
+    ###############
+    # MESH STRUCT #
+    ###############
+    
+    # Mesh struct holding the element arrays
+    mesh: 'typing.Any'
+    
+    #########
+    # INDEX #
+    #########
+    
+    # Element index in the mesh arrays
+    index: int
+    
+    ##################
+    # INITIALIZATION #
+    ##################
+    
+    # Initialization
+    def __init__ ( self, mesh: 'typing.Any', index: int ):
+        
+        # Mesh struct allocation
+        self.mesh = mesh
+        
+        # Index allocation
+        self.index = index
+    
     ######
     # ID #
     ######
     
     # Element ID
-    ID: int
+    @property
+    def ID( self ):
+        return self.index + 1
     
-    #################
-    # NODE 1 STRUCT #
-    #################
+    ################
+    # NODE STRUCTS #
+    ################
     
     # Node 1 struct
-    node1: Node
-    
-    #################
-    # NODE 2 STRUCT #
-    #################
+    @property
+    def node1( self ):
+        return Node( self.mesh , int( self.mesh.connectivity[ self.index , 0 ] ) )
     
-    # Node 2 struct
-    node2: Node
+    # Node 2 struct ( last node of the element )
+    @property
+    def node2( self ):
+        return Node( self.mesh , int( self.mesh.connectivity[ self.index , -1 ] ) )
     
     ##########
     # REGION #
     ##########
     
     # Region name
-    region: str
+    @property
+    def region( self ):
+        
+        # Import region names ( mesh module imports this module )
+        from Mesh import REGIONS
+        
+        # Return region name
+        return REGIONS[ self.mesh.region[ self.index ] ]
     
     ###################
     # MATERIAL STRUCT #
     ###################
     
-    # Material struct
-    material: Material
-    
-    #######################
-    # CONSTITUTIVE MATRIX #
-    #######################
+    # Material index
+    @property
+    def materialIndex( self ):
+        return int( self.mesh.material[ self.index ] )
     
-    # Constitutive matrix
-    C: np.ndarray
+    # Material struct
+    @property
+    def material( self ):
+        return self.mesh.materials[ self.materialIndex ]
     
-    ######################
-    # IRRIDIATION MATRIX #
-    ######################
+    #####################
+    # MATERIAL MATRICES #
+    #####################
     
-    # Irridiation matrix
-    A: np.ndarray
+    # Constitutive matrix ( shared by every element of the material )
+    @property
+    def C( self ):
+        return self.mesh.C[ self.materialIndex ]
     
-    ############
-    # G MATRIX #
-    ############
+    # Irridiation matrix ( shared by every element of the material )
+    @property
+    def A( self ):
+        return self.mesh.A[ self.materialIndex ]
     
-    # G matrix
-    G: np.ndarray
+    # G matrix ( shared by every element of the material )
+    @property
+    def G( self ):
+        return self.mesh.G[ self.materialIndex ]
     
     ################
     # D PARAMETERS #
     ################
     
     # D parameters
-    d11: float = 0.0
-    d12: float = 0.0
+    @property
+    def d11( self ):
+        return self.mesh.elementd11[ self.index ]
+    
+    @property
+    def d12( self ):
+        return self.mesh.elementd12[ self.index ]
     
     ##########################################
     # RADIAL IRRIDIATION INDUCED CHANGE RATE #
     ##########################################
     
     # Radial irridiation induced change rate ( - )
-    er: float = 0.0
+    @property
+    def er( self ):
+        return self.mesh.elementer[ self.index ]
     
     ##############################################
     # TANGENTIAL IRRIDIATION INDUCED CHANGE RATE #
     ##############################################
     
     # Tangential irridiation induced change rate ( - )
-    et: float = 0.0
+    @property
+    def et( self ):
+        return self.mesh.elementet[ self.index ]
     
     ####################
     # STIFFNESS MATRIX #
     ####################
     
     # Stiffness matrix
-    Ke: np.ndarray = np.zeros( ( 2 , 2 ) )
+    @property
+    def Ke( self ):
+        return self.mesh.Ke[ self.index ]
     
     #########################
     # INTERNAL FORCE VECTOR #
     #########################
     
     # Internal force vector
-    Fei: np.ndarray = np.zeros( ( 2 , 1 ) )
+    @property
+    def Fei( self ):
+        return self.mesh.Fei[ self.index ].reshape( ( -1 , 1 ) )
     
     #########################
     # EXTERNAL FORCE VECTOR #
     #########################
     
     # External force vector
-    Fee: np.ndarray = np.zeros( ( 2 , 1 ) )
+    @property
+    def Fee( self ):
+        return self.mesh.Fee[ self.index ].reshape( ( -1 , 1 ) )
     
     #######################
     # DISPLACEMENT VECTOR #
     #######################
     
     # Displacement vector
-    ue: np.ndarray = np.zeros( ( 2 , 1 ) )
+    @property
+    def ue( self ):
+        return self.mesh.ue[ self.index ].reshape( ( -1 , 1 ) )
     
-    ##################
-    # INITIALIZATION #
-    ##################
-    
-    # Initialization
-    def __init__ ( self, ID: int, node1: Node, node2: Node, region:str, material:Material ):
-        
-        # ID allocation
-        self.ID = ID
-        
-        # Node 1 struct allocation
-        self.node1 = node1
-        
-        # Node 2 struct allocation
-        self.node2 = node2
-        
-        # Region allocation
-        self.region = region
-        
-        # Material struct allocation
-        self.material = material
-        
     #############################
     # SET # CONSTITUTIVE MATRIX #
     #############################
-        
+    
     # Set consitutive matrix - According to equation (2)
     def setC( self ):
         
-        ##################
-        # INITIALIZATION #
-        ##################
-        
-        # Initialize constitutive matrix
-        self.C = np.zeros( ( 2 , 2 ) )
-        
-        ##############
-        # ALLOCATION #
-        ##############
-        
-        # Allocate constitutive matrix
-        self.C[ 0 , 0 ] = ( + 1.0 / self.material.E );
-        self.C[ 0 , 1 ] = ( - 2.0 * self.material.v / self.material.E )
-        self.C[ 1 , 0 ] = ( - 1.0 * self.material.v / self.material.E )
-        self.C[ 1 , 1 ] = ( + ( 1.0 - self.material.v ) / self.material.E )
+        # Allocate constitutive matrix of the element material
+        self.mesh.C[ self.materialIndex ] = constitutiveMatrix( self.material )
     
     ############################
     # SET # IRRIDIATION MATRIX #
     ############################
-        
+    
     # Set irridiation matrix - According to equation (4)
     def setA( self ):
         
-        ##################
-        # INITIALIZATION #
-        ##################
-        
-        # Initialize irridiation matrix
-        self.A = np.zeros( ( 2 , 2 ) )
-        
-        ##############
-        # ALLOCATION #
-        ##############
-        
-        # Allocate irridiation matrix
-        self.A[ 0 , 0 ] = ( + 1.0 * self.material.K );
-        self.A[ 0 , 1 ] = ( - 2.0 * self.material.vc * self.material.K )
-        self.A[ 1 , 0 ] = ( - 1.0 * self.material.vc * self.material.K )
-        self.A[ 1 , 1 ] = ( + ( 1.0 - self.material.vc ) * self.material.K )
-        
+        # Allocate irridiation matrix of the element material
+        self.mesh.A[ self.materialIndex ] = irridiationMatrix( self.material )
+    
     ##################
     # SET # G MATRIX #
     ##################
-        
+    
     # Set G matrix - According to equation (8)
     def setG( self, beta:float ):
         
-        ###############
-        # CALCULATION #
-        ###############
-        
-        # Calculate G matrix
-        self.G = inv( self.C + ( beta * self.material.phi * self.A ) )
-        
+        # Calculate G matrix of the element material
+        self.mesh.G[ self.materialIndex ] = gMatrix( self.C, self.A, beta, self.material.phi )
+    
     ############################
     # SET # INITIAL CONDITIONS #
     ############################
-        
+    
     # Set initial conditions
     def setInitialConditions( self ):
-         
+        
         ################
         # D PARAMETERS #
         ################
         
         # Set D parameters on element
-        self.d11 = self.material.E * ( 1.0 - self.material.v ) / ( ( 1.0 + self.material.v ) + ( 1.0 - ( 2.0 * self.material.v ) ) )
-        self.d12 = self.material.E * ( 2.0 * self.material.v ) / ( ( 1.0 + self.material.v ) + ( 1.0 - ( 2.0 * self.material.v ) ) )
+        self.mesh.elementd11[ self.index ] = self.material.E * ( 1.0 - self.material.v ) / ( ( 1.0 + self.material.v ) + ( 1.0 - ( 2.0 * self.material.v ) ) )
+        self.mesh.elementd12[ self.index ] = self.material.E * ( 2.0 * self.material.v ) / ( ( 1.0 + self.material.v ) + ( 1.0 - ( 2.0 * self.material.v ) ) )
         
         # Set irridiation on element
-        self.er = self.material.er
-        self.et = self.material.et
+        self.mesh.elementer[ self.index ] = self.material.er
+        self.mesh.elementet[ self.index ] = self.material.et
         
         ###############
         # SET # NODES #
         ###############
         
-        # Set D parameters on node 1
-        self.node1.setd11( self.d11 )
-        self.node1.setd12( self.d12 )
-        
-        # Set D parameters on node 2
-        self.node2.setd11( self.d11 )
-        self.node2.setd12( self.d12 )
-        
-        # Set irridiation on node 1
-        self.node1.seter( self.material.er )
-        self.node1.setet( self.material.et )
-        
-        # Set irridiation on node 2
-        self.node2.seter( self.material.er )
-        self.node2.setet( self.material.et )
-        
+        # Nodal fields of the element nodes from the adjacent element values ( same result for any call order )
+        self.mesh.setElementNodes( self.index )
+    
     #######################
     # SET # ELEMENT MODEL #
     #######################
-        
+    
     # Set element parameters
     # Element stiffness matrix - Ke
     # Element internal force vector - Fei
@@ -260,163 +362,38 @@ class Element:
     def setElementParameters( self ):
         
         ##################
-        # INITIALIZATION #
+        # ELEMENT KERNEL #
         ##################
+        
+        # Element nodes
+        nodes = self.mesh.connectivity[ self.index ]
+        
+        # Nodal eigenstrains ( thermal strain included , same fields as FEM.assembly )
+        er, et = self.mesh.eigenstrains()
+        
+        # Evaluate batched element kernel on this element only ( gauss points of the owning FEM )
+        Ke, Fei, Fee = elementKernel( self.mesh.x[ nodes ], self.mesh.d11[ nodes ], self.mesh.d12[ nodes ], er[ nodes ], et[ nodes ], self.material.v, Ngauss = self.mesh.Ngauss )
+        
+        ##############
+        # ALLOCATION #
+        ##############
+        
+        # Stiffness matrix allocation
+        self.mesh.Ke[ self.index ] = Ke
+        
+        # Internal force vector allocation
+        self.mesh.Fei[ self.index ] = Fei
+        
+        # External force vector allocation
+        self.mesh.Fee[ self.index ] = Fee
+        
+        # Displacement vector initialization
+        self.mesh.ue[ self.index ] = 0.0
     
-        # Stiffness matrix initialization
-        self.Ke = np.zeros( ( 2 , 2 ) )    
-   
-        # Internal force vector
-        self.Fei = np.zeros( ( 2 , 1 ) )
-        
-        # External force vector
-        self.Fee = np.zeros( ( 2 , 1 ) )
-        
-        # Displacement vector
-        self.ue = np.zeros( ( 2 , 1 ) ) 
-            
-        #######################################
-        # NUMBER OF POINTS # GAUSS QUADRATURE #
-        #######################################
-        
-        # Number of gauss points
-        Ngauss = 2
-        
-        ###########################
-        # GAUSS QUADRATURE POINTS #
-        ###########################
-        
-        # Guass quadrature points initialization
-        pointsGauss = np.zeros( ( Ngauss , 1 ) )
-        
-        # Gauss quadrature points definition
-        pointsGauss[ 0 , 0 ] = + np.sqrt( 1.0 / 3.0 )
-        pointsGauss[ 1 , 0 ] = - np.sqrt( 1.0 / 3.0 )
-        
-        ############################
-        # GAUSS QUADRATURE WEIGHTS #
-        ############################
-        
-        # Guass quadrature weights initialization
-        weightsGauss = np.zeros( ( Ngauss , 1 ) )
-        
-        # Gauss quadrature weights definition
-        weightsGauss[ 0 , 0 ] = 1.0
-        weightsGauss[ 1 , 0 ] = 1.0        
-                    
-        ############
-        # JACOBIAN #
-        ############
-        
-        # Element length definition
-        L = self.node2.x - self.node1.x
-        
-        # Jacobian definition
-        J = L / 2.0
-        
-        ####################### 
-        # LOOP # GAUSS POINTS #
-        #######################
-        
-        # Loop over gauss
-        for i in range( Ngauss ):
-            
-            #######################
-            # GET GAUSS CONDITION #
-            #######################
-            
-            # Natural coordinate point inside element
-            r = pointsGauss[ i , 0 ]
-            
-            # Weight
-            w = weightsGauss[ i , 0 ]
-            
-            ###################
-            # SHAPE FUNCTIONS #
-            ###################
-            
-            # Shape functions definition
-            N1r = ( 1.0 - r ) / 2.0
-            N2r = ( 1.0 + r ) / 2.0
-            
-            ##############################
-            # SHAPE FUNCTIONS DERIVATIVE #
-            ##############################
-            
-            # Shape functions derivative in relation to r
-            DN1r = ( - 1.0 ) / 2.0
-            DN2r = ( + 1.0 ) / 2.0
-            
-            ########
-            # ZETA #
-            ########
-            
-            # Get derivative from d11 and d12
-            Dd11 = ( self.node2.d11 - self.node1.d11 ) / 2.0
-            Dd12 = ( self.node2.d12 - self.node1.d12 ) / 2.0
-            
-            # Get d11 on gauss point
-            d11 = ( N1r * self.node1.d11 ) + ( N2r * self.node2.d11 )
-            
-            # Zeta definitions - Initial conditions
-            zeta1 = + 2.0 + ( ( r / d11 ) * Dd11 )
-            zeta2 = - 2.0 + ( ( r / d11 ) * Dd12 )
-                        
-            ##########
-            # LAMBDA #
-            ##########
-            
-            # Get derivative from radial and tangent irridiation
-            Deret = ( ( self.node2.er - self.node2.et ) - ( self.node1.er - self.node1.et ) ) / 2.0
-
-            # Get derivative from tangent irridiation
-            Det = ( self.node2.et - self.node1.et ) / 2.0
-            
-            # Get er and et on gauss point
-            er = ( N1r * self.node1.er ) + ( N2r * self.node2.er )
-            et = ( N1r * self.node1.et ) + ( N2r * self.node2.et )
-            
-            # Lambda definitions
-            lambda1 = Deret + ( ( ( 1.0 + self.material.v ) / ( 1.0 - self.material.v ) ) * Det )
-            lambda2 = ( 2.0 * ( ( ( 1.0 - ( 2.0 * self.material.v ) ) / ( 1.0 - self.material.v ) ) * ( er - et ) ) ) + ( ( r / d11 ) * Dd11 * er ) + ( ( r / d11 ) * Dd12 * et )
-                   
-            ###################
-            # STIFFNESS TERMS #
-            ###################
-            
-            # Stiffness terms
-            self.Ke[ 0 , 0 ] += ( 4.0 * w * np.pi * ( ( ( ( r * r ) / J ) * DN1r * DN1r ) + ( ( 2.0 - zeta1 ) * r * N1r * DN1r ) - ( zeta2 * J * N1r * N1r ) ) )
-            self.Ke[ 0 , 1 ] += ( 4.0 * w * np.pi * ( ( ( ( r * r ) / J ) * DN1r * DN2r ) + ( ( 2.0 - zeta1 ) * r * N1r * DN2r ) - ( zeta2 * J * N1r * N2r ) ) )
-            self.Ke[ 1 , 0 ] += ( 4.0 * w * np.pi * ( ( ( ( r * r ) / J ) * DN2r * DN1r ) + ( ( 2.0 - zeta1 ) * r * N2r * DN1r ) - ( zeta2 * J * N2r * N1r ) ) )
-            self.Ke[ 1 , 1 ] += ( 4.0 * w * np.pi * ( ( ( ( r * r ) / J ) * DN2r * DN2r ) + ( ( 2.0 - zeta1 ) * r * N2r * DN2r ) - ( zeta2 * J * N2r * N2r ) ) )
-                                    
-            #########################
-            # INTERNAL FORCES TERMS #
-            #########################
-            
-            # External coordinate points
-            rminus = - 1.0
-            rplus = + 1.0
-            
-            # Derivative of r in relation to u - Initial conditions
-            dudr = 0.0
-                        
-            # Internal forces terms
-            self.Fei[ 0 , 0 ] += 0.5 * ( - 4.0 * np.pi * ( rminus ) * ( rminus ) * dudr )
-            self.Fei[ 1 , 0 ] += 0.5 * ( + 4.0 * np.pi * ( rplus ) * ( rplus ) * dudr )    
-                        
-            #########################
-            # EXTERNAL FORCES TERMS #
-            #########################
-            
-            # External forces terms
-            self.Fee[ 0 , 0 ] += - 4.0 * w * np.pi * r * J * ( ( r * lambda1 ) + lambda2 ) * N1r
-            self.Fee[ 1 , 0 ] += - 4.0 * w * np.pi * r * J * ( ( r * lambda1 ) + lambda2 ) * N2r
-                
     #########
     # PRINT #
     #########
-        
+    
     # Print
     def print( self ):
         
@@ -431,7 +408,7 @@ class Element:
         
         # Print end coordinate
         print( 'End coordinate [ um ]         = %.2f' % self.node2.x )        
-                
+        
         # Print d11 parameter for node 1
         print( 'd11 parameter - Node %d       = %.2f' % ( self.node1.ID, self.node1.d11 ) )
         
@@ -443,10 +420,10 @@ class Element:
         
         # Print d12 parameter for node 1
         print( 'd12 parameter - Node %d       = %.2f' % ( self.node1.ID, self.node1.d12 ) )
-                
+        
         # Print d12 parameter for node 2
         print( 'd12 parameter - Node %d       = %.2f' % ( self.node2.ID, self.node2.d12 ) )
-                
+        
         # Print d12 parameter for element ( constant )
         print( 'd12 parameter on element      = %.2f' % self.d12 )
         
@@ -473,7 +450,7 @@ class Element:
         
         # Print region name
         print( 'Region Name                   = %s' % self.region )
-                
+        
         # Print material struct
         self.material.printShort()
         
@@ -504,6 +481,6 @@ class Element:
         # Print displacement vector
         print( 'Displacement vector - ue - Equation 12' )
         print( self.ue )
-
+        
         # Print footer
         print( '--------------------------------------------------------------------' )  
\ No newline at end of file
@@ -7,11 +7,28 @@ import typing
 # Import numpy library
 import numpy as np
 
+# Import scipy library
+from scipy.linalg import lu_factor, lu_solve
+
 # Import functions
 from ModelInput import ModelInput
 from Material import Material
 from Node import Node
 from Element import Element
+from Mesh import Mesh, ViewList, REGIONS, averageToNodes
+from Banded import zerosBanded, bandedToDense, bandedProduct, factorBanded, solveFactoredBanded
+from Kernel import elementKernel, stressKernel
+from Quadrature import quadrature
+from Mesher import MESHERS, uniformMesh, layerMesh, nodeMesh
+from Results import ResultsWriter
+from Profiler import timed
+
+##################
+# ELEMENT ORDERS #
+##################
+
+# Quadratic elements are held back until they converge to the linear solution ( the kernel integrates on the natural coordinate )
+QUADRATIC_ELEMENTS = False
 
 ########################
 # FINITE ELEMENT CLASS #
@@ -84,13 +101,58 @@ class FEM:
     # Method multiplier ( 0 = explicit / 0.5 = Crank Nicholson / 1.0 = implicit )
     beta: float
     
+    ####################
+    # GAUSS QUADRATURE #
+    ####################
+    
+    # Number of gauss points per element ( order + 1 to 6 - a single point at r = 0 leaves the stiffness singular )
+    Ngauss: int
+    
+    ##########
+    # MESHER #
+    ##########
+    
+    # Node placement ( 'uniform' = legacy spacing / 'layers' = per layer counts and grading / 'nodes' = given radii , see MESHERS )
+    mesher: str
+    
+    ##################
+    # MATRIX STORAGE #
+    ##################
+    
+    # Global stiffness storage ( 'banded' = tri / pentadiagonal LAPACK storage / 'dense' = full matrix for verification )
+    storage: str
+    
+    # Element order ( 1 = linear 2 node elements / 2 = quadratic 3 node elements )
+    order: int
+    
+    # Number of sub diagonals and super diagonals of the global stiffness ( equal to the element order )
+    lower: int
+    upper: int
+    
     ###########################
     # GLOBAL STIFFNESS MATRIX #
     ###########################
     
-    # Global stiffness matrix
+    # Global stiffness matrix ( Ndofs x Ndofs if dense / ( lower + upper + 1 ) x Ndofs if banded )
     K: np.ndarray
     
+    #################
+    # FACTORIZATION #
+    #################
+    
+    # Cached LU factorization of the global stiffness ( None when K changed since the last factorization )
+    factorization: 'typing.Any'
+    
+    ##################
+    # DIRTY ELEMENTS #
+    ##################
+    
+    # Elements whose contributions to K , Fi and Fe are out of date ( Nelements )
+    dirty: np.ndarray
+    
+    # Global force vectors assembled from the current element force vectors ( False after assemblyForces or a stiffness only update )
+    forcesCurrent: bool
+    
     ################################
     # GLOBAL INTERNAL FORCE VECTOR #
     ################################
@@ -105,6 +167,13 @@ class FEM:
     # Global external force vector
     Fe: np.ndarray
     
+    #####################
+    # SURFACE PRESSURES #
+    #####################
+    
+    # Inner and outer surface pressures [ MPa ] loading the global external forces
+    pressure: np.ndarray
+    
     #######################
     # GLOBAL FORCE VECTOR #
     #######################
@@ -118,13 +187,39 @@ class FEM:
     
     # Global displacement vector
     u: np.ndarray
+    
+    ###################
+    # POST PROCESSING #
+    ###################
+    
+    # Gauss point radial coordinates ( Nelements x Ngauss )
+    rGauss: np.ndarray
+    
+    # Gauss point strains and stresses ( Nelements x Ngauss x 2 )
+    epsilonGauss: np.ndarray
+    sigmaGauss: np.ndarray
+    
+    # Nodal strains and stresses ( Nnodes x 2 )
+    epsilonNodes: np.ndarray
+    sigmaNodes: np.ndarray
+    
+    # Peak ( maximum ) radial and tangential stresses per region ( 4 x 2 )
+    peakStress: np.ndarray
+    
+    ########
+    # MESH #
+    ########
+    
+    # Mesh struct ( nodal and element arrays )
+    mesh: Mesh
    
     ##################
     # INITIALIZATION #
     ##################
     
     # Initialization
-    def __init__ ( self, model: ModelInput, PyC: Material, SiC:Material ):
+    @timed( 'FEM.init' )
+    def __init__ ( self, model: ModelInput, PyC: Material, SiC:Material, storage: str = 'banded', Ngauss: int = None, order: int = 1, mesher: str = 'uniform', counts: tuple = None, grading: float = 1.0, nodes: np.ndarray = None, projection: str = 'length' ):
         
         # Initial length ( Kernel radius )
         self.Li = ( model.kernelDiameter / 2.0 )
@@ -135,250 +230,505 @@ class FEM:
         # Total length
         self.L = self.Lf - self.Li
         
-        # Number of elements
-        self.Nelements = 4 * model.Nelements
-        
-        # Number of nodes
-        self.Nnodes = self.Nelements + 1
-        
-        # Number of degree of freedom
-        self.Ndofs = self.Nnodes
-        
         # Method multiplier
         self.beta = model.beta
         
-        ################
-        # LOOP # NODES #
-        ################
+        # Check matrix storage
+        if( storage not in ( 'banded' , 'dense' ) ):
+            
+            # Unknown matrix storage
+            raise ValueError( "Unknown matrix storage '%s' ( expected 'banded' or 'dense' )" % storage )
         
-        # Nodes structure initialization
-        self.nodes = [ ]
+        # Matrix storage
+        self.storage = storage
         
-        # Loop over nodes
-        for i in range( self.Nnodes.astype( int ) ):
-            
-            ##############
-            # COORDINATE #
-            ##############
-            
-            # Coordinate definition
-            r = self.Li + ( ( self.L / self.Nelements ) * i )
+        # Check element order
+        if( order not in ( 1 , 2 ) ):
             
-            ########
-            # NODE #
-            ########
-            
-            # Node struct
-            node = Node( i + 1 , r )
-            
-            ##############
-            # ALLOCATION #
-            ##############
-            
-            # Allocation on nodes structure
-            self.nodes.append( node )
-            
-        ###################
-        # LOOP # ELEMENTS #
-        ###################
+            # Unknown element order
+            raise ValueError( "Unknown element order '%s' ( expected 1 = linear or 2 = quadratic )" % order )
         
-        # Elements structure initialization
-        self.elements = [ ]
+        # Quadratic elements are held back
+        if( order == 2 and not QUADRATIC_ELEMENTS ):
+            raise ValueError( 'Quadratic elements are not available ( no convergence against the linear solution with the natural coordinate kernel )' )
         
-        # Loop over elements
-        for i in range( self.Nelements.astype( int ) ):
-            
-            ##########
-            # NODE 1 #
-            ##########
-            
-            # Node 1 struct definition
-            node1 = self.nodes[ i ]
-            
-            ##########
-            # NODE 2 #
-            ##########
-            
-            # Node 2 struct definition
-            node2 = self.nodes[ i + 1 ]
-            
-            ##########
-            # BUFFER #
-            ##########
-            
-            # Buffer region definition
-            if ( 0 * model.Nelements ) <= i < ( 1 * model.Nelements ):
-                
-                ####################
-                # ELEMENT # BUFFER #
-                ####################
-                
-                # Element struct
-                element = Element( i + 1 , node1, node2, 'Buffer', PyC )
-            
-                ##############
-                # ALLOCATION #
-                ##############
-                
-                # Allocation on elements structure
-                self.elements.append( element )
-                
-            ########
-            # IPyC #
-            ########
-            
-            # IPyC region definition
-            if ( 1 * model.Nelements ) <= i < ( 2 * model.Nelements ):
-                
-                ##################
-                # ELEMENT # IPyC #
-                ##################
-                
-                # Element struct
-                element = Element( i + 1 , node1, node2, 'IPyC', PyC )
+        # Number of gauss points ( order + 1 by default , checked against the quadrature registry )
+        self.Ngauss = quadrature( order + 1 if Ngauss is None else Ngauss ).n
+        
+        # Check under integrated elements ( a single point at r = 0 leaves the linear stiffness singular )
+        if( self.Ngauss < order + 1 ):
+            raise ValueError( 'Elements of order %d need at least %d gauss points ( got %d )' % ( order , order + 1 , self.Ngauss ) )
+        
+        # Element order
+        self.order = order
+        
+        # Linear elements couple neighbour nodes ( tridiagonal ) and quadratic elements two nodes apart ( pentadiagonal )
+        self.lower = order
+        self.upper = order
+        
+        # No factorization yet
+        self.factorization = None
+        
+        ###############
+        # COORDINATES #
+        ###############
+        
+        # Check mesher
+        if( mesher not in MESHERS ):
             
-                ##############
-                # ALLOCATION #
-                ##############
-                
-                # Allocation on elements structure
-                self.elements.append( element )
+            # Unknown mesher
+            raise ValueError( "Unknown mesher '%s' ( expected %s )" % ( mesher , ' or '.join( "'%s'" % name for name in MESHERS ) ) )
+        
+        # Mesher
+        self.mesher = mesher
+        
+        # Legacy mesh ( uniform node spacing over the coating , middle nodes centred on quadratic elements )
+        if( mesher == 'uniform' ):
             
-            #######
-            # SiC #
-            #######
+            # Coordinates and regions ( Buffer / IPyC / SiC / OPyC with model.Nelements elements each )
+            x, region = uniformMesh( self.Li, self.L, model.Nelements, order )
+        
+        # Mesh from given element end nodes
+        elif( mesher == 'nodes' ):
             
-            # SiC region definition
-            if ( 2 * model.Nelements ) <= i < ( 3 * model.Nelements ):
-                
-                #################
-                # ELEMENT # SiC #
-                #################
-                
-                # Element struct
-                element = Element( i + 1 , node1, node2, 'SiC', SiC )
+            # Coordinates and regions
+            x, region = nodeMesh( self.Li, ( model.bufferThickness , model.IPyCThickness , model.SiCThickness , model.OPyCThickness ), nodes, order )
+        
+        # Interface aligned mesh ( every layer meshed on its own , model.Nelements elements per layer by default )
+        else:
             
-                ##############
-                # ALLOCATION #
-                ##############
-                
-                # Allocation on elements structure
-                self.elements.append( element )
+            # Elements per layer
+            counts = ( int( model.Nelements ) , ) * 4 if counts is None else tuple( int( n ) for n in counts )
             
-            ########
-            # OPyC #
-            ########
+            # Coordinates and regions
+            x, region = layerMesh( self.Li, ( model.bufferThickness , model.IPyCThickness , model.SiCThickness , model.OPyCThickness ), counts, grading, order )
+        
+        # Number of elements
+        self.Nelements = np.int64( region.size )
+        
+        # Number of nodes ( quadratic elements add a middle node )
+        self.Nnodes = np.int64( x.size )
+        
+        # Number of degree of freedom
+        self.Ndofs = self.Nnodes
+        
+        ###########
+        # REGIONS #
+        ###########
+        
+        # Material definition ( PyC everywhere except on the SiC region )
+        material = np.where( region == 2 , 1 , 0 )
+        
+        ########
+        # MESH #
+        ########
+        
+        # Mesh struct
+        self.mesh = Mesh( x, region, [ PyC , SiC ], material, order, projection, self.Ngauss )
+        
+        ###########################
+        # SET # MATERIAL MATRICES #
+        ###########################
+        
+        # Set constitutive, irridiation and G matrices ( once per material )
+        self.mesh.setMatrices( self.beta )
+        
+        ##########################
+        # SET INITIAL CONDITIONS #
+        ##########################
+        
+        # Set initial conditions
+        self.mesh.setInitialConditions()
+        
+        #########
+        # VIEWS #
+        #########
+        
+        # Nodes structure ( views on the mesh arrays )
+        self.nodes = ViewList( self.mesh , Node , self.mesh.Nnodes )
+        
+        # Elements structure ( views on the mesh arrays )
+        self.elements = ViewList( self.mesh , Element , self.mesh.Nelements )
+        
+        ##################
+        # DIRTY ELEMENTS #
+        ##################
+        
+        # Nothing assembled yet
+        self.K = None
+        self.dirty = np.ones( self.mesh.Nelements , dtype = bool )
+        self.forcesCurrent = False
+        
+        # Unloaded surfaces ( see setPressure )
+        self.pressure = np.zeros( 2 )
+
+    ############
+    # ASSEMBLY #
+    ############
+    
+    # Assembly finite element problem - Only dirty elements are recomputed once K was assembled ( see updateMaterials )
+    @timed( 'FEM.assembly' )
+    def assembly( self ):
+        
+        #################
+        # FULL ASSEMBLY #
+        #################
+        
+        # First assembly or every element dirty
+        if( self.K is None or self.dirty.all() ):
             
-            # OPyC region definition
-            if ( 3 * model.Nelements ) <= i < ( 4 * model.Nelements ):
-                
-                ##################
-                # ELEMENT # OPyC #
-                ##################
-                
-                # Element struct
-                element = Element( i + 1 , node1, node2, 'OPyC', PyC )
+            # Evaluate all element matrices at once
+            self.mesh.Ke, self.mesh.Fei, self.mesh.Fee = self.elementMatrices( *self.mesh.eigenstrains() )
             
-                ##############
-                # ALLOCATION #
-                ##############
-                
-                # Allocation on elements structure
-                self.elements.append( element )
-                
-            ###########################
-            # SET CONSTITUTIVE MATRIX #
-            ###########################
-                    
-            # Set constitutive matrix
-            self.elements[ i ].setC()
+            # Allocation on global stiffness
+            self.setStiffness( self.mesh.Ke )
             
-            ##########################
-            # SET IRRIDIATION MATRIX #
-            ##########################
-                    
-            # Set irridiation matrix
-            self.elements[ i ].setA()   
+            # Allocation on global forces
+            self.setForces( self.mesh.Fei , self.mesh.Fee )
+        
+        ########################
+        # INCREMENTAL ASSEMBLY #
+        ########################
+        
+        # Dirty elements only
+        else:
             
-            ################
-            # SET G MATRIX #
-            ################
+            # Dirty elements
+            elements = np.flatnonzero( self.dirty )
             
-            # Set G matrix
-            self.elements[ i ].setG( self.beta )
+            # Evaluate the dirty element matrices
+            Ke, Fei, Fee = self.elementMatrices( *self.mesh.eigenstrains() , elements )
             
-            ##########################
-            # SET INITIAL CONDITIONS #
-            ##########################
+            # Patch global stiffness
+            self.patchStiffness( elements , Ke )
             
-            # Set initial conditions
-            self.elements[ i ].setInitialConditions()
-
-    ############
-    # ASSEMBLY #
-    ############
+            # Patch global forces ( rebuilt if they hold other element forces )
+            if( self.forcesCurrent ):
+                self.patchForces( elements , Fei , Fee )
+            else:
+                self.mesh.Fei[ elements ], self.mesh.Fee[ elements ] = Fei, Fee
+                self.setForces( self.mesh.Fei , self.mesh.Fee )
+        
+        # Global system up to date
+        self.dirty[ : ] = False
+        self.forcesCurrent = True
     
-    # Assembly finite element problem
-    def assembly( self ):
+    #############################
+    # ASSEMBLY # STIFFNESS ONLY #
+    #############################
+    
+    # Assembly of the global stiffness only ( dirty elements once K was assembled , global forces left untouched )
+    @timed( 'FEM.assemblyStiffness' )
+    def assemblyStiffness( self ):
+        
+        # First assembly or every element dirty
+        if( self.K is None or self.dirty.all() ):
+            self.mesh.Ke = self.elementMatrices( *self.mesh.eigenstrains() )[ 0 ]
+            self.setStiffness( self.mesh.Ke )
+        
+        # Dirty elements only
+        else:
+            elements = np.flatnonzero( self.dirty )
+            self.patchStiffness( elements , self.elementMatrices( *self.mesh.eigenstrains() , elements )[ 0 ] )
+        
+        # Element force vectors no longer match the global forces
+        self.dirty[ : ] = False
+        self.forcesCurrent = False
+    
+    ####################
+    # UPDATE MATERIALS #
+    ####################
+    
+    # Refresh the mesh after material changes ( e.g. a new fluence ) and mark the elements whose matrices change
+    # An element is dirty if a nodal d11 , d12 , er , et value of its nodes changed - Returns the dirty elements
+    # ( d12 / d11 = 2 v / ( 1 - v ) , so a Poisson ratio change always changes the D parameters of the element nodes )
+    def updateMaterials( self ):
         
-        ##################
-        # INITIALIZATION #
-        ##################
+        # Mesh struct
+        mesh = self.mesh
         
-        # Global stiffness initialization
-        self.K = np.zeros( ( self.Ndofs.astype( int ), self.Ndofs.astype( int ) ) )
+        # Nodal fields before the update
+        before = [ getattr( mesh , field ).copy() for field in ( 'd11' , 'd12' , 'er' , 'et' ) ]
         
-        # Global internal forces initialization
-        self.Fi = np.zeros( ( self.Ndofs.astype( int ) , 1 ) )
+        # Material matrices and initial conditions from the current material states
+        mesh.setMatrices( self.beta )
+        mesh.setInitialConditions()
         
-        # Global external forces initialization
-        self.Fe = np.zeros( ( self.Ndofs.astype( int ) , 1 ) )
+        # Changed nodes
+        changed = np.zeros( mesh.Nnodes , dtype = bool )
+        for old, field in zip( before , ( 'd11' , 'd12' , 'er' , 'et' ) ):
+            changed |= ( getattr( mesh , field ) != old )
         
-        ###################
-        # LOOP # ELEMENTS #
-        ###################
+        # Dirty elements ( changed node )
+        dirty = changed[ mesh.connectivity ].any( axis = 1 )
+        self.dirty |= dirty
         
-        # Loop over elements
-        for i in range( self.Nelements.astype( int ) ):
-            
-            ##########################
-            # SET ELEMENT PARAMETERS #
-            ##########################
-            
-            # Set element parameters
-            self.elements[ i ].setElementParameters()
-            
-            #################################
-            # ALLOCATION # GLOBAL STIFFNESS #
-            #################################
+        # Return dirty elements
+        return np.flatnonzero( dirty )
+    
+    # Mark elements dirty by element index , material index or region index
+    def markDirty( self, elements: np.ndarray = None, materials: tuple = None, regions: tuple = None ):
+        
+        # Elements
+        if( elements is not None ):
+            self.dirty[ elements ] = True
+        
+        # Elements of the materials
+        if( materials is not None ):
+            self.dirty |= np.isin( self.mesh.material , materials )
+        
+        # Elements of the regions
+        if( regions is not None ):
+            self.dirty |= np.isin( self.mesh.region , regions )
+        
+    ##########################
+    # ASSEMBLY # FORCES ONLY #
+    ##########################
+    
+    # Assembly of the global force vectors only ( the global stiffness is kept )
+    # Nodal radial and tangential eigenstrains default to the nodal irridiation plus thermal strain fields
+    # Inner and outer surface pressures default to the pressures of setPressure
+    @timed( 'FEM.assemblyForces' )
+    def assemblyForces( self, er: np.ndarray = None, et: np.ndarray = None, pressure: np.ndarray = None ):
+        
+        # Default nodal radial eigenstrain
+        if( er is None ):
+            er = self.mesh.eigenstrains()[ 0 ]
+        
+        # Default nodal tangential eigenstrain
+        if( et is None ):
+            et = self.mesh.eigenstrains()[ 1 ]
+        
+        # Evaluate all element force vectors at once
+        _, self.mesh.Fei, self.mesh.Fee = self.elementMatrices( er , et )
+        
+        # Allocation on global forces
+        self.setForces( self.mesh.Fei , self.mesh.Fee , pressure )
+        
+        # Global forces hold the given eigenstrain forces
+        self.forcesCurrent = False
+        
+    ##################
+    # ELEMENT KERNEL #
+    ##################
+    
+    # Element matrices for given nodal radial and tangential eigenstrains ( every element or the given elements )
+    def elementMatrices( self, er: np.ndarray, et: np.ndarray, elements: np.ndarray = None ):
+        
+        # Mesh struct
+        mesh = self.mesh
+        
+        # Element connectivity
+        connectivity = mesh.connectivity if elements is None else mesh.connectivity[ elements ]
+        
+        # Element poisson ratio
+        v = np.array( [ material.v for material in mesh.materials ] )[ mesh.material if elements is None else mesh.material[ elements ] ]
+        
+        # Evaluate all element matrices at once
+        return elementKernel( mesh.x[ connectivity ], mesh.d11[ connectivity ], mesh.d12[ connectivity ], er[ connectivity ], et[ connectivity ], v, Ngauss = self.Ngauss )
+        
+    #################################
+    # ALLOCATION # GLOBAL STIFFNESS #
+    #################################
+    
+    # Scatter stacked element stiffness matrices on the global stiffness
+    def setStiffness( self, Ke: np.ndarray ):
+        
+        # Global stiffness initialization ( banded storage - K[ i , j ] is stored in K[ upper + i - j , j ] / dense storage )
+        if( self.storage == 'banded' ):
+            self.K = zerosBanded( self.Ndofs.astype( int ), self.lower, self.upper )
+        else:
+            self.K = np.zeros( ( self.Ndofs.astype( int ), self.Ndofs.astype( int ) ) )
+        
+        # Allocation on global stiffness
+        self.scatterStiffness( self.mesh.connectivity , Ke )
+    
+    # Patch the global stiffness with new matrices of the given elements ( cached factorization kept if K does not change )
+    def patchStiffness( self, elements: np.ndarray, Ke: np.ndarray ):
+        
+        # Stiffness change of the elements
+        dKe = Ke - self.mesh.Ke[ elements ]
+        
+        # Element stiffness allocation
+        self.mesh.Ke[ elements ] = Ke
+        
+        # Allocation of the change on global stiffness
+        if( np.any( dKe ) ):
+            self.scatterStiffness( self.mesh.connectivity[ elements ] , dKe )
+    
+    # Add stacked element stiffness matrices of the connectivity rows to the global stiffness
+    def scatterStiffness( self, connectivity: np.ndarray, Ke: np.ndarray ):
+        
+        # Global stiffness changes - cached factorization is no longer valid
+        self.factorization = None
+        
+        # Allocation on global stiffness ( banded storage )
+        if( self.storage == 'banded' ):
             
-            # Allocation on global stiffness
-            self.K[ i + 0 , i + 0 ] += self.elements[ i ].Ke[ 0 , 0 ]
-            self.K[ i + 0 , i + 1 ] += self.elements[ i ].Ke[ 0 , 1 ]
-            self.K[ i + 1 , i + 0 ] += self.elements[ i ].Ke[ 1 , 0 ]
-            self.K[ i + 1 , i + 1 ] += self.elements[ i ].Ke[ 1 , 1 ]
+            # Loop over local node pairs ( distinct columns per pair , local offset a - b is the diagonal )
+            for a in range( Ke.shape[ 1 ] ):
+                for b in range( Ke.shape[ 2 ] ):
+                    self.K[ self.upper + a - b , connectivity[ :, b ] ] += Ke[ :, a , b ]
+        
+        # Allocation on global stiffness ( dense storage )
+        else:
             
-            #######################################
-            # ALLOCATION # GLOBAL INTERNAL FORCES #
-            #######################################
+            # Loop over local node pairs
+            for a in range( Ke.shape[ 1 ] ):
+                for b in range( Ke.shape[ 2 ] ):
+                    np.add.at( self.K , ( connectivity[ :, a ] , connectivity[ :, b ] ) , Ke[ :, a , b ] )
+        
+    ##############################
+    # ALLOCATION # GLOBAL FORCES #
+    ##############################
+    
+    # Scatter stacked element force vectors and surface pressure loads on the global force vectors
+    def setForces( self, Fei: np.ndarray, Fee: np.ndarray, pressure: np.ndarray = None ):
+        
+        # Global internal forces initialization
+        self.Fi = np.zeros( ( self.Ndofs.astype( int ) , 1 ) )
+        
+        # Global external forces initialization ( surface pressure loads )
+        self.Fe = self.pressureForces( self.pressure if pressure is None else pressure )
+        
+        # Allocation on global forces
+        self.scatterForces( self.mesh.connectivity , Fei , Fee )
+    
+    # Patch the global forces with new force vectors of the given elements
+    def patchForces( self, elements: np.ndarray, Fei: np.ndarray, Fee: np.ndarray ):
+        
+        # Allocation of the changes on global forces
+        self.scatterForces( self.mesh.connectivity[ elements ] , Fei - self.mesh.Fei[ elements ] , Fee - self.mesh.Fee[ elements ] )
+        
+        # Element force vectors allocation
+        self.mesh.Fei[ elements ] = Fei
+        self.mesh.Fee[ elements ] = Fee
+    
+    # Add stacked element force vectors of the connectivity rows to the global force vectors
+    def scatterForces( self, connectivity: np.ndarray, Fei: np.ndarray, Fee: np.ndarray ):
+        
+        # Loop over local nodes
+        for a in range( connectivity.shape[ 1 ] ):
             
             # Allocation global internal forces
-            self.Fi[ i + 0 , 0 ] = self.elements[ i ].Fei[ 0 , 0 ]
-            self.Fi[ i + 1 , 0 ] = self.elements[ i ].Fei[ 1 , 0 ]
-            
-            #######################################
-            # ALLOCATION # GLOBAL EXTERNAL FORCES #
-            #######################################
+            np.add.at( self.Fi[ :, 0 ] , connectivity[ :, a ] , Fei[ :, a ] )
             
             # Allocation global external forces
-            self.Fe[ i + 0 , 0 ] += self.elements[ i ].Fee[ 0 , 0 ]
-            self.Fe[ i + 1 , 0 ] += self.elements[ i ].Fee[ 1 , 0 ]
+            np.add.at( self.Fe[ :, 0 ] , connectivity[ :, a ] , Fee[ :, a ] )
 
+    ##################
+    # RESIDUAL TERMS #
+    ##################
+    
+    # Product of the global stiffness with nodal displacements ( Ndofs )
+    def stiffnessProduct( self, u: np.ndarray ):
+        
+        # Banded product
+        if( self.storage == 'banded' ):
+            return bandedProduct( self.K , u , self.lower , self.upper )
+        
+        # Dense product
+        return self.K @ u
+    
+    # Element force matrices - Element force vectors are linear in the nodal eigenstrains ( Fe = Mr.er + Mt.et on the element nodes )
+    # Returns the radial and tangential matrices ( Nelements x ( order + 1 ) x ( order + 1 ) ) for the current D parameters
+    def forceMatrices( self ):
+        
+        # Mesh struct
+        mesh = self.mesh
+        
+        # Element nodal arrays
+        connectivity = mesh.connectivity
+        xe, d11e, d12e = mesh.x[ connectivity ], mesh.d11[ connectivity ], mesh.d12[ connectivity ]
+        
+        # Element poisson ratio
+        v = np.array( [ material.v for material in mesh.materials ] )[ mesh.material ]
+        
+        # Matrices initialization
+        Mr = np.zeros( connectivity.shape + ( connectivity.shape[ 1 ] , ) )
+        Mt = np.zeros( connectivity.shape + ( connectivity.shape[ 1 ] , ) )
+        
+        # Loop over local nodes ( unit eigenstrain on one node of every element )
+        zero = np.zeros( connectivity.shape )
+        for b in range( connectivity.shape[ 1 ] ):
+            unit = zero.copy()
+            unit[ :, b ] = 1.0
+            _, Fei, Fee = elementKernel( xe, d11e, d12e, unit, zero, v, Ngauss = self.Ngauss )
+            Mr[ :, :, b ] = Fei + Fee
+            _, Fei, Fee = elementKernel( xe, d11e, d12e, zero, unit, v, Ngauss = self.Ngauss )
+            Mt[ :, :, b ] = Fei + Fee
+        
+        # Return force matrices
+        return Mr, Mt
+    
+    # Global force vector of given nodal eigenstrains and surface pressures without touching the assembled forces ( Ndofs )
+    # Element force matrices ( see forceMatrices ) replace the element kernel when given
+    def forceVector( self, er: np.ndarray, et: np.ndarray, pressure: np.ndarray = None, matrices: tuple = None ):
+        
+        # Element connectivity
+        connectivity = self.mesh.connectivity
+        
+        # Element force vectors from the element kernel
+        if( matrices is None ):
+            _, Fei, Fee = self.elementMatrices( er , et )
+            Fe = Fei + Fee
+        
+        # Element force vectors from the force matrices
+        else:
+            Fe = np.einsum( 'eab,eb->ea' , matrices[ 0 ] , er[ connectivity ] ) + np.einsum( 'eab,eb->ea' , matrices[ 1 ] , et[ connectivity ] )
+        
+        # Surface pressure loads
+        F = self.pressureForces( self.pressure if pressure is None else pressure )[ :, 0 ]
+        
+        # Loop over local nodes
+        for a in range( connectivity.shape[ 1 ] ):
+            
+            # Allocation global forces
+            F += np.bincount( connectivity[ :, a ] , Fe[ :, a ] , minlength = F.size )
+        
+        # Return global forces
+        return F
+    
+    #####################
+    # SURFACE PRESSURES #
+    #####################
+    
+    # Global external forces of the inner and outer surface pressures [ MPa ]
+    # Natural boundary term of the element kernel ( Fei dudr terms ) with du/dr = - P / d11 on the loaded surface
+    def pressureForces( self, pressure: np.ndarray ):
+        
+        # Inner and outer pressures
+        inner, outer = np.asarray( pressure , dtype = float )
+        
+        # Global forces initialization
+        F = np.zeros( ( self.Ndofs.astype( int ) , 1 ) )
+        
+        # Inner surface pushed outwards and outer surface pushed inwards
+        F[ 0 , 0 ] = + 4.0 * np.pi * inner / self.mesh.d11[ 0 ]
+        F[ -1 , 0 ] = - 4.0 * np.pi * outer / self.mesh.d11[ -1 ]
+        
+        # Return global forces
+        return F
+    
+    # Set the inner and outer surface pressures [ MPa ] - Assembled global forces are patched with the load change
+    def setPressure( self, inner: float = 0.0, outer: float = 0.0 ):
+        
+        # Surface pressures
+        pressure = np.array( [ inner , outer ] , dtype = float )
+        
+        # Patch assembled global forces
+        if( self.K is not None ):
+            self.Fe += self.pressureForces( pressure ) - self.pressureForces( self.pressure )
+        
+        # Surface pressures allocation
+        self.pressure = pressure
+    
     #########
     # SOLVE #
     #########
     
     # Solve element problem
+    @timed( 'FEM.solve' )
     def solve( self ):
         
         ###############
@@ -392,30 +742,135 @@ class FEM:
         # SOLVE # K.u = F #
         ###################
         
-        # Solve FEM problem
-        self.u = np.linalg.solve( self.K , self.F )
+        # Solve FEM problem ( back substitution on the cached factorization )
+        self.u = self.solveMultiple( self.F )
         
-        ###################
-        # LOOP # ELEMENTS #
-        ###################
+        ###############################
+        # ALLOCATE RESULTS # ELEMENTS #
+        ###############################
         
-        # Loop over elements
-        for i in range( self.Nelements.astype( int ) ):
+        # Allocation results ( element nodes from the connectivity )
+        self.mesh.ue = self.u[ self.mesh.connectivity , 0 ]
         
-            ###############################
-            # ALLOCATE RESULTS # ELEMENTS #
-            ###############################
-            
-            # Allocation results
-            self.elements[ i ].ue[ 0 , 0 ] = self.u[ i + 0 , 0 ]
-            self.elements[ i ].ue[ 1 , 0 ] = self.u[ i + 1 , 0 ]
+        # Post processing results belong to the previous solution
+        self.sigmaNodes = None
+        self.peakStress = None
+
+    #################
+    # FACTORIZATION #
+    #################
+    
+    # Factorize the global stiffness ( only if K changed since the last factorization )
+    @timed( 'FEM.factorize' )
+    def factorize( self ):
+        
+        # Check cached factorization
+        if( self.factorization is not None ):
+            return self.factorization
+        
+        # Banded LU factorization ( LAPACK gbtrf )
+        if( self.storage == 'banded' ):
+            self.factorization = factorBanded( self.K , self.lower , self.upper )
+        
+        # Dense LU factorization for verification ( LAPACK getrf )
+        else:
+            self.factorization = lu_factor( self.K , check_finite = False )
+        
+        # Return factorization
+        return self.factorization
+    
+    #####################
+    # SOLVE # MULTI RHS #
+    #####################
+    
+    # Solve K.u = F for one or several load vectors ( Ndofs or Ndofs x Nloads ) reusing the cached factorization
+    def solveMultiple( self, F: np.ndarray ):
+        
+        # Factorization ( computed once per global stiffness )
+        factorization = self.factorize()
+        
+        # Banded back substitution ( LAPACK gbtrs )
+        if( self.storage == 'banded' ):
+            return solveFactoredBanded( factorization , F , self.lower , self.upper )
+        
+        # Dense back substitution ( LAPACK getrs )
+        return lu_solve( factorization , F , check_finite = False )
 
+    ###################
+    # POST PROCESSING #
+    ###################
+    
+    # Strains and stresses on every gauss point and node of all elements at once , nodal averages and peak stresses per region
+    @timed( 'FEM.postProcessing' )
+    def postProcessing( self ):
+        
+        # Mesh struct
+        mesh = self.mesh
+        
+        # Nodal eigenstrains
+        er, et = mesh.eigenstrains()
+        
+        # Element nodal arrays
+        connectivity = mesh.connectivity
+        xe, ue, ere, ete = mesh.x[ connectivity ], self.u[ connectivity , 0 ], er[ connectivity ], et[ connectivity ]
+        
+        # Element G matrices - Equation (8) ( element creep coefficients of the thermal field included )
+        _, _, Ge = mesh.elementMaterialMatrices( self.beta )
+        
+        ########################
+        # GAUSS POINT RECOVERY #
+        ########################
+        
+        # Strains and stresses on the gauss points
+        self.rGauss, self.epsilonGauss, self.sigmaGauss = stressKernel( xe, ue, ere, ete, Ge, quadrature( self.Ngauss ).points )
+        
+        ##################
+        # NODAL RECOVERY #
+        ##################
+        
+        # Strains and stresses on the element nodes ( natural coordinates of the local nodes )
+        _, epsilonElementNodes, sigmaElementNodes = stressKernel( xe, ue, ere, ete, Ge, np.linspace( - 1.0 , 1.0 , self.order + 1 ) )
+        
+        # Element length weighted nodal averages
+        self.epsilonNodes = averageToNodes( epsilonElementNodes , connectivity , mesh.h , mesh.Nnodes )
+        self.sigmaNodes = averageToNodes( sigmaElementNodes , connectivity , mesh.h , mesh.Nnodes )
+        
+        #################
+        # PEAK STRESSES #
+        #################
+        
+        # Largest stress of every element over its gauss points and nodes
+        elementPeak = np.maximum( self.sigmaGauss.max( axis = 1 ) , sigmaElementNodes.max( axis = 1 ) )
+        
+        # Peak stresses per region ( NaN for a region without elements )
+        self.peakStress = np.array( [ elementPeak[ mesh.region == r ].max( axis = 0 ) if np.any( mesh.region == r ) else np.full( 2 , np.nan ) for r in range( len( REGIONS ) ) ] )
+        
+        # Return peak stresses
+        return self.peakStress
+    
+    #################
+    # WRITE RESULTS #
+    #################
+    
+    # Write the mesh once and append the solution as one step to a ResultsWriter
+    def write( self, writer: ResultsWriter, **fields ):
+        
+        # Mesh fields ( written once per archive )
+        writer.writeStatic( x = self.mesh.x , connectivity = self.mesh.connectivity , region = self.mesh.region , material = self.mesh.material )
+        
+        # Nodal stresses and strains after post processing
+        if( getattr( self , 'sigmaNodes' , None ) is not None ):
+            fields = dict( epsilonNodes = self.epsilonNodes , sigmaNodes = self.sigmaNodes , sigmaGauss = self.sigmaGauss , peakStress = self.peakStress , **fields )
+        
+        # Nodal fields of the step ( extra step fields such as the fluence are given by the caller )
+        writer.append( u = self.u[ :, 0 ] , F = self.F[ :, 0 ] , er = self.mesh.er , et = self.mesh.et , **fields )
+    
     #########
     # PRINT #
     #########
         
     # Print
-    def print( self ):
+    def print( self, verbose: bool = False ):
         
         # Print header
         print( '--------------------------------------------------------------------' )
@@ -438,7 +893,39 @@ class FEM:
         
         # Print number of degree of freedom
         print( 'Number of degree of freedom   = %d' % self.Ndofs ) 
+        
+        # Print mesh options
+        print( 'Mesher / order / storage      = %s / %d / %s' % ( self.mesher , self.order , self.storage ) )
+        
+        # Print surface pressures [ MPa ]
+        print( 'Pressure in / out [ MPa ]     = %.2f / %.2f' % ( self.pressure[ 0 ] , self.pressure[ 1 ] ) )
+        
+        # Print solution summary
+        if( getattr( self , 'u' , None ) is not None ):
+            
+            # Print inner and outer displacements [ um ]
+            print( 'Inner displacement [ um ]     = %.4e' % self.u[ 0 , 0 ] )
+            print( 'Outer displacement [ um ]     = %.4e' % self.u[ -1 , 0 ] )
+            
+            # Print displacement range [ um ]
+            print( 'Displacement range [ um ]     = [ %.4e , %.4e ]' % ( self.u.min() , self.u.max() ) )
+        
+        # Print peak stresses after post processing
+        if( getattr( self , 'peakStress' , None ) is not None ):
             
+            # Loop over regions
+            for region, peak in zip( REGIONS , self.peakStress ):
+                
+                # Print peak radial and tangential stresses [ MPa ]
+                print( '%-6s peak stress r / t [ MPa ] = %.4e / %.4e' % ( region , *peak ) )
+        
+        # Summary only ( element structs and global matrices with verbose , use ResultsWriter for the fields )
+        if( not verbose ):
+            
+            # Print footer
+            print( '--------------------------------------------------------------------' )
+            return
+        
         # Print elements struct
         print( 'Elements' )
         
@@ -454,7 +941,10 @@ class FEM:
          
         # Print global stiffness
         print( 'Global stiffness: ' )
-        print( self.K )
+        if( self.storage == 'banded' ):
+            print( bandedToDense( self.K , self.lower , self.upper ) )
+        else:
+            print( self.K )
         
         # Print global internal force vector
         print( 'Global internal force vector: ' )
@@ -0,0 +1,187 @@
+# Import numpy library
+import numpy as np
+
+# Import functions
+from Quadrature import quadrature, shapeFunctions
+from Profiler import count
+
+##################
+# ELEMENT KERNEL #
+##################
+
+# Batched element kernel - Equations (12) to (14) for every element at once
+# Nodal inputs have shape ( ..., Nnodes ) with the last axis holding the element nodes ( 2 = linear / 3 = quadratic )
+# Poisson ratio has shape ( ... ) with one value per element
+# Element stiffness matrices are returned with shape ( ..., Nnodes, Nnodes )
+# Element internal and external force vectors are returned with shape ( ..., Nnodes )
+# Ngauss selects the precomputed quadrature rule ( 1 to 6 gauss points )
+def elementKernel( x: np.ndarray, d11: np.ndarray, d12: np.ndarray, er: np.ndarray, et: np.ndarray, v: np.ndarray, dudr: float = 0.0, Ngauss: int = 2 ):
+    
+    ##################
+    # INITIALIZATION #
+    ##################
+    
+    # Batch shape
+    shape = np.shape( x )[ :-1 ]
+    
+    # Kernel call and element counters ( profiler hooks )
+    count( 'elementKernel.calls' )
+    count( 'elementKernel.elements' , np.prod( shape , dtype = int ) )
+    
+    # Number of element nodes
+    Nnodes = np.shape( x )[ -1 ]
+    
+    # Stiffness matrices initialization
+    Ke = np.zeros( shape + ( Nnodes , Nnodes ) )
+    
+    # Internal force vectors initialization
+    Fei = np.zeros( shape + ( Nnodes , ) )
+    
+    # External force vectors initialization
+    Fee = np.zeros( shape + ( Nnodes , ) )
+    
+    ###########################
+    # GAUSS QUADRATURE POINTS #
+    ###########################
+    
+    # Precomputed gauss points , weights and shape function tables
+    rule = quadrature( Ngauss , Nnodes )
+    
+    #######################
+    # LOOP # GAUSS POINTS #
+    #######################
+    
+    # Loop over gauss ( shape functions and derivatives from the quadrature tables )
+    for r, w, Nr, DNr in zip( rule.points , rule.weights , rule.N , rule.DN ):
+        
+        ############
+        # JACOBIAN #
+        ############
+        
+        # Jacobian definition ( constant for linear elements and centred middle nodes )
+        J = x @ DNr
+        
+        ##################################
+        # DERIVATIVES # NATURAL GRADIENT #
+        ##################################
+        
+        # Get derivative from d11 and d12
+        Dd11 = d11 @ DNr
+        Dd12 = d12 @ DNr
+        
+        # Get derivative from radial and tangent irridiation
+        Deret = ( er - et ) @ DNr
+        
+        # Get derivative from tangent irridiation
+        Det = et @ DNr
+        
+        # Lambda 1 definition ( constant inside linear elements )
+        lambda1 = Deret + ( ( ( 1.0 + v ) / ( 1.0 - v ) ) * Det )
+        
+        ########
+        # ZETA #
+        ########
+        
+        # Get d11 on gauss point
+        d11r = d11 @ Nr
+        
+        # Zeta definitions - Initial conditions
+        zeta1 = + 2.0 + ( ( r / d11r ) * Dd11 )
+        zeta2 = - 2.0 + ( ( r / d11r ) * Dd12 )
+        
+        ##########
+        # LAMBDA #
+        ##########
+        
+        # Get er and et on gauss point
+        err = er @ Nr
+        etr = et @ Nr
+        
+        # Lambda 2 definition
+        lambda2 = ( 2.0 * ( ( ( 1.0 - ( 2.0 * v ) ) / ( 1.0 - v ) ) * ( err - etr ) ) ) + ( ( r / d11r ) * Dd11 * err ) + ( ( r / d11r ) * Dd12 * etr )
+        
+        ###################
+        # STIFFNESS TERMS #
+        ###################
+        
+        # Stiffness terms ( outer products over the local nodes )
+        Ke += ( 4.0 * w * np.pi * ( ( ( ( r * r ) / J )[ ..., None, None ] * np.outer( DNr , DNr ) ) + ( ( ( 2.0 - zeta1 ) * r )[ ..., None, None ] * np.outer( Nr , DNr ) ) - ( ( zeta2 * J )[ ..., None, None ] * np.outer( Nr , Nr ) ) ) )
+        
+        #########################
+        # INTERNAL FORCES TERMS #
+        #########################
+        
+        # External coordinate points
+        rminus = - 1.0
+        rplus = + 1.0
+        
+        # Internal forces terms on the end nodes ( weights sum to 2 for any number of gauss points )
+        Fei[ ..., 0 ] += 0.5 * w * ( - 4.0 * np.pi * ( rminus ) * ( rminus ) * dudr )
+        Fei[ ..., -1 ] += 0.5 * w * ( + 4.0 * np.pi * ( rplus ) * ( rplus ) * dudr )
+        
+        #########################
+        # EXTERNAL FORCES TERMS #
+        #########################
+        
+        # External forces terms
+        Fee += ( - 4.0 * w * np.pi * r * J * ( ( r * lambda1 ) + lambda2 ) )[ ..., None ] * Nr
+    
+    # Return element matrices
+    return Ke, Fei, Fee
+
+#################
+# STRAIN KERNEL #
+#################
+
+# Batched element strains - Equation (5) at the natural coordinate r of every element
+# Nodal coordinates and displacements have shape ( ..., Nnodes )
+# Radial and tangential strains are returned with shape ( ..., 2 )
+def strainKernel( x: np.ndarray, u: np.ndarray, r: float = 0.0 ):
+    
+    # Shape functions and derivatives on the natural point
+    N, DN = shapeFunctions( r , np.shape( x )[ -1 ] )
+    
+    # Radial coordinate on the natural point
+    radius = x @ N[ 0 ]
+    
+    # Radial strain ( du / dr )
+    epsilonr = ( u @ DN[ 0 ] ) / ( x @ DN[ 0 ] )
+    
+    # Tangential strain ( u / r )
+    epsilont = ( u @ N[ 0 ] ) / radius
+    
+    # Return strains
+    return np.stack( ( epsilonr , epsilont ) , axis = -1 )
+
+#################
+# STRESS KERNEL #
+#################
+
+# Batched strain and stress recovery - Equations (5) and (8) on the natural points of every element
+# Nodal coordinates , displacements and irridiation fields have shape ( ..., Nnodes ) and G matrices shape ( ..., 2, 2 )
+# Returns the radial coordinates ( ..., Npoints ) and the strains and stresses ( ..., Npoints, 2 ) with [ radial , tangential ] components
+def stressKernel( x: np.ndarray, u: np.ndarray, er: np.ndarray, et: np.ndarray, G: np.ndarray, points: np.ndarray ):
+    
+    # Radial coordinates , strains and stresses per natural point
+    radius, epsilon, sigma = [ ], [ ], [ ]
+    
+    # Loop over natural points
+    for r in np.atleast_1d( points ):
+        
+        # Shape functions on the natural point
+        N, _ = shapeFunctions( r , np.shape( x )[ -1 ] )
+        
+        # Radial coordinate
+        radius.append( x @ N[ 0 ] )
+        
+        # Strains on the natural point - Equation (5)
+        epsilon.append( strainKernel( x , u , r ) )
+        
+        # Irridiation strains interpolated from the nodal fields
+        epsilon0 = np.stack( ( er @ N[ 0 ] , et @ N[ 0 ] ) , axis = -1 )
+        
+        # Stresses on the natural point - Equation (8)
+        sigma.append( np.einsum( '...ij,...j->...i' , G , epsilon[ -1 ] - epsilon0 ) )
+    
+    # Return coordinates , strains and stresses
+    return np.stack( radius , axis = -1 ), np.stack( epsilon , axis = -2 ), np.stack( sigma , axis = -2 )
@@ -0,0 +1,510 @@
+# Import dataclass library
+from dataclasses import dataclass
+
+# Import list library
+import typing
+
+# Import namespace library
+from types import SimpleNamespace
+
+# Import numpy library
+import numpy as np
+
+# Import functions
+from Node import Node
+from Element import Element, materialMatrices, irridiationMatrix, gMatrix
+
+###########
+# REGIONS #
+###########
+
+# Region names ( region index used in the mesh arrays )
+REGIONS = ( 'Buffer' , 'IPyC' , 'SiC' , 'OPyC' )
+
+####################
+# ELEMENT TO NODES #
+####################
+
+# Nodal projections ( 'length' = element length weighted average / 'legacy' = previous halve and add rule )
+PROJECTIONS = ( 'length' , 'legacy' )
+
+# Element values to nodal values along the last axis - Element length weighted average of the two adjacent elements
+# ( lengths h broadcast against values , boundary nodes take their element value ) - Deterministic , no element loop order
+def projectToNodes( values: np.ndarray, h: np.ndarray ):
+    
+    # Element values and lengths
+    values = np.asarray( values , dtype = float )
+    h = np.broadcast_to( h , values.shape )
+    
+    # Length weighted element values
+    weighted = values * h
+    
+    # Nodal values initialization
+    nodal = np.empty( values.shape[ :-1 ] + ( values.shape[ -1 ] + 1 , ) )
+    
+    # Interior nodes ( left and right elements )
+    nodal[ ..., 1:-1 ] = ( weighted[ ..., :-1 ] + weighted[ ..., 1: ] ) / ( h[ ..., :-1 ] + h[ ..., 1: ] )
+    
+    # Boundary nodes
+    nodal[ ..., 0 ] = values[ ..., 0 ]
+    nodal[ ..., -1 ] = values[ ..., -1 ]
+    
+    # Return nodal values
+    return nodal
+
+# Values on the element nodes to nodal values - Element length weighted average over the elements sharing a node
+# values ( ..., Nelements, order + 1, k ) , connectivity ( Nelements x ( order + 1 ) ) , lengths h broadcast against ( ..., Nelements )
+def averageToNodes( values: np.ndarray, connectivity: np.ndarray, h: np.ndarray, Nnodes: int ):
+    
+    # Element lengths
+    h = np.broadcast_to( h , values.shape[ :-2 ] )
+    
+    # Weighted sums and weights initialization
+    nodal = np.zeros( values.shape[ :-3 ] + ( Nnodes , values.shape[ -1 ] ) )
+    weight = np.zeros( values.shape[ :-3 ] + ( Nnodes , ) )
+    
+    # Loop over local nodes ( distinct global nodes for a given local node )
+    for a in range( connectivity.shape[ 1 ] ):
+        nodal[ ..., connectivity[ :, a ] , : ] += h[ ..., None ] * values[ ..., a , : ]
+        weight[ ..., connectivity[ :, a ] ] += h
+    
+    # Return nodal values
+    return nodal / weight[ ..., None ]
+
+# Element values to nodal values along the last axis - Previous rule of the element by element node setters:
+# a node takes the value of its left element and is then averaged with its right element,
+# unless the left value is zero, in which case the right value replaces it ( kept to reproduce earlier results )
+def elementToNodes( values: np.ndarray ):
+    
+    # Nodal values initialization
+    nodal = np.zeros( np.shape( values )[ :-1 ] + ( np.shape( values )[ -1 ] + 1 , ) )
+    
+    # Left element values ( set first by node 2 of element i - 1 )
+    left = values[ ..., :-1 ]
+    
+    # Right element values ( set afterwards by node 1 of element i )
+    right = values[ ..., 1: ]
+    
+    # Interior nodes
+    nodal[ ..., 1:-1 ] = np.where( left == 0.0 , right , ( left / 2.0 ) + ( right / 2.0 ) )
+    
+    # Boundary nodes
+    nodal[ ..., 0 ] = values[ ..., 0 ]
+    nodal[ ..., -1 ] = values[ ..., -1 ]
+    
+    # Return nodal values
+    return nodal
+
+##############
+# MESH CLASS #
+##############
+
+# Mesh class initialization - Struct of arrays holding every node and element
+@dataclass
+class Mesh:
+    
+    ###################
+    # NUMBER OF NODES #
+    ###################
+    
+    # Number of nodes
+    Nnodes: int
+    
+    ######################
+    # NUMBER OF ELEMENTS #
+    ######################
+    
+    # Number of elements
+    Nelements: int
+    
+    #################
+    # ELEMENT ORDER #
+    #################
+    
+    # Element order ( 1 = linear 2 node elements / 2 = quadratic 3 node elements )
+    order: int
+    
+    ####################
+    # NODAL PROJECTION #
+    ####################
+    
+    # Element to nodes projection ( see PROJECTIONS )
+    projection: str
+    
+    ####################
+    # GAUSS QUADRATURE #
+    ####################
+    
+    # Number of gauss points per element of the owning FEM ( used by the element views )
+    Ngauss: int
+    
+    ###############
+    # COORDINATES #
+    ###############
+    
+    # Nodal radial coordinates ( Nnodes )
+    x: np.ndarray
+    
+    # Element lengths ( Nelements )
+    h: np.ndarray
+    
+    ################
+    # CONNECTIVITY #
+    ################
+    
+    # Element connectivity ( Nelements x ( order + 1 ) )
+    connectivity: np.ndarray
+    
+    ##########
+    # REGION #
+    ##########
+    
+    # Element region index into REGIONS ( Nelements )
+    region: np.ndarray
+    
+    #############
+    # MATERIALS #
+    #############
+    
+    # Material structs
+    materials: 'typing.Any'
+    
+    # Element material index into materials ( Nelements )
+    material: np.ndarray
+    
+    #####################
+    # MATERIAL MATRICES #
+    #####################
+    
+    # Constitutive, irridiation and G matrices per material ( Nmaterials x 2 x 2 )
+    C: np.ndarray
+    A: np.ndarray
+    G: np.ndarray
+    
+    #########################
+    # NODAL D / IRRIDIATION #
+    #########################
+    
+    # Nodal D parameters ( Nnodes )
+    d11: np.ndarray
+    d12: np.ndarray
+    
+    # Nodal radial and tangential irridiation induced change rate ( Nnodes )
+    er: np.ndarray
+    et: np.ndarray
+    
+    ###########################
+    # ELEMENT D / IRRIDIATION #
+    ###########################
+    
+    # Element D parameters ( Nelements )
+    elementd11: np.ndarray
+    elementd12: np.ndarray
+    
+    # Element radial and tangential irridiation induced change rate ( Nelements )
+    elementer: np.ndarray
+    elementet: np.ndarray
+    
+    ###########
+    # THERMAL #
+    ###########
+    
+    # Nodal thermal strain relative to the irridiation temperature ( Nnodes , set by Thermal.couple )
+    eth: np.ndarray
+    
+    # Element irridiation creep coefficient ( Nelements , None = material values )
+    elementK: 'typing.Any'
+    
+    ###################
+    # ELEMENT RESULTS #
+    ###################
+    
+    # Stacked element stiffness matrices ( Nelements x ( order + 1 ) x ( order + 1 ) )
+    Ke: np.ndarray
+    
+    # Stacked element internal and external force vectors ( Nelements x ( order + 1 ) )
+    Fei: np.ndarray
+    Fee: np.ndarray
+    
+    # Stacked element displacement vectors ( Nelements x ( order + 1 ) )
+    ue: np.ndarray
+    
+    ##################
+    # INITIALIZATION #
+    ##################
+    
+    # Initialization
+    def __init__ ( self, x: np.ndarray, region: np.ndarray, materials: list, material: np.ndarray, order: int = 1, projection: str = 'length', Ngauss: int = 2 ):
+        
+        # Nodal coordinates allocation
+        self.x = np.ascontiguousarray( x , dtype = float )
+        
+        # Number of nodes
+        self.Nnodes = self.x.shape[ 0 ]
+        
+        # Check element order
+        if( order not in ( 1 , 2 ) or ( self.Nnodes - 1 ) % order != 0 ):
+            raise ValueError( 'Element order must be 1 or 2 with Nnodes - 1 a multiple of the order ( got order %s with %d nodes )' % ( order , self.Nnodes ) )
+        
+        # Element order allocation
+        self.order = order
+        
+        # Number of elements
+        self.Nelements = ( self.Nnodes - 1 ) // order
+        
+        # Element connectivity ( element i connects nodes order * i to order * i + order )
+        self.connectivity = ( ( order * np.arange( self.Nelements , dtype = np.int32 ) )[ :, None ] + np.arange( order + 1 , dtype = np.int32 ) ).astype( np.int32 )
+        
+        # Element lengths
+        self.h = self.x[ self.connectivity[ :, -1 ] ] - self.x[ self.connectivity[ :, 0 ] ]
+        
+        # Check nodal projection
+        if( projection not in PROJECTIONS ):
+            raise ValueError( "Unknown nodal projection '%s' ( expected %s )" % ( projection , ' or '.join( "'%s'" % name for name in PROJECTIONS ) ) )
+        
+        # Nodal projection allocation
+        self.projection = projection
+        
+        # Number of gauss points allocation
+        self.Ngauss = int( Ngauss )
+        
+        # Region allocation
+        self.region = np.asarray( region , dtype = np.int8 )
+        
+        # Material structs allocation
+        self.materials = list( materials )
+        
+        # Material index allocation
+        self.material = np.asarray( material , dtype = np.int8 )
+        
+        # Material matrices initialization
+        self.C = np.zeros( ( len( self.materials ) , 2 , 2 ) )
+        self.A = np.zeros( ( len( self.materials ) , 2 , 2 ) )
+        self.G = np.zeros( ( len( self.materials ) , 2 , 2 ) )
+        
+        # Nodal fields initialization
+        self.d11 = np.zeros( self.Nnodes )
+        self.d12 = np.zeros( self.Nnodes )
+        self.er = np.zeros( self.Nnodes )
+        self.et = np.zeros( self.Nnodes )
+        
+        # Element fields initialization
+        self.elementd11 = np.zeros( self.Nelements )
+        self.elementd12 = np.zeros( self.Nelements )
+        self.elementer = np.zeros( self.Nelements )
+        self.elementet = np.zeros( self.Nelements )
+        
+        # Thermal fields initialization ( isothermal , material creep coefficients )
+        self.eth = np.zeros( self.Nnodes )
+        self.elementK = None
+        
+        # Element results initialization
+        self.Ke = np.zeros( ( self.Nelements , order + 1 , order + 1 ) )
+        self.Fei = np.zeros( ( self.Nelements , order + 1 ) )
+        self.Fee = np.zeros( ( self.Nelements , order + 1 ) )
+        self.ue = np.zeros( ( self.Nelements , order + 1 ) )
+    
+    ###########################
+    # SET # MATERIAL MATRICES #
+    ###########################
+    
+    # Set constitutive, irridiation and G matrices once per material ( shared through the matrix cache )
+    def setMatrices( self, beta: float ):
+        
+        # Loop over materials
+        for m, material in enumerate( self.materials ):
+            
+            # Constitutive, irridiation and G matrices - Equations (2), (4) and (8)
+            self.C[ m ], self.A[ m ], self.G[ m ] = materialMatrices( material, beta, material.phi )
+    
+    #############################
+    # ELEMENT MATERIAL MATRICES #
+    #############################
+    
+    # Constitutive, irridiation and G matrices per element ( Nelements x 2 x 2 ) for beta and fluence phi ( stored material matrices by default )
+    # Element creep coefficients of the thermal field ( see Thermal.couple ) replace the material values in the irridiation and G matrices
+    def elementMaterialMatrices( self, beta: float, phi: float = None ):
+        
+        # Matrices per material
+        if( phi is None ):
+            C, A, G = self.C, self.A, self.G
+        else:
+            C, A, G = map( np.array , zip( *( materialMatrices( material , beta , phi ) for material in self.materials ) ) )
+        
+        # Matrices gathered per element
+        Ce, Ae, Ge = C[ self.material ], A[ self.material ], G[ self.material ]
+        
+        # Element creep coefficients
+        if( self.elementK is not None ):
+            
+            # Element creep Poisson ratio and fluence
+            vc = np.array( [ material.vc for material in self.materials ] )[ self.material ]
+            phi = np.array( [ material.phi for material in self.materials ] )[ self.material ] if phi is None else phi
+            
+            # Irridiation and G matrices per element - Equations (4) and (8)
+            Ae = irridiationMatrix( SimpleNamespace( K = self.elementK , vc = vc ) )
+            Ge = gMatrix( Ce , Ae , beta , phi )
+        
+        # Return element matrices
+        return Ce, Ae, Ge
+    
+    ############################
+    # SET # INITIAL CONDITIONS #
+    ############################
+    
+    # Set element and nodal D parameters and irridiation from the element materials
+    def setInitialConditions( self ):
+        
+        ##################
+        # ELEMENT FIELDS #
+        ##################
+        
+        # Material properties gathered per element
+        E = np.array( [ material.E for material in self.materials ] )[ self.material ]
+        v = np.array( [ material.v for material in self.materials ] )[ self.material ]
+        
+        # Set D parameters on elements
+        self.elementd11 = E * ( 1.0 - v ) / ( ( 1.0 + v ) + ( 1.0 - ( 2.0 * v ) ) )
+        self.elementd12 = E * ( 2.0 * v ) / ( ( 1.0 + v ) + ( 1.0 - ( 2.0 * v ) ) )
+        
+        # Set irridiation on elements
+        self.elementer = np.array( [ material.er for material in self.materials ] )[ self.material ]
+        self.elementet = np.array( [ material.et for material in self.materials ] )[ self.material ]
+        
+        ################
+        # NODAL FIELDS #
+        ################
+        
+        # Set nodal values from the adjacent elements
+        self.d11 = self.elementToNodes( self.elementd11 )
+        self.d12 = self.elementToNodes( self.elementd12 )
+        self.er = self.elementToNodes( self.elementer )
+        self.et = self.elementToNodes( self.elementet )
+    
+    ####################
+    # ELEMENT TO NODES #
+    ####################
+    
+    # Element values to nodal values ( see projectToNodes / elementToNodes ) - middle nodes of quadratic elements take their element value
+    def elementToNodes( self, values: np.ndarray ):
+        
+        # End nodes of the elements
+        ends = projectToNodes( values , self.h ) if self.projection == 'length' else elementToNodes( values )
+        
+        # Linear elements
+        if( self.order == 1 ):
+            return ends
+        
+        # Nodal values initialization
+        nodal = np.zeros( np.shape( values )[ :-1 ] + ( self.Nnodes , ) )
+        
+        # End nodes of the elements
+        nodal[ ..., ::self.order ] = ends
+        
+        # Middle nodes of the elements
+        nodal[ ..., self.connectivity[ :, 1:-1 ] ] = np.asarray( values )[ ..., None ]
+        
+        # Return nodal values
+        return nodal
+    
+    # Nodal D parameters and irridiation on the nodes of element i only - The end nodes depend on the adjacent elements only ,
+    # so projecting element i and its neighbours gives the values of setInitialConditions for any call order
+    def setElementNodes( self, i: int ):
+        
+        # Neighbour window ( elements i - 1 to i + 1 inside the mesh )
+        lo, hi = max( i - 1 , 0 ), min( i + 2 , self.Nelements )
+        
+        # Element nodes and window positions of its end nodes
+        nodes = self.connectivity[ i ]
+        ends = [ i - lo , i - lo + 1 ]
+        
+        # Loop over fields
+        for field in ( 'd11' , 'd12' , 'er' , 'et' ):
+            
+            # Element values of the window
+            values = getattr( self , 'element' + field )[ lo:hi ]
+            
+            # End nodes from the window projection
+            getattr( self , field )[ nodes[ [ 0 , -1 ] ] ] = ( projectToNodes( values , self.h[ lo:hi ] ) if self.projection == 'length' else elementToNodes( values ) )[ ends ]
+            
+            # Middle nodes of quadratic elements take the element value
+            getattr( self , field )[ nodes[ 1:-1 ] ] = values[ i - lo ]
+    
+    ################
+    # EIGENSTRAINS #
+    ################
+    
+    # Nodal radial and tangential eigenstrains ( irridiation induced change plus thermal strain )
+    def eigenstrains( self ):
+        
+        # Return nodal eigenstrains
+        return self.er + self.eth, self.et + self.eth
+    
+    #########
+    # VIEWS #
+    #########
+    
+    # Node view
+    def node( self, i: int ):
+        
+        # Node view on index i
+        return Node( self, i )
+    
+    # Element view
+    def element( self, i: int ):
+        
+        # Element view on index i
+        return Element( self, i )
+    
+    ##########
+    # MEMORY #
+    ##########
+    
+    # Memory used by the mesh arrays [ bytes ]
+    def nbytes( self ):
+        
+        # Sum of all array buffers
+        return sum( value.nbytes for value in vars( self ).values() if isinstance( value , np.ndarray ) )
+
+#############
+# VIEW LIST #
+#############
+
+# Lazy list of node or element views ( views are created on access only )
+class ViewList( typing.Sequence ):
+    
+    # Initialization
+    def __init__ ( self, mesh: Mesh, view: type, size: int ):
+        
+        # Mesh allocation
+        self.mesh = mesh
+        
+        # View class allocation
+        self.view = view
+        
+        # Number of views
+        self.size = size
+    
+    # Number of views
+    def __len__ ( self ):
+        
+        # Return size
+        return self.size
+    
+    # View on index i
+    def __getitem__ ( self, i ):
+        
+        # Slices return plain lists of views
+        if( isinstance( i , slice ) ):
+            return [ self.view( self.mesh , j ) for j in range( *i.indices( self.size ) ) ]
+        
+        # Negative index
+        if( i < 0 ):
+            i += self.size
+        
+        # Check range
+        if( not 0 <= i < self.size ):
+            raise IndexError( 'view index out of range' )
+        
+        # Return view
+        return self.view( self.mesh , i )
@@ -0,0 +1,149 @@
+# Import numpy library
+import numpy as np
+
+###########
+# MESHERS #
+###########
+
+# Available meshers ( 'uniform' = legacy equal spacing over the coating / 'layers' = nodes on every layer interface / 'nodes' = given element end nodes )
+MESHERS = ( 'uniform' , 'layers' , 'nodes' )
+
+################
+# UNIFORM MESH #
+################
+
+# Legacy mesh - Equal node spacing over the total coating length L from the kernel radius Li with Nregion elements per region
+# Li and L may be arrays ( one mesh per value along the leading axis )
+def uniformMesh( Li, L, Nregion: int, order: int = 1 ):
+    
+    # Number of elements
+    Nelements = 4 * int( Nregion )
+    
+    # Coordinate definition
+    x = np.asarray( Li )[ ..., None ] + ( ( np.asarray( L ) / ( order * Nelements ) )[ ..., None ] * np.arange( ( order * Nelements ) + 1 ) )
+    
+    # Region definition ( Buffer / IPyC / SiC / OPyC with Nregion elements each )
+    region = np.arange( Nelements ) // int( Nregion )
+    
+    # Return coordinates and regions
+    return x, region
+
+##################
+# GRADED SPACING #
+##################
+
+# Node fractions of a layer with n elements ( 0 to 1 ) - element sizes grow by the factor grading
+# from both interfaces toward the layer middle ( grading = 1 gives equal spacing )
+def gradedFractions( n: int, grading: float = 1.0 ):
+    
+    # Element index
+    k = np.arange( n )
+    
+    # Relative element sizes ( smallest on the interfaces )
+    sizes = grading ** np.minimum( k , n - 1 - k )
+    
+    # Node fractions
+    fractions = np.concatenate( ( [ 0.0 ] , np.cumsum( sizes ) / sizes.sum() ) )
+    
+    # Last node exactly on the interface
+    fractions[ -1 ] = 1.0
+    
+    # Return fractions
+    return fractions
+
+##############
+# LAYER MESH #
+##############
+
+# Interface aligned mesh - Every layer meshed on its own with counts[ l ] elements and nodes placed exactly on the interfaces
+# thicknesses holds the Buffer , IPyC , SiC and OPyC thicknesses ( each may be an array , one mesh per value along the leading axis )
+def layerMesh( Li, thicknesses: tuple, counts: tuple, grading: float = 1.0, order: int = 1 ):
+    
+    # Check layers
+    if( len( thicknesses ) != 4 or len( counts ) != 4 or min( counts ) < 1 ):
+        
+        # Wrong layer definition
+        raise ValueError( 'Layer mesh needs 4 thicknesses and 4 element counts of at least 1 ( Buffer , IPyC , SiC , OPyC )' )
+    
+    # Inner radius of the layer
+    start = np.asarray( Li , dtype = float )
+    
+    # Coordinates of every layer
+    pieces = [ start[ ..., None ] ]
+    
+    # Loop over layers
+    for thickness, n in zip( thicknesses , counts ):
+        
+        # Node fractions of the element end nodes
+        fractions = gradedFractions( int( n ) , grading )
+        
+        # Middle nodes of quadratic elements centred on their element
+        if( order == 2 ):
+            
+            # Middle node fractions
+            middle = ( fractions[ :-1 ] + fractions[ 1: ] ) / 2.0
+            
+            # Interleave middle and end nodes
+            fractions = np.stack( ( np.concatenate( ( [ 0.0 ] , middle ) ) , fractions ) , axis = -1 ).ravel()[ 1: ]
+        
+        # Outer radius of the layer
+        end = start + np.asarray( thickness , dtype = float )
+        
+        # Layer coordinates ( first node is the previous interface )
+        layer = start[ ..., None ] + ( np.asarray( thickness , dtype = float )[ ..., None ] * fractions[ 1: ] )
+        
+        # Interface node exactly on the layer outer radius
+        layer[ ..., -1 ] = end
+        
+        # Layer allocation
+        pieces.append( layer )
+        
+        # Next layer
+        start = end
+    
+    # Coordinate definition
+    x = np.concatenate( pieces , axis = -1 )
+    
+    # Region definition
+    region = np.repeat( np.arange( 4 ) , np.asarray( counts , dtype = int ) )
+    
+    # Return coordinates and regions
+    return x, region
+
+#############
+# NODE MESH #
+#############
+
+# Mesh from given element end nodes ( user given or refined meshes ) - Regions follow from the element centres and the layer interfaces
+# Quadratic elements get their middle node on the element centre
+def nodeMesh( Li: float, thicknesses: tuple, nodes: np.ndarray, order: int = 1 ):
+    
+    # Element end nodes
+    nodes = np.asarray( nodes , dtype = float )
+    
+    # Layer interfaces ( kernel radius , Buffer / IPyC , IPyC / SiC , SiC / OPyC , outer radius )
+    interfaces = Li + np.concatenate( ( [ 0.0 ] , np.cumsum( thicknesses ) ) )
+    
+    # Check nodes
+    if( nodes.ndim != 1 or nodes.size < 2 or np.any( np.diff( nodes ) <= 0.0 ) or not np.allclose( nodes[ [ 0 , -1 ] ] , interfaces[ [ 0 , -1 ] ] ) ):
+        
+        # Wrong nodes
+        raise ValueError( 'Mesh nodes must be increasing from the kernel radius %g to the outer radius %g' % ( interfaces[ 0 ] , interfaces[ -1 ] ) )
+    
+    # Element centres
+    centres = ( nodes[ :-1 ] + nodes[ 1: ] ) / 2.0
+    
+    # Region definition ( layer holding the element centre )
+    region = np.clip( np.searchsorted( interfaces , centres ) - 1 , 0 , 3 )
+    
+    # Coordinate definition
+    x = nodes.copy()
+    
+    # Middle nodes of quadratic elements
+    if( order == 2 ):
+        
+        # Interleave middle and end nodes
+        x = np.stack( ( np.concatenate( ( [ 0.0 ] , centres ) ) , nodes ) , axis = -1 ).ravel()[ 1: ]
+    
+    # Return coordinates and regions
+    return x, region
@@ -0,0 +1,183 @@
+# Import dataclass library
+from dataclasses import dataclass
+
+# Import list library
+import typing
+
+# Import numpy library
+import numpy as np
+
+# Import functions
+from Banded import zerosBanded, solveBanded
+from Profiler import count
+
+###################
+# BANDED JACOBIAN #
+###################
+
+# Banded jacobian of a residual by finite differences with column coloring
+# Columns more than 2 * width apart touch disjoint rows and are perturbed together ( 2 * width + 1 residual evaluations )
+# Returns the jacobian in banded storage with lower = upper = width
+def bandedJacobian( residual: 'typing.Any', u: np.ndarray, R: np.ndarray, width: int, h: float ):
+    
+    # Number of unknowns
+    N = u.size
+    
+    # Jacobian initialization
+    J = zerosBanded( N , width , width )
+    
+    # Loop over colors
+    for color in range( min( ( 2 * width ) + 1 , N ) ):
+        
+        # Columns of the color
+        columns = np.arange( color , N , ( 2 * width ) + 1 )
+        
+        # Perturbed residual difference
+        trial = u.copy()
+        trial[ columns ] += h
+        dR = ( residual( trial ) - R ) / h
+        
+        # Loop over diagonals ( row i = j + k of column j is stored in J[ width + k , j ] )
+        for k in range( - width , width + 1 ):
+            valid = columns[ ( columns + k >= 0 ) & ( columns + k < N ) ]
+            J[ width + k , valid ] = dR[ valid + k ]
+    
+    # Return banded jacobian
+    return J
+
+#########################
+# NEWTON RAPHSON SOLVER #
+#########################
+
+# Newton Raphson class initialization - Solves R( u ) = 0 with a banded finite difference jacobian and a backtracking line search
+# Converged when | R | <= tolerance * | R( 0 ) | + absoluteTolerance or the Newton correction is below tolerance * | u |
+@dataclass
+class Newton:
+    
+    ##############
+    # TOLERANCES #
+    ##############
+    
+    # Relative and absolute residual tolerances
+    tolerance: float
+    absoluteTolerance: float
+    
+    # Maximum number of iterations
+    maxIterations: int
+    
+    ###############
+    # LINE SEARCH #
+    ###############
+    
+    # Maximum number of step halvings
+    lineSearch: int
+    
+    ##########################
+    # FINITE DIFFERENCE STEP #
+    ##########################
+    
+    # Relative perturbation of the jacobian columns
+    step: float
+    
+    ###########
+    # HISTORY #
+    ###########
+    
+    # Iterations and final residual norm of every solve
+    iterations: list
+    residuals: list
+    
+    ##################
+    # INITIALIZATION #
+    ##################
+    
+    # Initialization
+    def __init__ ( self, tolerance: float = 1.0e-8, absoluteTolerance: float = 1.0e-14, maxIterations: int = 20, lineSearch: int = 8, step: float = 1.0e-7 ):
+        
+        # Tolerances allocation
+        self.tolerance = tolerance
+        self.absoluteTolerance = absoluteTolerance
+        self.maxIterations = int( maxIterations )
+        
+        # Line search allocation
+        self.lineSearch = int( lineSearch )
+        
+        # Finite difference step allocation
+        self.step = step
+        
+        # History initialization
+        self.iterations = [ ]
+        self.residuals = [ ]
+    
+    #########
+    # SOLVE #
+    #########
+    
+    # Solve R( u ) = 0 from the initial guess u0 ( warm start ) with a jacobian of half bandwidth width
+    # The residual reference defaults to | R( 0 ) | - Returns the solution and the convergence flag
+    def solve( self, residual: 'typing.Any', u0: np.ndarray, width: int, reference: float = None ):
+        
+        # Initial guess and residual
+        u = np.array( u0 , dtype = float )
+        R = residual( u )
+        norm = np.linalg.norm( R )
+        
+        # Residual reference ( load of the unknown free state )
+        if( reference is None ):
+            reference = np.linalg.norm( residual( np.zeros_like( u ) ) )
+        
+        # Iterations
+        converged = False
+        iteration = 0
+        
+        #######################
+        # LOOP # NEWTON STEPS #
+        #######################
+        
+        # Loop over iterations
+        while( iteration < self.maxIterations ):
+            
+            # Residual convergence
+            if( norm <= ( self.tolerance * reference ) + self.absoluteTolerance ):
+                converged = True
+                break
+            
+            # Iteration counter ( profiler hook )
+            iteration += 1
+            count( 'Newton.iterations' )
+            
+            # Banded jacobian ( perturbation scaled with the solution )
+            h = self.step * max( np.abs( u ).max() , 1.0e-6 )
+            J = bandedJacobian( residual , u , R , width , h )
+            
+            # Newton correction
+            du = solveBanded( J , - R , width , width )
+            
+            ###############
+            # LINE SEARCH #
+            ###############
+            
+            # Full step first , halved until the residual decreases
+            alpha = 1.0
+            for _ in range( self.lineSearch + 1 ):
+                trial = u + ( alpha * du )
+                Rtrial = residual( trial )
+                normTrial = np.linalg.norm( Rtrial )
+                if( normTrial < ( 1.0 - ( 1.0e-4 * alpha ) ) * norm ):
+                    break
+                alpha *= 0.5
+            
+            # Iterate update
+            u, R, norm = trial, Rtrial, normTrial
+            
+            # Correction convergence ( full steps only )
+            if( alpha == 1.0 and np.linalg.norm( du ) <= self.tolerance * np.linalg.norm( u ) ):
+                converged = True
+                break
+        
+        # History allocation
+        self.iterations.append( iteration )
+        self.residuals.append( norm )
+        
+        # Return solution
+        return u, converged
@@ -1,219 +1,113 @@
 # Import dataclass library
 from dataclasses import dataclass
 
+# Import list library
+import typing
+
 ##############
 # NODE CLASS #
 ##############
 
-# Node class initialization
+# Node class initialization - Lightweight view on node i of a Mesh
 @dataclass
 class Node:
     
+    ###############
+    # MESH STRUCT #
+    ###############
+    
+    # Mesh struct holding the nodal arrays
+    mesh: 'typing.Any'
+    
+    #########
+    # INDEX #
+    #########
+    
+    # Node index in the mesh arrays
+    index: int
+    
+    ##################
+    # INITIALIZATION #
+    ##################
+    
+    # Initialization
+    def __init__ ( self, mesh: 'typing.Any', index: int ):
+        
+        # Mesh struct allocation
+        self.mesh = mesh
+        
+        # Index allocation
+        self.index = index
+    
     ######
     # ID #
     ######
     
     # Node ID
-    ID: int
+    @property
+    def ID( self ):
+        return self.index + 1
     
     ###############
     # COORDINATES #
     ###############
     
     # Radial coordinate
-    x: float    
-        
+    @property
+    def x( self ):
+        return self.mesh.x[ self.index ]
+    
     ################
     # D PARAMETERS #
     ################
     
     # D parameters
-    d11: float = 0.0
-    d12: float = 0.0
+    @property
+    def d11( self ):
+        return self.mesh.d11[ self.index ]
+    
+    @d11.setter
+    def d11( self, d11: float ):
+        self.mesh.d11[ self.index ] = d11
+    
+    @property
+    def d12( self ):
+        return self.mesh.d12[ self.index ]
+    
+    @d12.setter
+    def d12( self, d12: float ):
+        self.mesh.d12[ self.index ] = d12
     
     ##########################################
     # RADIAL IRRIDIATION INDUCED CHANGE RATE #
     ##########################################
     
     # Radial irridiation induced change rate ( - )
-    er: float = 0.0
+    @property
+    def er( self ):
+        return self.mesh.er[ self.index ]
+    
+    @er.setter
+    def er( self, er: float ):
+        self.mesh.er[ self.index ] = er
     
     ##############################################
     # TANGENTIAL IRRIDIATION INDUCED CHANGE RATE #
     ##############################################
     
     # Tangential irridiation induced change rate ( - )
-    et: float = 0.0
-    
-    ##################
-    # INITIALIZATION #
-    ##################
+    @property
+    def et( self ):
+        return self.mesh.et[ self.index ]
     
-    # Initialization
-    def __init__ ( self, ID: int, x: float ):
-        
-        # ID allocation
-        self.ID = ID
-        
-        # Radial coordinate definition
-        self.x = x    
-        
-    #############    
-    # SET # D11 #
-    #############
-        
-    # Set D11 parameter
-    def setd11( self, d11: float ):
-        
-        ###############
-        # CHECK # D11 #
-        ###############
-        
-        # Check if d11 parameter is zero
-        if( self.d11 == 0.0 ):
-            
-            ############
-            # ALLOCATE #
-            ############
-            
-            # Set d11 parameter
-            self.d11 += d11
-        
-        # Check if d11 parameter different than zero
-        else:
-            
-            ##########
-            # ADJUST #
-            ##########
-            
-            # Adjust weight
-            self.d11 /= 2.0
-            
-            ############
-            # ALLOCATE #
-            ############
-            
-            # Set d11 parameter
-            self.d11 += d11 / 2.0
-            
-    #############    
-    # SET # D12 #
-    #############
-        
-    # Set D12 parameter
-    def setd12( self, d12: float ):
-        
-        ###############
-        # CHECK # D12 #
-        ###############
-        
-        # Check if d12 parameter is zero
-        if( self.d12 == 0.0 ):
-            
-            ############
-            # ALLOCATE #
-            ############
-            
-            # Set d12 parameter
-            self.d12 += d12
-        
-        # Check if d12 parameter different than zero
-        else:
-            
-            ##########
-            # ADJUST #
-            ##########
-            
-            # Adjust weight
-            self.d12 /= 2.0
-            
-            ############
-            # ALLOCATE #
-            ############
-            
-            # Set d12 parameter
-            self.d12 += d12 / 2.0            
-          
-    ############################    
-    # SET # RADIAL IRRIDIATION #
-    ############################
-        
-    # Set radial irridiation
-    def seter( self, er: float ):
-        
-        ##############
-        # CHECK # ER #
-        ##############
-        
-        # Check if er parameter is zero
-        if( self.er == 0.0 ):
-            
-            ############
-            # ALLOCATE #
-            ############
-            
-            # Set er parameter
-            self.er += er
-        
-        # Check if er parameter different than zero
-        else:
-            
-            ##########
-            # ADJUST #
-            ##########
-            
-            # Adjust weight
-            self.er /= 2.0
-            
-            ############
-            # ALLOCATE #
-            ############
-            
-            # Set er parameter
-            self.er += er / 2.0
-            
-    #############################    
-    # SET # TANGENT IRRIDIATION #
-    #############################
-        
-    # Set tangent irridiation
-    def setet( self, et: float ):
-        
-        ##############
-        # CHECK # ET #
-        ##############
-        
-        # Check if et parameter is zero
-        if( self.et == 0.0 ):
-            
-            ############
-            # ALLOCATE #
-            ############
-            
-            # Set et parameter
-            self.et += et
-        
-        # Check if et parameter different than zero
-        else:
-            
-            ##########
-            # ADJUST #
-            ##########
-            
-            # Adjust weight
-            self.et /= 2.0
-            
-            ############
-            # ALLOCATE #
-            ############
-            
-            # Set et parameter
-            self.et += et / 2.0
+    @et.setter
+    def et( self, et: float ):
+        self.mesh.et[ self.index ] = et
     
     #########
     # PRINT #
     #########
-        
+    
     # Print
     def print( self ):
         
@@ -225,7 +119,7 @@ class Node:
         
         # Print radial coordinate
         print( 'Radial coordinate [ um ]      = %.2f' % self.x )        
-                
+        
         # Print d1 parameter
         print( 'd1 parameter [ MPa ]          = %.2f' % self.d11 )
         
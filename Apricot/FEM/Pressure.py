@@ -0,0 +1,134 @@
+# Import list library
+import typing
+
+# Import numpy library
+import numpy as np
+
+###################
+# PRESSURE MODELS #
+###################
+
+# Pressure versus fluence models
+#   'gas'     fission gas produced by the kernel burnup , Booth release and ideal gas in the buffer and kernel porosity
+#   'linear'  end of life internal pressure scaled with the fluence
+PRESSURE_MODELS = ( 'gas' , 'linear' )
+
+######################
+# FISSION GAS VALUES #
+######################
+
+# Universal gas constant [ J / ( mol K ) ]
+GAS_CONSTANT = 8.314462618
+
+# Kernel molar mass [ g / mol ] ( UO2 )
+KERNEL_MOLAR_MASS = 270.03
+
+# Kernel and buffer theoretical densities [ g / cm³ ]
+KERNEL_THEORETICAL_DENSITY = 10.96
+BUFFER_THEORETICAL_DENSITY = 2.25
+
+# Stable xenon and krypton atoms per fission
+GAS_YIELD = 0.31
+
+# Fission gas diffusion coefficient [ m² / s ] , activation energy [ J / mol ] and grain radius [ m ] ( Arrhenius law )
+DIFFUSION_COEFFICIENT = 7.6e-10
+ACTIVATION_ENERGY = 2.89e5
+GRAIN_RADIUS = 10.0e-6
+
+#################
+# BOOTH RELEASE #
+#################
+
+# Booth fractional release of a sphere with constant gas production for the dimensionless time tau = D' t
+# Short and long time approximations of the series solution ( vectorized over tau )
+def boothRelease( tau: np.ndarray ):
+    
+    # Dimensionless time
+    tau = np.maximum( np.asarray( tau , dtype = float ) , 0.0 )
+    
+    # Short time release ( tau < 1 / pi² )
+    shortTime = ( 4.0 * np.sqrt( tau / np.pi ) ) - ( 1.5 * tau )
+    
+    # Long time release ( division guarded on the short time branch )
+    longTime = 1.0 - ( ( 0.0662 / np.maximum( tau , 1.0 / ( np.pi * np.pi ) ) ) * ( 1.0 - ( 0.93 * np.exp( - np.pi * np.pi * tau ) ) ) )
+    
+    # Return release fraction
+    return np.where( tau < 1.0 / ( np.pi * np.pi ) , shortTime , longTime )
+
+################
+# GAS PRESSURE #
+################
+
+# Fission gas pressure [ MPa ] at the fluences phi of a model input
+# Burnup and irridiation time grow linearly with the fluence up to the end of life burnup [ % FIMA ] and EFPD [ days ]
+# The released gas fills the buffer and kernel porosity at the irridiation temperature
+def gasPressure( model: 'typing.Any', phi: np.ndarray, release: bool = True ):
+    
+    # Fluence fraction of the end of life
+    fraction = np.asarray( phi , dtype = float ) / float( model.endLifeFluence )
+    
+    # Burnup [ FIMA ] and irridiation time [ s ]
+    burnup = fraction * float( model.endLifeBumup ) / 100.0
+    time = fraction * float( model.EFDP ) * 86400.0
+    
+    # Gas temperature [ K ]
+    T = float( model.irridiationTemperature ) + 273.15
+    
+    ###########
+    # VOLUMES #
+    ###########
+    
+    # Kernel and buffer radii [ cm ]
+    r0 = float( model.kernelDiameter ) * 0.5e-4
+    r1 = r0 + ( float( model.bufferThickness ) * 1.0e-4 )
+    
+    # Kernel and buffer volumes [ cm³ ]
+    kernel = 4.0 * np.pi * r0**3 / 3.0
+    buffer = 4.0 * np.pi * ( r1**3 - r0**3 ) / 3.0
+    
+    # Free volume of the buffer and kernel porosity [ m³ ]
+    void = ( ( buffer * ( 1.0 - ( float( model.bufferDensity ) / BUFFER_THEORETICAL_DENSITY ) ) ) + ( kernel * max( 1.0 - ( float( model.kernelDensity ) / KERNEL_THEORETICAL_DENSITY ) , 0.0 ) ) ) * 1.0e-6
+    
+    ###############
+    # FISSION GAS #
+    ###############
+    
+    # Heavy metal moles of the kernel
+    heavyMetal = float( model.kernelDensity ) * kernel / KERNEL_MOLAR_MASS
+    
+    # Produced fission gas moles
+    produced = GAS_YIELD * burnup * heavyMetal
+    
+    # Released fraction ( Booth model on the reduced diffusion coefficient , full release otherwise )
+    if( release ):
+        released = boothRelease( DIFFUSION_COEFFICIENT * np.exp( - ACTIVATION_ENERGY / ( GAS_CONSTANT * T ) ) * time / ( GRAIN_RADIUS * GRAIN_RADIUS ) )
+    else:
+        released = np.ones_like( burnup )
+    
+    # Return ideal gas pressure [ Pa -> MPa ]
+    return produced * released * GAS_CONSTANT * T / void * 1.0e-6
+
+####################
+# PRESSURE HISTORY #
+####################
+
+# Inner and outer surface pressures [ MPa ] over a fluence schedule ( Nsteps + 1 x 2 ) - Computed once for the whole schedule
+def pressureHistory( model: 'typing.Any', schedule: np.ndarray, pressureModel: str = 'gas', release: bool = True ):
+    
+    # Fluence schedule
+    schedule = np.asarray( schedule , dtype = float )
+    
+    # Check pressure model
+    if( pressureModel not in PRESSURE_MODELS ):
+        raise ValueError( "Unknown pressure model '%s' ( expected %s )" % ( pressureModel , ' or '.join( "'%s'" % name for name in PRESSURE_MODELS ) ) )
+    
+    # Internal pressure from the fission gas
+    if( pressureModel == 'gas' ):
+        inner = gasPressure( model , schedule , release )
+    
+    # Internal pressure growing linearly to the end of life pressure
+    else:
+        inner = float( model.endLifeInternalPressure ) * schedule / float( model.endLifeFluence )
+    
+    # Return inner and ambient pressures
+    return np.stack( ( inner , np.full_like( inner , float( model.ambientPressure ) ) ) , axis = 1 )
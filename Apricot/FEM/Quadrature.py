@@ -0,0 +1,105 @@
+# Import dataclass library
+from dataclasses import dataclass
+
+# Import numpy library
+import numpy as np
+
+###################
+# SHAPE FUNCTIONS #
+###################
+
+# Lagrange shape functions and natural derivatives at natural points r ( Npoints x Nnodes )
+# Nnodes = 2 gives the linear element and Nnodes = 3 the quadratic element ( left , middle , right nodes )
+def shapeFunctions( r: np.ndarray, Nnodes: int = 2 ):
+    
+    # Natural points
+    r = np.atleast_1d( np.asarray( r , dtype = float ) )
+    
+    # Linear element
+    if( Nnodes == 2 ):
+        
+        # Shape functions definition
+        N = np.stack( ( ( 1.0 - r ) / 2.0 , ( 1.0 + r ) / 2.0 ) , axis = -1 )
+        
+        # Shape functions derivative in relation to r
+        DN = np.stack( ( np.full( r.shape , - 1.0 / 2.0 ) , np.full( r.shape , + 1.0 / 2.0 ) ) , axis = -1 )
+    
+    # Quadratic element
+    elif( Nnodes == 3 ):
+        
+        # Shape functions definition
+        N = np.stack( ( r * ( r - 1.0 ) / 2.0 , ( 1.0 - r ) * ( 1.0 + r ) , r * ( r + 1.0 ) / 2.0 ) , axis = -1 )
+        
+        # Shape functions derivative in relation to r
+        DN = np.stack( ( r - ( 1.0 / 2.0 ) , - 2.0 * r , r + ( 1.0 / 2.0 ) ) , axis = -1 )
+    
+    # Unknown element
+    else:
+        raise ValueError( 'Unsupported number of element nodes %s ( expected 2 or 3 )' % Nnodes )
+    
+    # Return shape functions and derivatives
+    return N, DN
+
+####################
+# QUADRATURE CLASS #
+####################
+
+# Quadrature class initialization - Gauss-Legendre rule with the shape function tables on its points
+@dataclass( frozen = True )
+class Quadrature:
+    
+    # Number of gauss points
+    n: int
+    
+    # Number of element nodes
+    Nnodes: int
+    
+    # Gauss quadrature points and weights ( n )
+    points: np.ndarray
+    weights: np.ndarray
+    
+    # Shape functions and natural derivatives on the gauss points ( n x Nnodes )
+    N: np.ndarray
+    DN: np.ndarray
+
+#######################
+# QUADRATURE REGISTRY #
+#######################
+
+# Supported number of gauss points
+ORDERS = ( 1 , 2 , 3 , 4 , 5 , 6 )
+
+# Supported number of element nodes ( linear and quadratic elements )
+ELEMENTS = ( 2 , 3 )
+
+# Quadrature registry ( ( number of gauss points , number of element nodes ) -> Quadrature )
+QUADRATURES = { }
+
+# Loop over supported orders
+for n in ORDERS:
+    
+    # Gauss-Legendre points and weights
+    points, weights = np.polynomial.legendre.leggauss( n )
+    
+    # Loop over supported elements
+    for Nnodes in ELEMENTS:
+        
+        # Shape function tables on the points
+        N, DN = shapeFunctions( points , Nnodes )
+        
+        # Tables are shared and read only
+        for table in ( points , weights , N , DN ):
+            table.setflags( write = False )
+        
+        # Registry allocation
+        QUADRATURES[ ( n , Nnodes ) ] = Quadrature( n, Nnodes, points, weights, N, DN )
+
+# Quadrature rule with n gauss points for an element with Nnodes nodes
+def quadrature( n: int, Nnodes: int = 2 ):
+    
+    # Check supported order
+    if( ( n , Nnodes ) not in QUADRATURES ):
+        raise ValueError( 'Unsupported quadrature with %s gauss points on %s node elements ( expected %s points on %s node elements )' % ( n , Nnodes , ' / '.join( map( str , ORDERS ) ) , ' / '.join( map( str , ELEMENTS ) ) ) )
+    
+    # Return quadrature rule
+    return QUADRATURES[ ( n , Nnodes ) ]
@@ -0,0 +1,216 @@
+# Import dataclass library
+from dataclasses import dataclass
+
+# Import list library
+import typing
+
+# Import json library
+import json
+
+# Import zip library
+import zipfile
+
+# Import numpy library
+import numpy as np
+
+##################
+# RESULTS FORMAT #
+##################
+
+# Results are a zip archive of .npy members ( readable with np.load as a regular NPZ file )
+#   metadata.npy           JSON string with the run metadata
+#   <field>.npy            static fields written once ( mesh coordinates , connectivity , regions )
+#   <field>/<chunk>.npy    step fields stacked over chunkSize steps along a leading step axis
+
+# Metadata member name
+METADATA = 'metadata'
+
+# Step chunk member name
+def chunkName( field: str, chunk: int ):
+    
+    # Return member name
+    return '%s/%06d.npy' % ( field , chunk )
+
+##################
+# RESULTS WRITER #
+##################
+
+# Results writer class initialization - Streams step fields to a zip archive of .npy chunks ( truncates an existing archive unless append )
+@dataclass
+class ResultsWriter:
+    
+    # Results file path
+    path: str
+    
+    # Number of steps per chunk
+    chunkSize: int
+    
+    # Zip archive
+    archive: 'typing.Any'
+    
+    # Buffered steps per field
+    buffer: 'typing.Any'
+    
+    # Next chunk number per field
+    chunks: 'typing.Any'
+    
+    ##################
+    # INITIALIZATION #
+    ##################
+    
+    # Initialization - Metadata is written once on a new archive ( append = True adds steps to an existing archive )
+    def __init__ ( self, path: str, metadata: dict = None, chunkSize: int = 64, compress: bool = False, append: bool = False ):
+        
+        # Check chunk size
+        if( chunkSize < 1 ):
+            raise ValueError( 'Results chunk size must be at least 1 ( got %s )' % chunkSize )
+        
+        # Results allocation
+        self.path = path
+        self.chunkSize = int( chunkSize )
+        self.buffer = { }
+        
+        # Zip archive ( appending keeps the existing steps , a rerun starts a new archive otherwise )
+        self.archive = zipfile.ZipFile( path , mode = 'a' if append else 'w' , compression = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED , allowZip64 = True )
+        
+        # Existing members
+        names = self.archive.namelist()
+        
+        # Next chunk number per field ( continues after the existing chunks )
+        self.chunks = { }
+        for name in names:
+            if( '/' in name ):
+                field, chunk = name[ :-4 ].rsplit( '/' , 1 )
+                self.chunks[ field ] = max( self.chunks.get( field , 0 ) , int( chunk ) + 1 )
+        
+        # Metadata on a new archive
+        if( METADATA + '.npy' not in names ):
+            self.writeArray( METADATA + '.npy' , np.array( json.dumps( metadata or { } ) ) )
+    
+    ###############
+    # WRITE ARRAY #
+    ###############
+    
+    # Write one array member
+    def writeArray( self, name: str, value: np.ndarray ):
+        
+        # Stream the array into the member
+        with self.archive.open( name , mode = 'w' , force_zip64 = True ) as member:
+            np.lib.format.write_array( member , np.asarray( value ) , allow_pickle = False )
+    
+    ################
+    # WRITE STATIC #
+    ################
+    
+    # Write fields stored once ( skipped if already in the archive )
+    def writeStatic( self, **fields ):
+        
+        # Existing members
+        names = set( self.archive.namelist() )
+        
+        # Loop over fields
+        for field, value in fields.items():
+            if( field + '.npy' not in names ):
+                self.writeArray( field + '.npy' , value )
+    
+    ##########
+    # APPEND #
+    ##########
+    
+    # Append one step ( scalars and arrays , same shapes on every step )
+    def append( self, **fields ):
+        
+        # Loop over fields
+        for field, value in fields.items():
+            
+            # Buffer the step
+            self.buffer.setdefault( field , [ ] ).append( np.asarray( value ) )
+            
+            # Flush full chunks
+            if( len( self.buffer[ field ] ) >= self.chunkSize ):
+                self.flushField( field )
+    
+    #########
+    # FLUSH #
+    #########
+    
+    # Write the buffered steps of a field as one chunk
+    def flushField( self, field: str ):
+        
+        # Buffered steps
+        steps = self.buffer.pop( field , [ ] )
+        if( not steps ):
+            return
+        
+        # Chunk allocation
+        chunk = self.chunks.get( field , 0 )
+        self.writeArray( chunkName( field , chunk ) , np.stack( steps ) )
+        self.chunks[ field ] = chunk + 1
+    
+    # Write every buffered step
+    def flush( self ):
+        
+        # Loop over buffered fields
+        for field in list( self.buffer ):
+            self.flushField( field )
+    
+    #########
+    # CLOSE #
+    #########
+    
+    # Flush and close the archive
+    def close( self ):
+        
+        # Closed archive
+        if( self.archive is None ):
+            return
+        
+        # Flush and close
+        self.flush()
+        self.archive.close()
+        self.archive = None
+    
+    # Context manager
+    def __enter__ ( self ):
+        return self
+    
+    def __exit__ ( self, *args ):
+        self.close()
+
+################
+# READ RESULTS #
+################
+
+# Read a results archive - Returns the metadata and a dictionary with the static fields and the step fields concatenated over chunks
+def readResults( path: str ):
+    
+    # Fields
+    fields = { }
+    
+    # Chunks per step field
+    chunks = { }
+    
+    # Open archive
+    with np.load( path , allow_pickle = False ) as data:
+        
+        # Loop over members ( NpzFile keys drop the .npy suffix )
+        for name in data.files:
+            
+            # Step chunk
+            if( '/' in name ):
+                field, chunk = name.rsplit( '/' , 1 )
+                chunks.setdefault( field , [ ] ).append( ( int( chunk ) , data[ name ] ) )
+            
+            # Static field
+            else:
+                fields[ name ] = data[ name ]
+    
+    # Metadata
+    metadata = json.loads( str( fields.pop( METADATA , '{}' ) ) )
+    
+    # Step fields in chunk order
+    for field, values in chunks.items():
+        fields[ field ] = np.concatenate( [ value for _, value in sorted( values , key = lambda item: item[ 0 ] ) ] )
+    
+    # Return metadata and fields
+    return metadata, fields
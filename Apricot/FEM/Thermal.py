@@ -0,0 +1,288 @@
+# Import dataclass library
+from dataclasses import dataclass
+
+# Import list library
+import typing
+
+# Import numpy library
+import numpy as np
+
+# Import functions
+from Material import creepCoefficient
+from Mesh import REGIONS
+from Quadrature import quadrature
+from Banded import zerosBanded, bandedProduct, factorBanded, solveFactoredBanded
+from Profiler import timed
+
+######################
+# THERMAL PROPERTIES #
+######################
+
+# Thermal conductivity per region [ W / ( m K ) ] ( porous buffer , dense pyrolytic carbon , silicon carbide )
+CONDUCTIVITY = { 'Buffer': 0.5 , 'IPyC': 4.0 , 'SiC': 16.0 , 'OPyC': 4.0 }
+
+# Specific heat capacity per region [ J / ( kg K ) ]
+HEAT_CAPACITY = { 'Buffer': 720.0 , 'IPyC': 720.0 , 'SiC': 1200.0 , 'OPyC': 720.0 }
+
+# Model input density per region [ g / cm³ ]
+DENSITY = { 'Buffer': 'bufferDensity' , 'IPyC': 'IPyCDensity' , 'SiC': 'SiCDensity' , 'OPyC': 'OPyCDensity' }
+
+#################
+# THERMAL CLASS #
+#################
+
+# Thermal class initialization - Radial heat conduction on the FEM node set ( spherical coordinates , physical radius )
+# Kernel power enters as a heat flux on the inner surface and the outer surface is held at the irridiation temperature
+# Temperatures are given relative to the irridiation temperature for the thermal strains ( isothermal coating = stress free )
+@dataclass
+class Thermal:
+    
+    ##############
+    # FEM STRUCT #
+    ##############
+    
+    # Finite element struct ( node set , connectivity and regions )
+    fem: 'typing.Any'
+    
+    #######################
+    # BOUNDARY CONDITIONS #
+    #######################
+    
+    # Kernel power per particle [ W ]
+    power: float
+    
+    # Outer surface and reference temperature [ ºC ]
+    Ti: float
+    
+    ######################
+    # ELEMENT PROPERTIES #
+    ######################
+    
+    # Element conductivity [ W / ( um K ) ] and volumetric heat capacity [ J / ( um³ K ) ] ( Nelements )
+    k: np.ndarray
+    rhoc: np.ndarray
+    
+    #################
+    # GLOBAL SYSTEM #
+    #################
+    
+    # Conductivity and capacity matrices in banded storage ( lower = upper = order )
+    K: np.ndarray
+    M: np.ndarray
+    
+    # Heat flux vector ( Nnodes )
+    Q: np.ndarray
+    
+    #########
+    # STATE #
+    #########
+    
+    # Nodal temperature [ ºC ] ( Nnodes )
+    T: np.ndarray
+    
+    ##################
+    # INITIALIZATION #
+    ##################
+    
+    # Initialization - Conductivity and heat capacity per region default to CONDUCTIVITY and HEAT_CAPACITY
+    def __init__ ( self, fem: 'typing.Any', model: 'typing.Any', power: float = 0.0, conductivity: dict = None, heatCapacity: dict = None ):
+        
+        # Finite element struct allocation
+        self.fem = fem
+        
+        # Boundary conditions allocation
+        self.power = float( power )
+        self.Ti = float( model.irridiationTemperature )
+        
+        # Region properties
+        conductivity = { **CONDUCTIVITY , **( conductivity or { } ) }
+        heatCapacity = { **HEAT_CAPACITY , **( heatCapacity or { } ) }
+        
+        # Element conductivity [ W / ( m K ) -> W / ( um K ) ]
+        self.k = np.array( [ conductivity[ region ] for region in REGIONS ] )[ fem.mesh.region ] * 1.0e-6
+        
+        # Element volumetric heat capacity [ g / cm³ -> kg / um³ times J / ( kg K ) ]
+        self.rhoc = np.array( [ float( getattr( model , DENSITY[ region ] ) ) * 1.0e-15 * heatCapacity[ region ] for region in REGIONS ] )[ fem.mesh.region ]
+        
+        # Conductivity and capacity matrices
+        self.assembly()
+        
+        # Isothermal initial state
+        self.T = np.full( fem.mesh.Nnodes , self.Ti )
+    
+    ############
+    # ASSEMBLY #
+    ############
+    
+    # Conductivity and capacity matrices - 4 pi r² weighted linear or quadratic elements on the physical radius
+    def assembly( self ):
+        
+        # Mesh struct
+        mesh = self.fem.mesh
+        order = mesh.order
+        
+        # Element coordinates
+        xe = mesh.x[ mesh.connectivity ]
+        
+        # Element matrices initialization
+        Ke = np.zeros( ( mesh.Nelements , order + 1 , order + 1 ) )
+        Me = np.zeros( ( mesh.Nelements , order + 1 , order + 1 ) )
+        
+        # Loop over gauss points ( exact for the r² weight up to quadratic elements )
+        rule = quadrature( 4 , order + 1 )
+        for w, N, DN in zip( rule.weights , rule.N , rule.DN ):
+            
+            # Physical radius and jacobian
+            r = xe @ N
+            J = xe @ DN
+            
+            # Conductivity and capacity terms
+            Ke += ( 4.0 * np.pi * w * self.k * r * r / J )[ :, None, None ] * np.outer( DN , DN )
+            Me += ( 4.0 * np.pi * w * self.rhoc * r * r * J )[ :, None, None ] * np.outer( N , N )
+        
+        # Global matrices in banded storage
+        self.K = zerosBanded( mesh.Nnodes , order , order )
+        self.M = zerosBanded( mesh.Nnodes , order , order )
+        for a in range( order + 1 ):
+            for b in range( order + 1 ):
+                self.K[ order + a - b , mesh.connectivity[ :, b ] ] += Ke[ :, a , b ]
+                self.M[ order + a - b , mesh.connectivity[ :, b ] ] += Me[ :, a , b ]
+        
+        # Kernel power on the inner surface ( total heat flow through the inner node )
+        self.Q = np.zeros( mesh.Nnodes )
+        self.Q[ 0 ] = self.power
+    
+    ###################
+    # DIRICHLET SOLVE #
+    ###################
+    
+    # Factorize a banded matrix with the outer node held fixed
+    def factorize( self, A: np.ndarray ):
+        
+        # Element order
+        order = self.fem.mesh.order
+        
+        # Outer node row replaced by the identity ( banded row of node n is A[ order + n - j , j ] )
+        A = A.copy()
+        n = A.shape[ 1 ] - 1
+        for j in range( max( n - order , 0 ) , n + 1 ):
+            A[ order + n - j , j ] = 1.0 if j == n else 0.0
+        
+        # Return factorization
+        return factorBanded( A , order , order )
+    
+    # Solve with the outer node held at the irridiation temperature
+    def solveFactored( self, factorization: tuple, F: np.ndarray ):
+        
+        # Outer node value
+        F = F.copy()
+        F[ -1 ] = self.Ti
+        
+        # Return solution
+        return solveFactoredBanded( factorization , F , self.fem.mesh.order , self.fem.mesh.order )
+    
+    ################
+    # STEADY STATE #
+    ################
+    
+    # Steady state conduction - K.T = Q with T = Ti on the outer surface
+    @timed( 'Thermal.steady' )
+    def steady( self ):
+        
+        # Nodal temperature
+        self.T = self.solveFactored( self.factorize( self.K ) , self.Q )
+        
+        # Return nodal temperature
+        return self.T
+    
+    #############
+    # TRANSIENT #
+    #############
+    
+    # Transient conduction over Nsteps time steps dt [ s ] with the beta method - Yields the nodal temperature of every step
+    # ( M / dt + beta K ) T^n+1 = ( M / dt - ( 1 - beta ) K ) T^n + Q , factorized once for the constant step
+    @timed( 'Thermal.transient' )
+    def transient( self, dt: float, Nsteps: int, beta: float = 1.0 ):
+        
+        # Element order
+        order = self.fem.mesh.order
+        
+        # Left hand side factorization
+        factorization = self.factorize( ( self.M / dt ) + ( beta * self.K ) )
+        
+        # Right hand side matrix
+        R = ( self.M / dt ) - ( ( 1.0 - beta ) * self.K )
+        
+        # Loop over steps
+        for _ in range( int( Nsteps ) ):
+            
+            # Right hand side
+            F = self.Q + bandedProduct( R , self.T , order , order )
+            
+            # Step solution
+            self.T = self.solveFactored( factorization , F )
+            
+            # Stream step temperature
+            yield self.T
+    
+    ##################
+    # ELEMENT FIELDS #
+    ##################
+    
+    # Element temperature [ ºC ] ( mean of the element nodes )
+    def elementTemperature( self ):
+        
+        # Return element temperature
+        return self.T[ self.fem.mesh.connectivity ].mean( axis = 1 )
+    
+    # Nodal thermal strain relative to the irridiation temperature ( element expansion coefficients projected to the nodes )
+    def thermalStrain( self ):
+        
+        # Mesh struct
+        mesh = self.fem.mesh
+        
+        # Element thermal expansion coefficient
+        a = np.array( [ material.a for material in mesh.materials ] )[ mesh.material ]
+        
+        # Return nodal thermal strain
+        return mesh.elementToNodes( a ) * ( self.T - self.Ti )
+    
+    # Element irridiation creep coefficient at the element temperature ( material value if not temperature dependent )
+    def creepCoefficients( self ):
+        
+        # Mesh struct
+        mesh = self.fem.mesh
+        
+        # Material values and temperature dependence
+        K = np.array( [ material.K for material in mesh.materials ] )[ mesh.material ]
+        dependent = np.array( [ bool( material.K_temp ) for material in mesh.materials ] )[ mesh.material ]
+        
+        # Return element creep coefficients
+        return np.where( dependent , creepCoefficient( self.elementTemperature() ) , K )
+    
+    ############
+    # COUPLING #
+    ############
+    
+    # Feed the temperature field to the mechanical model - Nodal thermal strains , element creep coefficients and dirty elements
+    # Returns the elements marked dirty ( reassembled incrementally by FEM.assembly )
+    def couple( self ):
+        
+        # Mesh struct
+        mesh = self.fem.mesh
+        
+        # Nodal thermal strain
+        eth = self.thermalStrain()
+        
+        # Elements touching changed nodes
+        dirty = ( eth != mesh.eth )[ mesh.connectivity ].any( axis = 1 )
+        
+        # Thermal strain and creep coefficient allocation
+        mesh.eth = eth
+        mesh.elementK = self.creepCoefficients()
+        
+        # Mark elements dirty
+        self.fem.markDirty( elements = dirty )
+        
+        # Return dirty elements
+        return np.flatnonzero( dirty )
@@ -0,0 +1,612 @@
+# Import dataclass library
+from dataclasses import dataclass, asdict
+
+# Import copy library
+import copy
+
+# Import list library
+import typing
+
+# Import numpy library
+import numpy as np
+
+# Import functions
+from Element import gMatrix
+from Kernel import strainKernel
+from Results import ResultsWriter
+from Newton import Newton
+from Profiler import count
+
+####################
+# FLUENCE SCHEDULE #
+####################
+
+# Fluence schedule from 0 to the end of life fluence
+# spacing = 'linear' gives Nsteps equal increments
+# spacing = 'geometric' gives Nsteps increments growing geometrically from firstStep
+def fluenceSchedule( endFluence: float, Nsteps: int, spacing: str = 'linear', firstStep: float = None ):
+    
+    # Linear spacing
+    if( spacing == 'linear' ):
+        return np.linspace( 0.0 , endFluence , int( Nsteps ) + 1 )
+    
+    # Geometric spacing
+    if( spacing == 'geometric' ):
+        
+        # Default first fluence step
+        if( firstStep is None ):
+            firstStep = endFluence * 1.0e-3
+        
+        # Geometric schedule starting at zero
+        return np.concatenate( ( [ 0.0 ] , np.geomspace( firstStep , endFluence , int( Nsteps ) ) ) )
+    
+    # Unknown spacing
+    raise ValueError( "Unknown fluence spacing '%s' ( expected 'linear' or 'geometric' )" % spacing )
+
+##############
+# CREEP LAWS #
+##############
+
+# Maximum number of local stress iterations of a stress dependent creep law
+LOCAL_ITERATIONS = 50
+
+# Maximum number of creep iterations and relative tolerance of the linear step
+CREEP_ITERATIONS = 200
+CREEP_TOLERANCE = 1.0e-12
+
+# Equivalent ( von Mises ) stress of the spherical stress state with equal tangential components ( ... x 2 )
+def equivalentStress( sigma: np.ndarray ):
+    
+    # Return equivalent stress
+    return np.abs( sigma[ ..., 1 ] - sigma[ ..., 0 ] )
+
+# Power law creep multiplier on the irridiation creep coefficient - ( sigma_eq / reference )^( exponent - 1 )
+# Exponent 1 is the linear creep of Equation (3)
+def powerLawCreep( sigmaEq: np.ndarray, reference: float = 100.0, exponent: float = 1.0 ):
+    
+    # Return creep multiplier
+    return ( np.asarray( sigmaEq ) / reference ) ** ( exponent - 1.0 )
+
+###############
+# STEP RESULT #
+###############
+
+# Step result class initialization
+@dataclass
+class StepResult:
+    
+    # Step number ( 0 is the stress free initial state )
+    step: int
+    
+    # Fast fluence at the end of the step
+    phi: float
+    
+    # Fast fluence increment
+    dphi: float
+    
+    # Total nodal displacements ( Nnodes )
+    u: np.ndarray
+    
+    # Element radial and tangential stresses ( Nelements x 2 )
+    sigma: np.ndarray
+    
+    # Accumulated element irridiation induced ( swelling ) strains ( Nelements x 2 )
+    epsilonSwelling: np.ndarray
+    
+    # Accumulated element irridiation creep strains ( Nelements x 2 )
+    epsilonCreep: np.ndarray
+    
+    # Inner and outer surface pressures [ MPa ] ( 2 )
+    pressure: np.ndarray
+
+#######################
+# TIME STEPPING CLASS #
+#######################
+
+# Time stepping class initialization - Advances a FEM model over a fluence schedule with the beta method
+@dataclass
+class TimeStepping:
+    
+    ##############
+    # FEM STRUCT #
+    ##############
+    
+    # Finite element struct
+    fem: 'typing.Any'
+    
+    # Caller material structs ( the mesh runs on per run copies , see reset )
+    materials: list
+    
+    ####################
+    # FLUENCE SCHEDULE #
+    ####################
+    
+    # Fast fluence at the end of every step ( first value is the initial state )
+    schedule: np.ndarray
+    
+    # Inner and outer surface pressures [ MPa ] at every fluence of the schedule ( Nsteps + 1 x 2 , see pressureHistory )
+    pressure: np.ndarray
+    
+    #####################
+    # METHOD MULTIPLIER #
+    #####################
+    
+    # Method multiplier ( 0 = explicit / 0.5 = Crank Nicholson / 1.0 = implicit )
+    beta: float
+    
+    ###################
+    # NONLINEAR CREEP #
+    ###################
+    
+    # Creep multiplier of the equivalent stress ( None = linear creep , see powerLawCreep )
+    creepLaw: 'typing.Any'
+    
+    # Newton Raphson solver ( None = linear step with a fixed point on the creep increment , see linearStep )
+    newton: 'typing.Any'
+    
+    #########
+    # STATE #
+    #########
+    
+    # Total nodal displacements ( Nnodes )
+    u: np.ndarray
+    
+    # Element stresses ( Nelements x 2 )
+    sigma: np.ndarray
+    
+    # Accumulated swelling and creep strains ( Nelements x 2 )
+    epsilonSwelling: np.ndarray
+    epsilonCreep: np.ndarray
+    
+    # Irridiation induced change rates at the last fluence ( Nelements x 2 )
+    rates: np.ndarray
+    
+    # Element thermal strain already applied ( Nelements )
+    epsilonThermal: np.ndarray
+    
+    # Surface pressures already applied ( 2 )
+    pressureApplied: np.ndarray
+    
+    # Displacement and fluence increments of the last step ( Newton warm start )
+    duPrevious: np.ndarray
+    dphiPrevious: float
+    
+    # Elastic constants used by the current global stiffness
+    stiffnessKey: 'typing.Any'
+    
+    # Element force matrices of the current global stiffness ( see FEM.forceMatrices )
+    forceMatrices: tuple
+    
+    ##################
+    # INITIALIZATION #
+    ##################
+    
+    # Initialization - Surface pressures default to unloaded surfaces
+    # A creep law solves every step with Newton Raphson ( default Newton settings unless a solver is given )
+    def __init__ ( self, fem: 'typing.Any', schedule: np.ndarray, pressure: np.ndarray = None, creepLaw: 'typing.Any' = None, newton: Newton = None ):
+        
+        # Finite element struct allocation
+        self.fem = fem
+        
+        # Caller material structs allocation ( left untouched by the fluence updates )
+        self.materials = list( fem.mesh.materials )
+        
+        # Fluence schedule allocation
+        self.schedule = np.asarray( schedule , dtype = float )
+        
+        # Check fluence schedule
+        if( self.schedule.ndim != 1 or self.schedule.size < 2 or np.any( np.diff( self.schedule ) <= 0.0 ) ):
+            
+            # Invalid fluence schedule
+            raise ValueError( 'Fluence schedule must be a strictly increasing 1D array with at least two values' )
+        
+        # Surface pressures allocation
+        self.pressure = np.zeros( ( self.schedule.size , 2 ) ) if pressure is None else np.asarray( pressure , dtype = float )
+        
+        # Check surface pressures
+        if( self.pressure.shape != ( self.schedule.size , 2 ) ):
+            
+            # Invalid surface pressures
+            raise ValueError( 'Surface pressures must have shape ( %d , 2 ) matching the fluence schedule ( got %s )' % ( self.schedule.size , self.pressure.shape ) )
+        
+        # Method multiplier allocation
+        self.beta = fem.beta
+        
+        # Nonlinear creep allocation
+        self.creepLaw = creepLaw
+        self.newton = Newton() if ( newton is None and creepLaw is not None ) else newton
+        
+        # Stress free initial state
+        self.reset()
+    
+    #########
+    # RESET #
+    #########
+    
+    # Reset the state to the stress free initial state
+    def reset( self ):
+        
+        # Mesh struct
+        mesh = self.fem.mesh
+        
+        # Per run material copies at the caller states
+        mesh.materials = [ copy.copy( material ) for material in self.materials ]
+        
+        # Displacements initialization
+        self.u = np.zeros( mesh.Nnodes )
+        
+        # Stresses initialization
+        self.sigma = np.zeros( ( mesh.Nelements , 2 ) )
+        
+        # Strains initialization
+        self.epsilonSwelling = np.zeros( ( mesh.Nelements , 2 ) )
+        self.epsilonCreep = np.zeros( ( mesh.Nelements , 2 ) )
+        
+        # Rates initialization
+        self.rates = None
+        
+        # Thermal strain initialization ( the thermal field is applied on the first step )
+        self.epsilonThermal = np.zeros( mesh.Nelements )
+        
+        # Pressure initialization ( the initial pressures are applied on the first step )
+        self.pressureApplied = np.zeros( 2 )
+        
+        # No warm start
+        self.duPrevious = None
+        self.dphiPrevious = None
+        
+        # Stiffness not assembled yet
+        self.stiffnessKey = None
+        self.forceMatrices = None
+    
+    #######################
+    # IRRIDIATION # RATES #
+    #######################
+    
+    # Set every material at fluence phi and return the element irridiation induced change rates
+    def setFluence( self, phi: float ):
+        
+        # Mesh struct
+        mesh = self.fem.mesh
+        
+        # Loop over materials
+        for material in mesh.materials:
+            
+            # Fast fluence allocation
+            material.phi = phi
+            
+            # Update irridiation correlation
+            if( material.irrCase != '' ):
+                material.setIrridiationCase( material.irrCase )
+        
+        # Material rates gathered per element
+        er = np.array( [ material.er for material in mesh.materials ] )[ mesh.material ]
+        et = np.array( [ material.et for material in mesh.materials ] )[ mesh.material ]
+        
+        # Return element rates
+        return np.stack( ( er , et ) , axis = 1 )
+    
+    ######################
+    # STIFFNESS # UPDATE #
+    ######################
+    
+    # Assemble the global stiffness only if the elastic constants changed
+    def updateStiffness( self ):
+        
+        # Mesh struct
+        mesh = self.fem.mesh
+        
+        # Elastic constants of every material
+        key = tuple( ( material.E , material.v ) for material in mesh.materials )
+        
+        # Check if the stiffness is up to date
+        if( key == self.stiffnessKey ):
+            return False
+        
+        # Update D parameters and mark the elements of the changed materials
+        self.fem.updateMaterials()
+        
+        # Assemble global stiffness ( dirty elements only )
+        self.fem.assemblyStiffness()
+        
+        # Element force matrices of the new elastic constants
+        self.forceMatrices = self.fem.forceMatrices()
+        
+        # Stiffness key allocation
+        self.stiffnessKey = key
+        
+        # Stiffness updated
+        return True
+    
+    #######
+    # RUN #
+    #######
+    
+    # Advance over the fluence schedule, yielding one StepResult per step
+    def run( self ):
+        
+        # Mesh struct
+        mesh = self.fem.mesh
+        
+        # Method multiplier
+        beta = self.beta
+        
+        #################
+        # INITIAL STATE #
+        #################
+        
+        # Rates at the initial fluence
+        self.rates = self.setFluence( self.schedule[ 0 ] )
+        
+        # Initial state
+        yield self.result( 0 , self.schedule[ 0 ] , 0.0 )
+        
+        ##############
+        # LOOP STEPS #
+        ##############
+        
+        # Loop over fluence steps
+        for n in range( 1 , self.schedule.size ):
+            
+            # Step counter ( profiler hook )
+            count( 'TimeStepping.steps' )
+            
+            # Fast fluence increment
+            dphi = self.schedule[ n ] - self.schedule[ n - 1 ]
+            
+            # Rates at the end of the step
+            rates = self.setFluence( self.schedule[ n ] )
+            
+            # Swelling strain increment ( beta rule on the change rates )
+            dSwelling = dphi * ( ( ( 1.0 - beta ) * self.rates ) + ( beta * rates ) )
+            
+            #####################
+            # MATERIAL MATRICES #
+            #####################
+            
+            # Constitutive, irridiation and G matrices per element - Equations (2), (4) and (9) ( element creep coefficients of the thermal field included )
+            Ce, Ae, Ge = mesh.elementMaterialMatrices( beta , dphi )
+            
+            # B matrix per element - Equation (10)
+            Be = Ge @ ( Ce - ( ( 1.0 - beta ) * dphi * Ae ) )
+            
+            # Thermal strain increment on the elements ( isotropic )
+            thermal = mesh.eth[ mesh.connectivity ].mean( axis = 1 )
+            dThermal = ( thermal - self.epsilonThermal )[ :, None ]
+            
+            ########################
+            # RIGHT HAND SIDE ONLY #
+            ########################
+            
+            # Global stiffness is only rebuilt if the elastic constants changed
+            self.updateStiffness()
+            
+            # Surface pressure increment ( precomputed pressure history )
+            dPressure = self.pressure[ n ] - self.pressureApplied
+            
+            # Linear step
+            if( self.newton is None ):
+                
+                # Displacement increment with the creep strain increment of the stored state
+                du, sigma, dCreep = self.linearStep( n , dSwelling + dThermal , Ge , Be , Ae , dphi , dPressure )
+            
+            # Nonlinear step
+            else:
+                
+                # Displacement increment with the creep of the end of step stress
+                du = self.newtonStep( n , dSwelling + dThermal , Ce , Ae , dphi , dPressure )
+                
+                # Element strain increment on the element centre
+                dEpsilon = strainKernel( mesh.x[ mesh.connectivity ] , du[ mesh.connectivity ] )
+                
+                # Stress and creep strain updates
+                sigma, dCreep = self.stressUpdate( dEpsilon , dSwelling + dThermal , Ce , Ae , dphi )
+            
+            # Accumulate state
+            self.u += du
+            self.sigma = sigma
+            self.epsilonSwelling += dSwelling
+            self.epsilonCreep += dCreep
+            self.rates = rates
+            self.epsilonThermal = thermal
+            self.pressureApplied = self.pressure[ n ]
+            self.duPrevious = du.copy()
+            self.dphiPrevious = dphi
+            
+            # Total displacements on the finite element struct
+            self.fem.u = self.u.reshape( ( -1 , 1 ) ).copy()
+            mesh.ue = self.u[ mesh.connectivity ]
+            
+            # Stream step result
+            yield self.result( n , self.schedule[ n ] , dphi )
+    
+    #################
+    # STRESS UPDATE #
+    #################
+    
+    # Element stress and creep strain increments for the strain and imposed ( swelling and thermal ) strain increments
+    # The creep law scales A with the equivalent stress of the beta weighted stress , iterated locally to the end of step stress
+    # Local iterations start from the guess stress ( previous stress by default )
+    def stressUpdate( self, dEpsilon: np.ndarray, dStrain: np.ndarray, Ce: np.ndarray, Ae: np.ndarray, dphi: float, guess: np.ndarray = None ):
+        
+        # Method multiplier
+        beta = self.beta
+        
+        # Stress iterate and creep matrices
+        sigma = self.sigma if guess is None else guess
+        A = Ae
+        
+        # Loop over local iterations ( a single pass for linear creep )
+        for _ in range( LOCAL_ITERATIONS ):
+            
+            # Creep matrices scaled with the creep law
+            if( self.creepLaw is not None ):
+                A = self.creepLaw( equivalentStress( ( ( 1.0 - beta ) * self.sigma ) + ( beta * sigma ) ) )[ :, None, None ] * Ae
+            
+            # G and B matrices per element - Equations (9) and (10)
+            G = gMatrix( Ce , A , beta , dphi )
+            B = G @ ( Ce - ( ( 1.0 - beta ) * dphi * A ) )
+            
+            # Stress update - Equation (8)
+            update = np.einsum( 'eij,ej->ei' , G , dEpsilon - dStrain ) + np.einsum( 'eij,ej->ei' , B , self.sigma )
+            
+            # Local convergence
+            change = np.abs( update - sigma ).max()
+            sigma = update
+            if( self.creepLaw is None or change <= 1.0e-13 * ( np.abs( sigma ).max() + 1.0 ) ):
+                break
+        
+        # Creep strain increment - Equation (3) with the beta rule
+        dCreep = dphi * np.einsum( 'eij,ej->ei' , A , ( ( 1.0 - beta ) * self.sigma ) + ( beta * sigma ) )
+        
+        # Return stress and creep strain increment
+        return sigma, dCreep
+    
+    ###############
+    # LINEAR STEP #
+    ###############
+    
+    # Displacement increment , stress and creep strain increment of step n for linear creep
+    # Equilibrium is solved with the creep strain increment of the beta rule stress update ( fixed point on the creep increment )
+    # Every pass is a back substitution on the factorized stiffness , starting from the creep of the previous stress
+    def linearStep( self, n: int, dStrain: np.ndarray, Ge: np.ndarray, Be: np.ndarray, Ae: np.ndarray, dphi: float, dPressure: np.ndarray ):
+        
+        # Finite element and mesh structs
+        fem = self.fem
+        mesh = fem.mesh
+        
+        # Method multiplier
+        beta = self.beta
+        
+        # Element coordinates
+        xe = mesh.x[ mesh.connectivity ]
+        
+        # Element force matrices ( forces are linear in the eigenstrains )
+        matrices = self.forceMatrices
+        
+        # Creep strain increment predicted from the previous stress
+        dCreep = dphi * np.einsum( 'eij,ej->ei' , Ae , self.sigma )
+        
+        # Iterations
+        converged = False
+        
+        # Loop over creep iterations
+        for _ in range( CREEP_ITERATIONS ):
+            
+            # Iteration counter ( profiler hook )
+            count( 'TimeStepping.creepIterations' )
+            
+            # Eigenstrain increment on the nodes
+            eigenstrain = dStrain + dCreep
+            er = mesh.elementToNodes( eigenstrain[ :, 0 ] )
+            et = mesh.elementToNodes( eigenstrain[ :, 1 ] )
+            
+            # Displacement increment
+            du = fem.solveMultiple( fem.forceVector( er , et , dPressure , matrices ) )
+            
+            # Element strain increment on the element centre
+            dEpsilon = strainKernel( xe , du[ mesh.connectivity ] )
+            
+            # Stress update - Equation (8)
+            sigma = np.einsum( 'eij,ej->ei' , Ge , dEpsilon - dStrain ) + np.einsum( 'eij,ej->ei' , Be , self.sigma )
+            
+            # Creep strain increment - Equation (3) with the beta rule
+            update = dphi * np.einsum( 'eij,ej->ei' , Ae , ( ( 1.0 - beta ) * self.sigma ) + ( beta * sigma ) )
+            
+            # Creep convergence ( solve and stored state share the creep increment )
+            change = np.abs( update - dCreep ).max()
+            dCreep = update
+            if( change <= CREEP_TOLERANCE * ( np.abs( dCreep ).max() + np.abs( dStrain ).max() ) ):
+                converged = True
+                break
+        
+        # Check convergence
+        if( not converged ):
+            raise RuntimeError( 'Creep iterations did not converge on step %d ( creep change %.3e after %d iterations )' % ( n , change , CREEP_ITERATIONS ) )
+        
+        # Return displacement increment , stress and creep strain increment
+        return du, sigma, dCreep
+    
+    ###############
+    # NEWTON STEP #
+    ###############
+    
+    # Displacement increment of step n with Newton Raphson - Equilibrium with the creep of the end of step stress
+    # R( du ) = K.du - F( swelling + thermal + creep( du ) , pressure ) on the assembled stiffness , warm started from the last step
+    def newtonStep( self, n: int, dStrain: np.ndarray, Ce: np.ndarray, Ae: np.ndarray, dphi: float, dPressure: np.ndarray ):
+        
+        # Finite element and mesh structs
+        fem = self.fem
+        mesh = fem.mesh
+        
+        # Element coordinates
+        xe = mesh.x[ mesh.connectivity ]
+        
+        # Element force matrices ( forces are linear in the eigenstrains , no element kernel in the residual )
+        matrices = self.forceMatrices
+        
+        # Local stress guess ( last evaluated stress )
+        guess = self.sigma
+        
+        # Residual of a displacement increment
+        def residual( du: np.ndarray ):
+            
+            # Stress and creep strain increment of the element strain increment
+            nonlocal guess
+            guess, dCreep = self.stressUpdate( strainKernel( xe , du[ mesh.connectivity ] ) , dStrain , Ce , Ae , dphi , guess )
+            
+            # Eigenstrain increment on the nodes
+            eigenstrain = dStrain + dCreep
+            er = mesh.elementToNodes( eigenstrain[ :, 0 ] )
+            et = mesh.elementToNodes( eigenstrain[ :, 1 ] )
+            
+            # Return out of balance forces
+            return fem.stiffnessProduct( du ) - fem.forceVector( er , et , dPressure , matrices )
+        
+        # Warm start from the last increment scaled with the fluence increment
+        du0 = np.zeros( mesh.Nnodes ) if self.duPrevious is None else self.duPrevious * ( dphi / self.dphiPrevious )
+        
+        # Newton Raphson ( nodal coupling through the element strains , nodal projection and element forces )
+        du, converged = self.newton.solve( residual , du0 , 2 * mesh.order )
+        
+        # Check convergence
+        if( not converged ):
+            raise RuntimeError( 'Newton Raphson did not converge on step %d ( residual %.3e after %d iterations )' % ( n , self.newton.residuals[ -1 ] , self.newton.iterations[ -1 ] ) )
+        
+        # Return displacement increment
+        return du
+    
+    ###############
+    # STEP RESULT #
+    ###############
+    
+    # Snapshot of the current state
+    def result( self, step: int, phi: float, dphi: float ):
+        
+        # Return step result
+        return StepResult( step, float( phi ), float( dphi ), self.u.copy(), self.sigma.copy(), self.epsilonSwelling.copy(), self.epsilonCreep.copy(), self.pressureApplied.copy() )
+    
+    #################
+    # WRITE RESULTS #
+    #################
+    
+    # Run the schedule streaming every step to a ResultsWriter ( mesh written once ) - Returns the last step result
+    def write( self, writer: ResultsWriter ):
+        
+        # Mesh struct
+        mesh = self.fem.mesh
+        
+        # Mesh fields ( written once per archive )
+        writer.writeStatic( x = mesh.x , connectivity = mesh.connectivity , region = mesh.region , material = mesh.material )
+        
+        # Last step result
+        result = None
+        
+        # Loop over steps
+        for result in self.run():
+            
+            # Append step
+            writer.append( **asdict( result ) )
+        
+        # Return last step result
+        return result
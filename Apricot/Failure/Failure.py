@@ -0,0 +1,320 @@
+# Import dataclass library
+from dataclasses import dataclass
+
+# Import list library
+import typing
+
+# Import math library
+import math
+
+# Import normal distribution library
+from statistics import NormalDist
+
+# Import process pool library
+from concurrent.futures import ProcessPoolExecutor
+
+# Import numpy library
+import numpy as np
+
+# Import functions
+from ModelInput import ModelInput
+from Material import Material
+from Mesh import REGIONS
+from Batch import Batch, GEOMETRY
+from FEM import FEM
+
+#################
+# FAILURE MODES #
+#################
+
+# Layers checked for failure ( region name , material struct used for the strength )
+MODES = ( ( 'IPyC' , 'PyC' ) , ( 'SiC' , 'SiC' ) , ( 'OPyC' , 'PyC' ) )
+
+####################
+# WEIBULL STRENGTH #
+####################
+
+# Sample fracture strengths from a Weibull distribution with mean strength S and Weibull modulus k
+def sampleStrength( rng: np.random.Generator, S: float, k: float, N: int ):
+    
+    # Characteristic strength from the mean strength
+    S0 = S / math.gamma( 1.0 + ( 1.0 / k ) )
+    
+    # Weibull samples
+    return S0 * rng.weibull( k , N )
+
+####################
+# CONFIDENCE RANGE #
+####################
+
+# Wilson score interval for Nfailures out of Nsamples
+def wilsonInterval( Nfailures: int, Nsamples: int, confidence: float ):
+    
+    # Normal quantile
+    z = NormalDist().inv_cdf( 0.5 + ( confidence / 2.0 ) )
+    
+    # Failure fraction
+    p = Nfailures / Nsamples
+    
+    # Interval centre and half width
+    centre = ( p + ( z * z / ( 2.0 * Nsamples ) ) ) / ( 1.0 + ( z * z / Nsamples ) )
+    half = ( z / ( 1.0 + ( z * z / Nsamples ) ) ) * math.sqrt( ( p * ( 1.0 - p ) / Nsamples ) + ( z * z / ( 4.0 * Nsamples * Nsamples ) ) )
+    
+    # Return interval
+    return max( 0.0 , centre - half ), min( 1.0 , centre + half )
+
+#################
+# PEAK STRESSES #
+#################
+
+# Peak stresses per particle and region of a batch of particles ( Nparticles x 4 x 2 , same recovery as FEM.postProcessing )
+def peakStresses( model: ModelInput, PyC: Material, SiC: Material, geometry: dict ):
+    
+    # Batch of particles ( model surface pressures )
+    batch = Batch( model, PyC, SiC, **geometry )
+    
+    # Assembly and solve
+    batch.assembly()
+    batch.solve()
+    
+    # Return gauss point and nodal peak stresses
+    return batch.postProcessing()
+
+################
+# SAMPLE CHUNK #
+################
+
+# Solve one chunk of sampled particles and count the failures per mode ( runs on a worker process )
+def failureChunk( model: ModelInput, PyC: Material, SiC: Material, deviations: dict, Nsamples: int, seed: np.random.SeedSequence ):
+    
+    # Random generator of the chunk
+    rng = np.random.default_rng( seed )
+    
+    ############
+    # GEOMETRY #
+    ############
+    
+    # Sampled geometry ( normal around the model value , kept positive )
+    geometry = { name: np.maximum( rng.normal( getattr( model , name ) , deviations.get( name , 0.0 ) , Nsamples ) , 1.0e-6 ) for name in GEOMETRY }
+    
+    #########
+    # SOLVE #
+    #########
+    
+    # Peak stresses of the sampled particles
+    peakStress = peakStresses( model , PyC , SiC , geometry )
+    
+    ############
+    # FAILURES #
+    ############
+    
+    # Material structs by name
+    materials = { 'PyC': PyC , 'SiC': SiC }
+    
+    # Failures per mode
+    failures = { }
+    
+    # Particles failing in any mode
+    failed = np.zeros( Nsamples , dtype = bool )
+    
+    # Loop over failure modes
+    for region, name in MODES:
+        
+        # Peak tangential stress in the layer
+        peak = peakStress[ :, REGIONS.index( region ) , 1 ]
+        
+        # Sampled layer strength
+        strength = sampleStrength( rng , materials[ name ].S , materials[ name ].k , Nsamples )
+        
+        # Layer failure
+        mode = peak > strength
+        
+        # Failures allocation
+        failures[ region ] = int( mode.sum() )
+        
+        # Particle failure
+        failed |= mode
+    
+    # Particles failing in any mode
+    failures[ 'Particle' ] = int( failed.sum() )
+    
+    # Return failures
+    return failures
+
+##################
+# FAILURE RESULT #
+##################
+
+# Failure result class initialization
+@dataclass
+class FailureResult:
+    
+    # Number of samples
+    Nsamples: int
+    
+    # Confidence level of the intervals
+    confidence: float
+    
+    # Failures per mode
+    failures: 'typing.Any'
+    
+    # Failure probability per mode
+    probability: 'typing.Any'
+    
+    # Confidence interval per mode ( lower , upper )
+    interval: 'typing.Any'
+    
+    #########
+    # PRINT #
+    #########
+    
+    # Print
+    def print( self ):
+        
+        # Print header
+        print( '--------------------------------------------------------------------' )
+        print( 'Failure probability ( %d samples , %.0f%% confidence )' % ( self.Nsamples , 100.0 * self.confidence ) )
+        
+        # Loop over modes
+        for mode in self.failures:
+            
+            # Print mode probability
+            print( '%-8s failures = %-10d P = %.3e [ %.3e , %.3e ]' % ( mode , self.failures[ mode ] , self.probability[ mode ] , *self.interval[ mode ] ) )
+        
+        # Print footer
+        print( '--------------------------------------------------------------------' )
+
+#################
+# FAILURE CLASS #
+#################
+
+# Failure class initialization - Monte Carlo failure probability over sampled geometry and strength
+@dataclass
+class Failure:
+    
+    ###############
+    # MODEL INPUT #
+    ###############
+    
+    # Model input ( mean geometry )
+    model: ModelInput
+    
+    #############
+    # MATERIALS #
+    #############
+    
+    # Material structs ( mean strength S and Weibull modulus k )
+    PyC: Material
+    SiC: Material
+    
+    ##############
+    # DEVIATIONS #
+    ##############
+    
+    # Standard deviation per geometry parameter [ um ]
+    deviations: 'typing.Any'
+    
+    ############
+    # SAMPLING #
+    ############
+    
+    # Number of samples per chunk
+    chunkSize: int
+    
+    # Number of worker processes ( 1 = serial )
+    Nworkers: int
+    
+    # Random seed
+    seed: int
+    
+    ##################
+    # INITIALIZATION #
+    ##################
+    
+    # Initialization
+    def __init__ ( self, model: ModelInput, PyC: Material, SiC: Material, deviations: dict = None, chunkSize: int = 100000, Nworkers: int = 1, seed: int = 0 ):
+        
+        # Model input allocation
+        self.model = model
+        
+        # Material structs allocation
+        self.PyC = PyC
+        self.SiC = SiC
+        
+        # Check deviations
+        unknown = set( deviations or { } ) - set( GEOMETRY )
+        if( unknown ):
+            raise ValueError( 'Unknown geometry parameters: %s' % ', '.join( sorted( unknown ) ) )
+        
+        # Deviations allocation
+        self.deviations = dict( deviations or { } )
+        
+        # Sampling allocation
+        self.chunkSize = int( chunkSize )
+        self.Nworkers = int( Nworkers )
+        self.seed = seed
+    
+    #######
+    # RUN #
+    #######
+    
+    # Estimate failure probabilities from Nsamples sampled particles
+    def run( self, Nsamples: int, confidence: float = 0.95 ):
+        
+        # Check number of samples
+        if( Nsamples < 1 ):
+            raise ValueError( 'Failure number of samples must be at least 1 ( got %s )' % Nsamples )
+        
+        # Chunk sizes
+        sizes = [ self.chunkSize ] * ( Nsamples // self.chunkSize )
+        if( Nsamples % self.chunkSize ):
+            sizes.append( Nsamples % self.chunkSize )
+        
+        # Independent seeds per chunk ( results do not depend on the number of workers )
+        seeds = np.random.SeedSequence( self.seed ).spawn( len( sizes ) )
+        
+        # Chunk arguments
+        chunks = [ ( self.model , self.PyC , self.SiC , self.deviations , size , seed ) for size, seed in zip( sizes , seeds ) ]
+        
+        # Serial evaluation
+        if( self.Nworkers <= 1 ):
+            results = [ failureChunk( *chunk ) for chunk in chunks ]
+        
+        # Parallel evaluation over a process pool
+        else:
+            with ProcessPoolExecutor( max_workers = self.Nworkers ) as pool:
+                results = list( pool.map( failureChunk , *zip( *chunks ) ) )
+        
+        # Failures summed over chunks
+        failures = { mode: sum( result[ mode ] for result in results ) for mode in results[ 0 ] }
+        
+        # Return failure result
+        return FailureResult( Nsamples, confidence, failures, { mode: count / Nsamples for mode, count in failures.items() }, { mode: wilsonInterval( count , Nsamples , confidence ) for mode, count in failures.items() } )
+    
+    #########
+    # CHECK #
+    #########
+    
+    # Consistency check of the sampled peak stresses - Mean particle through the Failure batch path against FEM.postProcessing
+    # Returns both peak stress tables ( 4 x 2 ) , raises if they differ by more than the relative tolerance
+    def check( self, tolerance: float = 1.0e-9 ):
+        
+        # Peak stresses of the mean particle from the batch path
+        sampled = peakStresses( self.model , self.PyC , self.SiC , { name: getattr( self.model , name ) for name in GEOMETRY } )[ 0 ]
+        
+        # Finite element solve with the same surface pressures
+        fem = FEM( self.model, self.PyC, self.SiC )
+        fem.setPressure( self.model.endLifeInternalPressure , self.model.ambientPressure )
+        fem.assembly()
+        fem.solve()
+        reference = fem.postProcessing()
+        
+        # Relative difference
+        error = np.abs( sampled - reference ).max() / max( np.abs( reference ).max() , np.finfo( float ).tiny )
+        
+        # Check peak stresses
+        if( error > tolerance ):
+            raise RuntimeError( 'Failure peak stresses differ from FEM.postProcessing by %.3e ( relative tolerance %.1e )' % ( error , tolerance ) )
+        
+        # Return peak stresses
+        return sampled, reference
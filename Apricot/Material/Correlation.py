@@ -0,0 +1,114 @@
+# Import function tools library
+import functools
+
+# Import numpy library
+import numpy as np
+
+################
+# CORRELATIONS #
+################
+
+# Irridiation correlation registry ( case -> pieces )
+# Each piece is ( upper fluence bound , radial coefficients , tangential coefficients ) with the coefficients
+# from the highest power down to the constant term , pieces sorted by bound and applied for phi <= bound
+CORRELATIONS = { }
+
+############
+# REGISTER #
+############
+
+# Register an irridiation correlation case ( replaces an existing case with the same name )
+def registerCorrelation( case: str, pieces: list ):
+    
+    # Check pieces
+    if( len( pieces ) == 0 or pieces[ -1 ][ 0 ] != np.inf ):
+        raise ValueError( "Correlation '%s' must end with a piece bounded by inf" % case )
+    
+    # Correlation allocation ( sorted by upper bound )
+    CORRELATIONS[ case ] = tuple( ( float( bound ) , tuple( map( float , er ) ) , tuple( map( float , et ) ) ) for bound, er, et in sorted( pieces , key = lambda piece: piece[ 0 ] ) )
+    
+    # Clear memoized values
+    scalarRates.cache_clear()
+
+##########
+# HORNER #
+##########
+
+# Polynomial evaluation in Horner form ( coefficients from the highest power down )
+def horner( coefficients: tuple, phi ):
+    
+    # Highest coefficient
+    value = coefficients[ 0 ] + ( 0.0 * phi )
+    
+    # Loop over lower coefficients
+    for coefficient in coefficients[ 1: ]:
+        value = ( value * phi ) + coefficient
+    
+    # Return polynomial value
+    return value
+
+##############
+# EVALUATION #
+##############
+
+# Radial and tangential irridiation induced change rates over an array of fluences
+def irridiationRates( case: str, phi ):
+    
+    # Scalar fluence ( memoized )
+    if( np.ndim( phi ) == 0 ):
+        return scalarRates( case , float( phi ) )
+    
+    # Correlation pieces
+    pieces = CORRELATIONS[ case ]
+    
+    # Fluence array
+    phi = np.asarray( phi , dtype = float )
+    
+    # Single piece correlation
+    if( len( pieces ) == 1 ):
+        return horner( pieces[ 0 ][ 1 ] , phi ), horner( pieces[ 0 ][ 2 ] , phi )
+    
+    # Piece of every fluence ( phi <= bound )
+    index = np.searchsorted( [ piece[ 0 ] for piece in pieces ] , phi , side = 'left' )
+    
+    # Rates initialization
+    er = np.empty( phi.shape )
+    et = np.empty( phi.shape )
+    
+    # Loop over pieces
+    for k, ( bound, erCoefficients, etCoefficients ) in enumerate( pieces ):
+        
+        # Fluences on the piece
+        mask = index == k
+        
+        # Piece rates
+        er[ mask ] = horner( erCoefficients , phi[ mask ] )
+        et[ mask ] = horner( etCoefficients , phi[ mask ] )
+    
+    # Return rates
+    return er, et
+
+# Radial and tangential irridiation induced change rates for one fluence ( memoized per case and fluence )
+@functools.lru_cache( maxsize = 65536 )
+def scalarRates( case: str, phi: float ):
+    
+    # Loop over pieces
+    for bound, erCoefficients, etCoefficients in CORRELATIONS[ case ]:
+        
+        # Piece of the fluence
+        if( phi <= bound ):
+            return horner( erCoefficients , phi ), horner( etCoefficients , phi )
+
+########################
+# DEFAULT CORRELATIONS #
+########################
+
+# Correlation case B
+registerCorrelation( 'b' , [ ( np.inf , ( + 1.36334e-3 , - 7.77024e-3 , + 2.00861e-2 , - 2.22642e-2 ) , ( - 3.53804e-4 , + 1.67251e-3 , + 2.63307e-3 , - 1.91253e-2 ) ) ] )
+
+# Correlation case C
+registerCorrelation( 'c' , [ ( np.inf , ( + 4.03266e-4 , - 2.25937e-3 , + 9.82884e-3 , - 1.80613e-2 ) , ( - 4.91648e-4 , + 2.32979e-3 , + 1.71315e-3 , - 1.78392e-2 ) ) ] )
+
+# Correlation case D ( constant rates above 6.08 )
+registerCorrelation( 'd' , [ ( 6.08 , ( + 4.52013e-4 , - 8.36313e-3 , + 5.67549e-2 , - 1.74247e-1 , + 2.62692e-1 , - 1.43234e-1 ) , ( + 1.30457e-4 , - 2.10029e-3 , + 9.07826e-3 , - 3.24737e-2 ) ) ,
+                             ( np.inf , ( + 0.0954 , ) , ( - 0.0249 , ) ) ] )
@@ -1,6 +1,20 @@
 # Import dataclass library
 from dataclasses import dataclass
 
+# Import functions
+from Correlation import CORRELATIONS, irridiationRates
+from Profiler import timed
+
+#################################
+# IRRIDIATION CREEP COEFFICIENT #
+#################################
+
+# Temperature dependent irridiation creep coefficient [ MPa^-1 ] of temperature T [ ºC ] ( scalar or array )
+def creepCoefficient( T: float ):
+    
+    # Return irridiation creep coefficient
+    return 4.386e-4 - ( 9.70e-7 * T ) + ( 8.0294e-10 * T * T )
+
 ##################
 # MATERIAL CLASS #
 ##################
@@ -191,7 +205,7 @@ class Material:
         if( self.K_temp == True ):
             
             # Calculate irridiation creep coefficient
-            self.K = 4.386e-4 - ( 9.70e-7 * self.T ) + ( 8.0294e-10 * self.T * self.T )
+            self.K = creepCoefficient( self.T )
     
     # Set irridiation creep coefficient
     def setIrridiationCreepCoefficient( self, K: float ):
@@ -213,48 +227,17 @@ class Material:
     ##########################
         
     # Set irridiation correlation case
+    @timed( 'Material.setIrridiationCase' )
     def setIrridiationCase( self, irrCase: str ):
         
         # Correlation case allocation
         self.irrCase = irrCase
 
-        # Correlation case B
-        if( self.irrCase == 'b' ):
-            
-            # Radial irridiation induced change calculation
-            self.er = + ( 1.36334e-3 * ( self.phi**3.0 ) ) - ( 7.77024e-3 * ( self.phi**2.0 ) ) + ( 2.00861e-2 * ( self.phi**1.0 ) ) - 2.22642e-2
-            
-            # Tangent irridiation induced change calculation
-            self.et = - ( 3.53804e-4 * ( self.phi**3.0 ) ) + ( 1.67251e-3 * ( self.phi**2.0 ) ) + ( 2.63307e-3 * ( self.phi**1.0 ) ) - 1.91253e-2
-            
-        # Correlation case C
-        if ( self.irrCase == 'c' ):
-            
-            # Radial irridiation induced change calculation
-            self.er = + ( 4.03266e-4 * ( self.phi**3.0 ) ) - ( 2.25937e-3 * ( self.phi**2.0 ) ) + ( 9.82884e-3 * ( self.phi**1.0 ) ) - 1.80613e-2
-            
-            # Tangent irridiation induced change calculation
-            self.et = - ( 4.91648e-4 * ( self.phi**3.0 ) ) + ( 2.32979e-3 * ( self.phi**2.0 ) ) + ( 1.71315e-3 * ( self.phi**1.0 ) ) - 1.78392e-2
-            
-        # Correlation case C
-        if ( self.irrCase == 'd' ):
-            
-            # Check phi condition
-            if( self.phi <= 6.08 ):
-                
-                # Radial irridiation induced change calculation
-                self.er = + ( 4.52013e-4 * ( self.phi**5.0 ) ) - ( 8.36313e-3 * ( self.phi**4.0 ) ) + ( 5.67549e-2 * ( self.phi**3.0 ) ) - ( 1.74247e-1 * ( self.phi**2.0 ) ) + ( 2.62692e-1 * ( self.phi**1.0 ) ) - 1.43234e-1
-            
-                # Tangent irridiation induced change calculation
-                self.et = + ( 1.30457e-4 * ( self.phi**3.0 ) ) - ( 2.10029e-3 * ( self.phi**2.0 ) ) + ( 9.07826e-3 * ( self.phi**1.0 ) ) - 3.24737e-2
-                
-            else:
-                
-                # Radial irridiation induced change calculation
-                self.er = + 0.0954
+        # Registered correlation case ( unknown cases keep the current rates )
+        if( self.irrCase in CORRELATIONS ):
             
-                # Tangent irridiation induced change calculation
-                self.et = - 0.0249                
+            # Radial and tangent irridiation induced change calculation
+            self.er, self.et = irridiationRates( self.irrCase , self.phi )
         
     #########
     # PRINT #
@@ -325,4 +308,40 @@ class Material:
     def printShort( self ):
         
         # Print name
-        print( 'Material Name                 = %s' % self.name )      
\ No newline at end of file
+        print( 'Material Name                 = %s' % self.name )      
+
+#####################
+# MATERIAL DATABASE #
+#####################
+
+# PyC and SiC material structs at fast fluence phi and irridiation temperature T [ ºC ] for an irridiation correlation case
+def materials( phi: float, T: float, irrCase: str = 'b' ):
+    
+    # PyC material initaliazation
+    PyC = Material ( 1 , 'PyC', T, phi, 3.96e4 , 0.33 , 1.90, 5.50e-6, 200, 5.00 )
+    
+    # Sic material initaliazation
+    SiC = Material ( 2 , 'SiC', T, phi, 3.70e5 , 0.13 , 3.20, 4.90e-6, 873, 8.02 )
+    
+    ##########################
+    # CREEP PARAMETERS # PYC #
+    ##########################
+    
+    # Set if the creep parameter is temperature dependent
+    PyC.setCreepDependent( True )
+    
+    # Set irridiation creep coefficient - If the above is true, this line will be disregarded
+    PyC.setIrridiationCreepCoefficient( 2.7e-4 )
+    
+    # Set poisson ration in creep
+    PyC.setCreepPoissonRatio( 0.50 )
+    
+    ################################
+    # IRRIDIATION PARAMETERS # PYC #
+    ################################
+    
+    # Set irradiation case
+    PyC.setIrridiationCase( irrCase )
+    
+    # Return material structs
+    return PyC, SiC
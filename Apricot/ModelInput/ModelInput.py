@@ -1,8 +1,145 @@
 # Import dataclass library
 from dataclasses import dataclass
 
-# Import pandas library
-import pandas as pd
+# Import operating system library
+import os
+
+# Import hash library
+import hashlib
+
+# Import json library
+import json
+
+# Import numpy library
+import numpy as np
+
+# Import functions
+from Profiler import phase
+
+##########
+# FIELDS #
+##########
+
+# Input fields in file order ( row order of InputData.xlsx )
+FIELDS = ( 'kernelDiameter' , 'bufferThickness' , 'IPyCThickness' , 'SiCThickness' , 'OPyCThickness' ,
+           'kernelDensity' , 'bufferDensity' , 'IPyCDensity' , 'SiCDensity' , 'OPyCDensity' ,
+           'IPyCBAF' , 'OPyCBAF' , 'EFDP' , 'endLifeBumup' , 'endLifeFluence' , 'irridiationTemperature' ,
+           'endLifeInternalPressure' , 'ambientPressure' , 'Nelements' , 'beta' )
+
+#########
+# CACHE #
+#########
+
+# Parsed inputs of this process ( absolute path -> ( mtime , hash , values ) )
+CACHE = { }
+
+# Suffix of the parsed input cache written next to the input file
+CACHE_SUFFIX = '.cache.npz'
+
+###############
+# DICT VALUES #
+###############
+
+# Input values in file order from a dict keyed by field name
+def valuesFromDict( values: dict ):
+    
+    # Check missing fields
+    missing = [ name for name in FIELDS if name not in values ]
+    if( missing ):
+        raise ValueError( 'Missing input fields: %s' % ', '.join( missing ) )
+    
+    # Return values array
+    return np.array( [ values[ name ] for name in FIELDS ] , dtype = float )
+
+##############
+# PARSE FILE #
+##############
+
+# Parse an input file into the values array ( xlsx / json / toml / npz )
+def parseInput( path: str ):
+    
+    # File extension
+    extension = os.path.splitext( path )[ 1 ].lower()
+    
+    # Excel file ( pandas is only imported here )
+    if( extension in ( '.xlsx' , '.xls' ) ):
+        
+        # Import pandas library
+        import pandas as pd
+        
+        # Read excel file ( values on the second column )
+        return pd.read_excel( path ).iloc[ :len( FIELDS ) , 1 ].to_numpy( dtype = float )
+    
+    # Json file
+    if( extension == '.json' ):
+        with open( path , 'r' ) as file:
+            return valuesFromDict( json.load( file ) )
+    
+    # Toml file
+    if( extension == '.toml' ):
+        
+        # Import toml library
+        import tomllib
+        
+        # Read toml file
+        with open( path , 'rb' ) as file:
+            return valuesFromDict( tomllib.load( file ) )
+    
+    # Numpy archive
+    if( extension == '.npz' ):
+        with np.load( path ) as archive:
+            return valuesFromDict( { name: archive[ name ] for name in archive.files } )
+    
+    # Unknown format
+    raise ValueError( "Unknown input format '%s' ( expected .xlsx, .json, .toml or .npz )" % extension )
+
+##############
+# READ INPUT #
+##############
+
+# Input values of a file, parsed once and cached by modification time and content hash
+def readInput( path: str ):
+    
+    # Absolute path
+    path = os.path.abspath( path )
+    
+    # Modification time
+    mtime = os.stat( path ).st_mtime_ns
+    
+    # Process cache with the same modification time
+    if( path in CACHE and CACHE[ path ][ 0 ] == mtime ):
+        return CACHE[ path ][ 2 ].copy()
+    
+    # File content hash
+    with open( path , 'rb' ) as file:
+        digest = hashlib.sha256( file.read() ).hexdigest()
+    
+    # Cache file
+    cachePath = path + CACHE_SUFFIX
+    
+    # Values from the cache file ( a touched file with the same content is still a hit )
+    values = None
+    try:
+        with np.load( cachePath ) as archive:
+            if( str( archive[ 'hash' ] ) == digest and archive[ 'values' ].shape == ( len( FIELDS ) , ) ):
+                values = archive[ 'values' ]
+    except ( OSError , KeyError , ValueError ):
+        pass
+    
+    # Parse the file and write the cache ( unwritable folders only skip the cache file )
+    if( values is None ):
+        values = parseInput( path )
+        try:
+            with open( cachePath , 'wb' ) as file:
+                np.savez( file , values = values , hash = digest )
+        except OSError:
+            pass
+    
+    # Process cache allocation
+    CACHE[ path ] = ( mtime , digest , values )
+    
+    # Return values
+    return values.copy()
 
 ###############
 # MODEL CLASS #
@@ -25,7 +162,7 @@ class ModelInput:
     
     # Buffer thickness [ um ]
     bufferThickness: float
-        
+    
     ##################
     # IPYC THICKNESS #
     ##################
@@ -60,7 +197,7 @@ class ModelInput:
     
     # Buffer density [ g / cm³ ]
     bufferDensity: float
-        
+    
     ################
     # IPYC DENSITY #
     ################
@@ -156,84 +293,112 @@ class ModelInput:
     # INITIALIZATION #
     ##################
     
-    # Initialization
-    def __init__ ( self ):
+    # Initialization - Input file path ( .xlsx / .json / .toml / .npz )
+    def __init__ ( self, path: str = 'InputData.xlsx' ):
         
         #############
         # READ FILE #
         #############
         
-        # Read excel file
-        excel = pd.read_excel( 'InputData.xlsx' )
+        # Read input values ( cached by modification time and content hash )
+        with phase( 'ModelInput.read' , path = str( path ) ):
+            values = readInput( path )
         
         ############
         # ALLOCATE #
         ############
         
+        # Allocate values
+        self.setValues( values )
+    
+    #############
+    # FROM DICT #
+    #############
+    
+    # Model input from a dict keyed by field name ( no file access )
+    @classmethod
+    def fromDict( cls, values: dict ):
+        
+        # Model input without reading a file
+        model = cls.__new__( cls )
+        
+        # Allocate values
+        model.setValues( valuesFromDict( values ) )
+        
+        # Return model input
+        return model
+    
+    ##############
+    # SET VALUES #
+    ##############
+    
+    # Allocate the values array ( FIELDS order )
+    def setValues( self, values: np.ndarray ):
+        
         # Kernel diameter [ um ]
-        self.kernelDiameter = excel.iloc[ 0 ][ 1 ]
+        self.kernelDiameter = values[ 0 ]
         
         # Buffer thickness [ um ]
-        self.bufferThickness = excel.iloc[ 1 ][ 1 ]
+        self.bufferThickness = values[ 1 ]
         
         # IPyC thickness [ um ]
-        self.IPyCThickness = excel.iloc[ 2 ][ 1 ]
+        self.IPyCThickness = values[ 2 ]
         
         # SiC thickness [ um ]
-        self.SiCThickness = excel.iloc[ 3 ][ 1 ]
+        self.SiCThickness = values[ 3 ]
         
         # OPyC thickness [ um ]
-        self.OPyCThickness = excel.iloc[ 4 ][ 1 ]
+        self.OPyCThickness = values[ 4 ]
         
         # Kernel density [ g / cm³ ]
-        self.kernelDensity = excel.iloc[ 5 ][ 1 ]
+        self.kernelDensity = values[ 5 ]
         
         # Buffer density [ g / cm³ ]
-        self.bufferDensity = excel.iloc[ 6 ][ 1 ]
+        self.bufferDensity = values[ 6 ]
         
         # IPyC density [ g / cm³ ]
-        self.IPyCDensity = excel.iloc[ 7 ][ 1 ]
+        self.IPyCDensity = values[ 7 ]
         
         # SiC density [ g / cm³ ]
-        self.SiCDensity = excel.iloc[ 8 ][ 1 ]
+        self.SiCDensity = values[ 8 ]
         
         # OPyC density [ g / cm³ ]
-        self.OPyCDensity = excel.iloc[ 9 ][ 1 ]
+        self.OPyCDensity = values[ 9 ]
         
         # IPyC BAF [ - ]
-        self.IPyCBAF = excel.iloc[ 10 ][ 1 ]
+        self.IPyCBAF = values[ 10 ]
         
         # OPyC BAF [ - ]
-        self.OPyCBAF = excel.iloc[ 11 ][ 1 ]
+        self.OPyCBAF = values[ 11 ]
         
         # Irridiation duration [ - ]
-        self.EFDP = excel.iloc[ 12 ][ 1 ]
+        self.EFDP = values[ 12 ]
         
         # End of life bumup [ % ]
-        self.endLifeBumup = excel.iloc[ 13 ][ 1 ]
+        self.endLifeBumup = values[ 13 ]
         
         # End of life fluence [ MeV ]
-        self.endLifeFluence = excel.iloc[ 14 ][ 1 ]
+        self.endLifeFluence = values[ 14 ]
         
         # Irridiation temperature [ ºC ]
-        self.irridiationTemperature = excel.iloc[ 15 ][ 1 ]
-
+        self.irridiationTemperature = values[ 15 ]
+        
         # End of life internal pressure [ MPa ]
-        self.endLifeInternalPressure = excel.iloc[ 16 ][ 1 ]
+        self.endLifeInternalPressure = values[ 16 ]
         
         # Ambient pressure [ MPa ]
-        self.ambientPressure = excel.iloc[ 17 ][ 1 ]
+        self.ambientPressure = values[ 17 ]
         
         # Number of elements
-        self.Nelements = excel.iloc[ 18 ][ 1 ]
+        self.Nelements = values[ 18 ]
         
         # Method multiplier
-        self.beta = excel.iloc[ 19 ][ 1 ]
-   
+        self.beta = values[ 19 ]
+    
     #########
     # PRINT #
     #########
-        
+    
     # Print
     def print( self ):
         
@@ -244,7 +409,7 @@ class ModelInput:
         print("     #_#  ####   ###   #   #     #  #    #    ")    
         print("    #  #  #      #  #  #   ####  ####    #    ") 
         print('---------------------------------------------------------')
-
+        
         # Print kernel diameter [ um ]
         print( 'Kernel diameter [ um ]        = %.2f' % self.kernelDiameter )
         
@@ -304,6 +469,6 @@ class ModelInput:
         
         # Print method multipliers
         print( 'Method multiplier - beta      = %.2f' % self.beta )
-         
+        
         # Print footer
         print( '--------------------------------------------------------------------' )
\ No newline at end of file
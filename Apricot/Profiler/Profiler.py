@@ -0,0 +1,276 @@
+# Import dataclass library
+from dataclasses import dataclass
+
+# Import list library
+import typing
+
+# Import system
+import sys
+
+# Import operating system library
+import os
+
+# Import json library
+import json
+
+# Import time library
+import time
+
+# Import function tools library
+import functools
+
+# Import context manager library
+import contextlib
+
+###################
+# PROFILER RECORD #
+###################
+
+# Every finished phase is exported as one record ( one JSON line )
+#   phase     phase name ( e.g. 'FEM.assembly' )
+#   parent    enclosing phase name ( None on the top level )
+#   wall      wall time [ s ]
+#   cpu       process CPU time [ s ]
+#   blocks    net allocated memory blocks ( sys.getallocatedblocks difference )
+#   counters  counter increments inside the phase ( e.g. element kernel calls and elements )
+#   pid       process id ( records of pool workers share one file )
+#   tags      keyword tags given to the phase
+
+# Environment variable enabling the profiler on import ( JSON lines file , inherited by worker processes )
+ENVIRONMENT = 'APRICOT_PROFILE'
+
+##################
+# PROFILER CLASS #
+##################
+
+# Profiler class initialization - Collects phase records and counters while active
+@dataclass
+class Profiler:
+    
+    # JSON lines file ( records appended as they finish , None = memory only )
+    path: str
+    
+    # Callback called with every record
+    callback: 'typing.Any'
+    
+    # Keep records in memory
+    keep: bool
+    
+    # Finished phase records
+    records: 'typing.Any'
+    
+    # Counters ( name -> total )
+    counters: 'typing.Any'
+    
+    # Open phase names
+    stack: 'typing.Any'
+    
+    ##################
+    # INITIALIZATION #
+    ##################
+    
+    # Initialization
+    def __init__ ( self, path: str = None, callback: 'typing.Any' = None, keep: bool = True ):
+        
+        # Export allocation
+        self.path = path
+        self.callback = callback
+        self.keep = keep
+        
+        # State allocation
+        self.records = [ ]
+        self.counters = { }
+        self.stack = [ ]
+    
+    ########
+    # EMIT #
+    ########
+    
+    # Export a finished phase record
+    def emit( self, record: dict ):
+        
+        # Memory
+        if( self.keep ):
+            self.records.append( record )
+        
+        # Callback
+        if( self.callback is not None ):
+            self.callback( record )
+        
+        # JSON lines file ( one append per record , safe across worker processes )
+        if( self.path is not None ):
+            with open( self.path , 'a' ) as file:
+                file.write( json.dumps( record ) + '\n' )
+    
+    ###########
+    # SUMMARY #
+    ###########
+    
+    # Totals per phase ( calls , wall , cpu , blocks ) and counter totals
+    def summary( self ):
+        
+        # Totals per phase
+        phases = { }
+        
+        # Loop over records
+        for record in self.records:
+            total = phases.setdefault( record[ 'phase' ] , { 'calls': 0 , 'wall': 0.0 , 'cpu': 0.0 , 'blocks': 0 } )
+            total[ 'calls' ] += 1
+            total[ 'wall' ] += record[ 'wall' ]
+            total[ 'cpu' ] += record[ 'cpu' ]
+            total[ 'blocks' ] += record[ 'blocks' ]
+        
+        # Return totals
+        return phases, dict( self.counters )
+    
+    #########
+    # PRINT #
+    #########
+    
+    # Print
+    def print( self ):
+        
+        # Totals
+        phases, counters = self.summary()
+        
+        # Print header
+        print( '--------------------------------------------------------------------' )
+        print( 'Profiler phases' )
+        
+        # Loop over phases
+        for name, total in phases.items():
+            
+            # Print phase totals
+            print( '%-24s calls = %-6d wall = %.4e s  cpu = %.4e s  blocks = %+d' % ( name , total[ 'calls' ] , total[ 'wall' ] , total[ 'cpu' ] , total[ 'blocks' ] ) )
+        
+        # Loop over counters
+        for name, value in counters.items():
+            
+            # Print counter
+            print( '%-24s = %d' % ( name , value ) )
+        
+        # Print footer
+        print( '--------------------------------------------------------------------' )
+
+###################
+# ACTIVE PROFILER #
+###################
+
+# Active profiler ( None = disabled , every hook returns immediately )
+ACTIVE = None
+
+# Shared no-op phase returned while disabled
+NULL_PHASE = contextlib.nullcontext()
+
+# Enable a profiler ( returns it )
+def enable( path: str = None, callback: 'typing.Any' = None, keep: bool = True ):
+    
+    # Active profiler allocation
+    global ACTIVE
+    ACTIVE = Profiler( path, callback, keep )
+    
+    # Return profiler
+    return ACTIVE
+
+# Disable the profiler ( returns the previous one )
+def disable():
+    
+    # Active profiler removal
+    global ACTIVE
+    profiler, ACTIVE = ACTIVE, None
+    
+    # Return previous profiler
+    return profiler
+
+# Profile a block - with profile( 'run.jsonl' ) as profiler: ...
+@contextlib.contextmanager
+def profile( path: str = None, callback: 'typing.Any' = None, keep: bool = True ):
+    
+    # Active profiler allocation ( restored on exit )
+    global ACTIVE
+    previous = ACTIVE
+    ACTIVE = Profiler( path, callback, keep )
+    
+    # Profile the block
+    try:
+        yield ACTIVE
+    finally:
+        ACTIVE = previous
+
+#########
+# HOOKS #
+#########
+
+# Measure a phase of the active profiler
+@contextlib.contextmanager
+def measurePhase( profiler: Profiler, name: str, tags: dict ):
+    
+    # Counters , times and allocated blocks at the start
+    counters = dict( profiler.counters )
+    parent = profiler.stack[ -1 ] if profiler.stack else None
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    blocks = sys.getallocatedblocks()
+    
+    # Run the phase
+    profiler.stack.append( name )
+    try:
+        yield
+    finally:
+        profiler.stack.pop()
+        
+        # Phase record
+        record = { 'phase': name , 'parent': parent , 'wall': time.perf_counter() - wall , 'cpu': time.process_time() - cpu , 'blocks': sys.getallocatedblocks() - blocks ,
+                   'counters': { key: value - counters.get( key , 0 ) for key, value in profiler.counters.items() if value != counters.get( key , 0 ) } ,
+                   'pid': os.getpid() , 'tags': tags }
+        
+        # Export record
+        profiler.emit( record )
+
+# Phase context manager - with phase( 'FEM.solve' ): ...
+def phase( name: str, **tags ):
+    
+    # Disabled
+    if( ACTIVE is None ):
+        return NULL_PHASE
+    
+    # Return measured phase
+    return measurePhase( ACTIVE, name, tags )
+
+# Phase decorator - Measures every call of the function as the phase name
+def timed( name: str ):
+    
+    # Decorator
+    def decorator( function ):
+        
+        # Wrapper ( plain call while disabled )
+        @functools.wraps( function )
+        def wrapper( *args, **kwargs ):
+            if( ACTIVE is None ):
+                return function( *args, **kwargs )
+            with measurePhase( ACTIVE, name, { } ):
+                return function( *args, **kwargs )
+        
+        # Return wrapper
+        return wrapper
+    
+    # Return decorator
+    return decorator
+
+# Increment a counter of the active profiler
+def count( name: str, n: int = 1 ):
+    
+    # Disabled
+    if( ACTIVE is None ):
+        return
+    
+    # Counter increment
+    ACTIVE.counters[ name ] = ACTIVE.counters.get( name , 0 ) + int( n )
+
+###############
+# ENVIRONMENT #
+###############
+
+# Profile the whole process to the JSON lines file given by the environment ( records not kept in memory )
+if( os.environ.get( ENVIRONMENT ) ):
+    enable( os.environ[ ENVIRONMENT ] , keep = False )
@@ -1,15 +1,12 @@
-# Import system
-import sys
-
-# Append path of the functions
-sys.path.append( 'Material' )
-sys.path.append( 'ModelInput' )
-sys.path.append( 'FEM' )
+# Import environment ( module folders on the path )
+import Environment
 
 # Import functions
 from ModelInput import ModelInput
-from Material import Material
+from Material import materials
 from FEM import FEM
+from Results import ResultsWriter
+from ModelInput import FIELDS
 
 ####################
 # MODEL PARAMETERS #
@@ -39,31 +36,8 @@ Ti  = 1000
 # MATERIAL INITIALIZATION #
 ###########################
 
-# PyC material initaliazation
-PyC = Material ( 1 , 'PyC', Ti, phi, 3.96e4 , 0.33 , 1.90, 5.50e-6, 200, 5.00 )
-
-# Sic material initaliazation
-SiC = Material ( 2 , 'SiC', Ti, phi, 3.70e5 , 0.13 , 3.20, 4.90e-6, 873, 8.02 )
-
-##########################
-# CREEP PARAMETERS # PYC #
-##########################
-
-# Set if the creep parameter is temperature dependent
-PyC.setCreepDependent( True )
-
-# Set irridiation creep coefficient - If the above is true, this line will be disregarded
-PyC.setIrridiationCreepCoefficient( 2.7e-4 )
-
-# Set poisson ration in creep
-PyC.setCreepPoissonRatio( 0.50 )
-
-################################
-# IRRIDIATION PARAMETERS # PYC #
-################################
-
-# Set irradiation case
-PyC.setIrridiationCase( 'b' )
+# PyC and SiC materials from the material database ( irridiation case b )
+PyC, SiC = materials( phi, Ti, 'b' )
 
 ###########################
 # PRINT MATERIAL DATABASE #
@@ -80,6 +54,13 @@ SiC.print()
 # Finite element initialization
 FEM = FEM( model, PyC, SiC )
 
+#####################
+# SURFACE PRESSURES #
+#####################
+
+# End of life internal pressure and ambient pressure on the inner and outer surfaces
+FEM.setPressure( model.endLifeInternalPressure, model.ambientPressure )
+
 ############
 # ASSEMBLY #
 ############
@@ -99,11 +80,19 @@ FEM.solve()
 ###################
 
 # Finite element post processing
-#FEM.postProcessing()
+FEM.postProcessing()
 
 ###################################
 # PRINT FINITE ELEMENT PARAMETERS #
 ###################################
 
-# Print finite element parameters
-FEM.print()
\ No newline at end of file
+# Print finite element summary ( FEM.print( verbose = True ) dumps every element and the global matrices )
+FEM.print()
+
+#################
+# WRITE RESULTS #
+#################
+
+# Write mesh and solution fields ( read back with readResults )
+with ResultsWriter( 'Results.npz' , metadata = { name: float( getattr( model , name ) ) for name in FIELDS } ) as writer:
+    FEM.write( writer )
\ No newline at end of file
@@ -0,0 +1,340 @@
+# Import dataclass library
+from dataclasses import dataclass
+
+# Import list library
+import typing
+
+# Import system
+import sys
+
+# Import argument parser library
+import argparse
+
+# Import json library
+import json
+
+# Import time library
+import time
+
+# Import numpy library
+import numpy as np
+
+# Import interpolation library
+from scipy.interpolate import RegularGridInterpolator
+
+# Import environment ( module folders on the path )
+import Environment
+
+# Import functions
+from ModelInput import ModelInput, FIELDS
+from Mesh import REGIONS
+from Batch import Batch, GEOMETRY
+from FEM import FEM
+from Material import materials
+
+###################
+# SURROGATE TABLE #
+###################
+
+# Table axes ( fluence / temperature / internal pressure / geometry ) - Axes with a single value are fixed and not interpolated
+AXES = ( 'phi' , 'T' , 'innerPressure' ) + GEOMETRY
+
+# Mesh options shared by Batch and FEM ( the spot checks rebuild the table mesh )
+OPTIONS = ( 'Ngauss' , 'mesher' , 'counts' , 'grading' , 'projection' )
+
+# Stress components of the peak stress table
+COMPONENTS = ( 'r' , 't' )
+
+# Interpolation methods ( multilinear / cubic spline / monotone cubic )
+METHODS = ( 'linear' , 'cubic' , 'pchip' )
+
+###################
+# SURROGATE CLASS #
+###################
+
+# Surrogate class initialization - Peak stresses per region of full FEM solutions on a regular grid , interpolated on queries
+@dataclass
+class Surrogate:
+    
+    ########
+    # GRID #
+    ########
+    
+    # Axis values ( name -> sorted 1D array )
+    axes: 'typing.Any'
+    
+    # Peak radial and tangential stresses per region on the grid ( grid shape x 4 x 2 )
+    peakStress: np.ndarray
+    
+    # Build metadata ( irridiation case , elements , mesh options , outer pressure , build time , spot check errors )
+    metadata: 'typing.Any'
+    
+    # Interpolators ( ( region , component , method ) -> RegularGridInterpolator )
+    interpolators: 'typing.Any'
+    
+    ##################
+    # INITIALIZATION #
+    ##################
+    
+    # Initialization from the grid axes and the peak stress table
+    def __init__ ( self, axes: dict, peakStress: np.ndarray, metadata: dict = None ):
+        
+        # Axes allocation ( table axis order )
+        self.axes = { name: np.asarray( axes[ name ] , dtype = float ) for name in AXES }
+        
+        # Check grid shape
+        shape = tuple( values.size for values in self.axes.values() ) + ( len( REGIONS ) , len( COMPONENTS ) )
+        if( np.shape( peakStress ) != shape ):
+            raise ValueError( 'Peak stress table must have shape %s for the grid axes ( got %s )' % ( shape , np.shape( peakStress ) ) )
+        
+        # Table allocation
+        self.peakStress = np.asarray( peakStress , dtype = float )
+        self.metadata = dict( metadata or { } )
+        self.interpolators = { }
+    
+    #########
+    # BUILD #
+    #########
+    
+    # Build the table with Batch solves over every grid point ( chunkSize particles per batch )
+    # Axes not given take the model and material values , the outer surface is held at the model ambient pressure
+    @classmethod
+    def build( cls, model: ModelInput, axes: dict, irrCase: str = 'b', chunkSize: int = 1000, progress: bool = False, **options ):
+        
+        # Start time
+        start = time.perf_counter()
+        
+        # Check mesh options
+        unknown = set( options ) - set( OPTIONS )
+        if( unknown ):
+            raise ValueError( 'Unknown surrogate mesh options %s ( expected %s )' % ( sorted( unknown ) , OPTIONS ) )
+        
+        # Reference materials ( template of the per particle material states )
+        PyC, SiC = materials( float( np.ravel( axes.get( 'phi' , [ 10.0 ] ) )[ 0 ] ) , float( np.ravel( axes.get( 'T' , [ model.irridiationTemperature ] ) )[ 0 ] ) , irrCase )
+        
+        # Axis values ( model values by default )
+        defaults = { 'phi': PyC.phi , 'T': PyC.T , 'innerPressure': model.endLifeInternalPressure , **{ name: getattr( model , name ) for name in GEOMETRY } }
+        grid = { name: np.unique( np.atleast_1d( np.asarray( axes.get( name , defaults[ name ] ) , dtype = float ) ) ) for name in AXES }
+        
+        # Grid points ( Npoints x Naxes )
+        shape = tuple( values.size for values in grid.values() )
+        points = np.stack( [ values.ravel() for values in np.meshgrid( *grid.values() , indexing = 'ij' ) ] , axis = 1 )
+        
+        # Peak stress table initialization
+        peakStress = np.zeros( ( points.shape[ 0 ] , len( REGIONS ) , len( COMPONENTS ) ) )
+        
+        # Loop over particle chunks
+        for first in range( 0 , points.shape[ 0 ] , chunkSize ):
+            
+            # Chunk parameters
+            chunk = points[ first:first + chunkSize ]
+            parameters = { name: chunk[ :, a ] for a, name in enumerate( AXES ) }
+            
+            # Batch initialization , assembly , solve and peak stresses
+            batch = Batch( model, PyC, SiC, **parameters, outerPressure = model.ambientPressure, **options )
+            batch.assembly()
+            batch.solve()
+            peakStress[ first:first + chunk.shape[ 0 ] ] = batch.postProcessing()
+            
+            # Progress
+            if( progress ):
+                print( '\r[ %d / %d ] grid points solved' % ( min( first + chunkSize , points.shape[ 0 ] ) , points.shape[ 0 ] ) , end = '' , file = sys.stderr , flush = True )
+        
+        # End progress line
+        if( progress ):
+            print( file = sys.stderr )
+        
+        # Metadata
+        metadata = { 'irrCase': irrCase , 'Nelements': int( model.Nelements ) , 'beta': float( model.beta ) , 'options': options , 'outerPressure': float( model.ambientPressure ) , 'buildTime': time.perf_counter() - start }
+        
+        # Return surrogate
+        return cls( grid, peakStress.reshape( shape + ( len( REGIONS ) , len( COMPONENTS ) ) ), metadata )
+    
+    ###############
+    # SAVE / LOAD #
+    ###############
+    
+    # Save the table to a compressed NPZ file ( axes , peak stresses and JSON metadata )
+    def save( self, path: str ):
+        
+        # Write arrays
+        np.savez_compressed( path , metadata = np.array( json.dumps( self.metadata ) ) , peakStress = self.peakStress , **{ 'axis_' + name: values for name, values in self.axes.items() } )
+    
+    # Load a table saved with save
+    @classmethod
+    def load( cls, path: str ):
+        
+        # Read arrays
+        with np.load( path , allow_pickle = False ) as data:
+            axes = { name: data[ 'axis_' + name ] for name in AXES }
+            peakStress = data[ 'peakStress' ]
+            metadata = json.loads( str( data[ 'metadata' ] ) )
+        
+        # Return surrogate
+        return cls( axes, peakStress, metadata )
+    
+    #########
+    # QUERY #
+    #########
+    
+    # Interpolated axes ( more than one grid value )
+    def interpolatedAxes( self ):
+        
+        # Return axis names
+        return tuple( name for name, values in self.axes.items() if values.size > 1 )
+    
+    # Interpolator of a region and component ( built once per method )
+    def interpolator( self, region: str, component: str, method: str ):
+        
+        # Check region , component and method
+        if( region not in REGIONS or component not in COMPONENTS or method not in METHODS ):
+            raise ValueError( "Unknown query '%s' / '%s' / '%s' ( expected a region of %s , a component of %s and a method of %s )" % ( region , component , method , REGIONS , COMPONENTS , METHODS ) )
+        
+        # Cached interpolator
+        key = ( region , component , method )
+        if( key not in self.interpolators ):
+            
+            # Table of the region and component without the fixed axes
+            table = self.peakStress[ ..., REGIONS.index( region ) , COMPONENTS.index( component ) ]
+            table = table.reshape( tuple( values.size for values in self.axes.values() if values.size > 1 ) )
+            
+            # Interpolator allocation ( no extrapolation outside the grid )
+            self.interpolators[ key ] = RegularGridInterpolator( tuple( self.axes[ name ] for name in self.interpolatedAxes() ) , table , method = method , bounds_error = True )
+        
+        # Return interpolator
+        return self.interpolators[ key ]
+    
+    # Peak stress [ MPa ] at the given parameters ( arrays broadcast together ) - Fixed axes take their grid value
+    def query( self, region: str = 'SiC', component: str = 't', method: str = 'linear', **parameters ):
+        
+        # Check parameters
+        unknown = set( parameters ) - set( AXES )
+        if( unknown ):
+            raise ValueError( 'Unknown surrogate parameters %s ( expected %s )' % ( sorted( unknown ) , AXES ) )
+        
+        # Interpolated axes
+        names = self.interpolatedAxes()
+        
+        # Query points ( missing parameters at the lower grid value )
+        values = np.broadcast_arrays( *( np.asarray( parameters.get( name , self.axes[ name ][ 0 ] ) , dtype = float ) for name in names ) )
+        
+        # Return interpolated peak stresses
+        return self.interpolator( region , component , method )( np.stack( values , axis = -1 ) )
+    
+    ###############
+    # SPOT CHECKS #
+    ###############
+    
+    # Error estimate against full FEM solves on Nsamples random points inside the grid
+    # The FEM runs use the table elements , method multiplier , mesh options and outer pressure of the build metadata
+    # Returns the sample points , FEM and surrogate peak stresses and the error summary ( also stored in the metadata )
+    def spotCheck( self, model: ModelInput, Nsamples: int = 20, region: str = 'SiC', component: str = 't', method: str = 'linear', seed: int = 0 ):
+        
+        # Random sample points inside the grid box
+        generator = np.random.default_rng( seed )
+        samples = { name: generator.uniform( values.min() , values.max() , int( Nsamples ) ) for name, values in self.axes.items() }
+        
+        # Surrogate answers
+        predicted = self.query( region , component , method , **samples )
+        
+        # Full FEM answers
+        exact = np.zeros( int( Nsamples ) )
+        for i in range( int( Nsamples ) ):
+            
+            # Model with the sample geometry and the table elements and method multiplier
+            sample = ModelInput.fromDict( { **{ name: getattr( model , name ) for name in FIELDS } , **{ name: samples[ name ][ i ] for name in GEOMETRY } ,
+                                            'Nelements': self.metadata.get( 'Nelements' , model.Nelements ) , 'beta': self.metadata.get( 'beta' , model.beta ) } )
+            
+            # Finite element initialization on the table mesh with the sample pressures
+            PyC, SiC = materials( samples[ 'phi' ][ i ] , samples[ 'T' ][ i ] , self.metadata.get( 'irrCase' , 'b' ) )
+            fem = FEM( sample, PyC, SiC, **self.metadata.get( 'options' , { } ) )
+            fem.setPressure( samples[ 'innerPressure' ][ i ] , self.metadata.get( 'outerPressure' , model.ambientPressure ) )
+            
+            # Finite element solve and peak stresses
+            fem.assembly()
+            fem.solve()
+            exact[ i ] = fem.postProcessing()[ REGIONS.index( region ) , COMPONENTS.index( component ) ]
+        
+        # Error summary
+        error = predicted - exact
+        summary = { 'region': region , 'component': component , 'method': method , 'Nsamples': int( Nsamples ) ,
+                    'maxError': float( np.abs( error ).max() ) , 'rmsError': float( np.sqrt( np.mean( error * error ) ) ) ,
+                    'maxRelativeError': float( ( np.abs( error ) / np.maximum( np.abs( exact ) , 1.0e-12 ) ).max() ) }
+        
+        # Metadata allocation
+        self.metadata.setdefault( 'spotChecks' , [ ] ).append( summary )
+        
+        # Return samples , answers and summary
+        return samples, exact, predicted, summary
+    
+    #########
+    # PRINT #
+    #########
+    
+    # Print
+    def print( self ):
+        
+        # Print header
+        print( '--------------------------------------------------------------------' )
+        print( 'Surrogate peak stress table' )
+        
+        # Loop over axes
+        for name, values in self.axes.items():
+            print( '%-16s = %d values in [ %.4g , %.4g ]' % ( name , values.size , values.min() , values.max() ) )
+        
+        # Print table size
+        print( 'Grid points      = %d ( %.2f MB )' % ( self.peakStress.size // ( len( REGIONS ) * len( COMPONENTS ) ) , self.peakStress.nbytes / 2**20 ) )
+        
+        # Loop over spot checks
+        for check in self.metadata.get( 'spotChecks' , [ ] ):
+            print( 'Spot check %s %s %-6s max error = %.4e MPa  rms = %.4e MPa  max relative = %.4e ( %d samples )' % ( check[ 'region' ] , check[ 'component' ] , check[ 'method' ] , check[ 'maxError' ] , check[ 'rmsError' ] , check[ 'maxRelativeError' ] , check[ 'Nsamples' ] ) )
+        
+        # Print footer
+        print( '--------------------------------------------------------------------' )
+
+#######################
+# COMMAND LINE DRIVER #
+#######################
+
+# Command line driver - Builds the table , runs the spot checks and saves it
+def main( argv: list = None ):
+    
+    # Argument parser
+    parser = argparse.ArgumentParser( description = 'APRICOT surrogate table of peak stresses over fluence, temperature and geometry' )
+    parser.add_argument( '--input' , default = 'InputData.xlsx' , help = 'model input file ( .xlsx / .json / .toml / .npz )' )
+    parser.add_argument( '--phi' , type = float , nargs = '+' , default = list( np.linspace( 1.0 , 10.0 , 10 ) ) , help = 'fast fluence grid values' )
+    parser.add_argument( '--T' , type = float , nargs = '+' , default = list( np.linspace( 600.0 , 1400.0 , 9 ) ) , help = 'irridiation temperature grid values [ ºC ]' )
+    parser.add_argument( '--innerPressure' , type = float , nargs = '+' , default = None , help = 'internal pressure grid values [ MPa ] ( model end of life pressure by default )' )
+    for name in GEOMETRY:
+        parser.add_argument( '--' + name , type = float , nargs = '+' , default = None , help = '%s grid values [ um ] ( model input by default )' % name )
+    parser.add_argument( '--irrCase' , default = 'b' , choices = [ 'b' , 'c' , 'd' ] , help = 'PyC irridiation correlation case' )
+    parser.add_argument( '--chunk' , type = int , default = 1000 , help = 'grid points per batch solve' )
+    parser.add_argument( '--check' , type = int , default = 20 , help = 'number of spot check FEM runs' )
+    parser.add_argument( '--method' , default = 'linear' , choices = METHODS , help = 'interpolation method of the spot checks' )
+    parser.add_argument( '--output' , default = 'surrogate.npz' , help = 'output table file' )
+    parser.add_argument( '--quiet' , action = 'store_true' , help = 'no progress reporting' )
+    args = parser.parse_args( argv )
+    
+    # Model input
+    model = ModelInput( args.input )
+    
+    # Grid axes ( geometry defaults to the model input )
+    axes = { name: getattr( args , name ) for name in AXES if getattr( args , name ) is not None }
+    
+    # Build table
+    surrogate = Surrogate.build( model , axes , args.irrCase , args.chunk , not args.quiet )
+    
+    # Spot checks
+    if( args.check > 0 ):
+        surrogate.spotCheck( model , args.check , method = args.method )
+    
+    # Save and print table
+    surrogate.save( args.output )
+    surrogate.print()
+    
+    # Exit status
+    return 0
+
+# Run from the command line
+if( __name__ == '__main__' ):
+    sys.exit( main() )
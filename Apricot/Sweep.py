@@ -0,0 +1,194 @@
+# Import system
+import sys
+
+# Import argument parser library
+import argparse
+
+# Import copy library
+import copy
+
+# Import csv library
+import csv
+
+# Import iteration library
+import itertools
+
+# Import time library
+import time
+
+# Import process pool library
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Import environment ( module folders on the path )
+import Environment
+
+# Import functions
+from ModelInput import ModelInput
+from Material import materials
+from Mesh import REGIONS
+from Batch import GEOMETRY
+from FEM import FEM
+
+###############
+# SWEEP TABLE #
+###############
+
+# Case parameters ( fluence / temperature / irridiation case / geometry )
+PARAMETERS = ( 'phi' , 'T' , 'irrCase' ) + GEOMETRY
+
+# Result columns
+RESULTS = ( 'uInner' , 'uOuter' ) + tuple( 'sigmat' + region for region in REGIONS )
+
+############
+# RUN CASE #
+############
+
+# Solve one case with its own FEM ( runs on a worker process )
+def runCase( model: ModelInput, case: dict ):
+    
+    # Model copy with the case geometry
+    model = copy.copy( model )
+    for name in GEOMETRY:
+        setattr( model , name , case[ name ] )
+    
+    # Material structs of the case
+    PyC, SiC = materials( case[ 'phi' ] , case[ 'T' ] , case[ 'irrCase' ] )
+    
+    # Finite element initialization with the end of life surface pressures
+    fem = FEM( model, PyC, SiC )
+    fem.setPressure( model.endLifeInternalPressure , model.ambientPressure )
+    
+    # Assembly and solve
+    fem.assembly()
+    fem.solve()
+    
+    # Peak stresses per region ( gauss points and element nodes )
+    peakStress = fem.postProcessing()
+    
+    # Inner and outer displacements
+    row = { 'uInner': fem.u[ 0 , 0 ] , 'uOuter': fem.u[ -1 , 0 ] }
+    
+    # Peak tangential stress per region
+    for r, region in enumerate( REGIONS ):
+        row[ 'sigmat' + region ] = peakStress[ r , 1 ]
+    
+    # Return results
+    return { name: float( value ) for name, value in row.items() }
+
+#########
+# CASES #
+#########
+
+# Case list from the parameter values - 'grid' gives every combination , 'list' pairs the i-th values
+def sweepCases( values: dict, mode: str = 'grid' ):
+    
+    # Every combination of the parameter values
+    if( mode == 'grid' ):
+        combinations = itertools.product( *( values[ name ] for name in PARAMETERS ) )
+    
+    # Pairs of the i-th parameter values ( single values are repeated )
+    elif( mode == 'list' ):
+        
+        # Number of cases
+        Ncases = max( len( values[ name ] ) for name in PARAMETERS )
+        
+        # Check list lengths
+        if( any( len( values[ name ] ) not in ( 1 , Ncases ) for name in PARAMETERS ) ):
+            raise ValueError( 'List mode needs every parameter with 1 or %d values' % Ncases )
+        
+        # Paired values
+        combinations = zip( *( values[ name ] * ( Ncases // len( values[ name ] ) ) for name in PARAMETERS ) )
+    
+    # Unknown mode
+    else:
+        raise ValueError( "Unknown sweep mode '%s' ( expected 'grid' or 'list' )" % mode )
+    
+    # Return cases
+    return [ dict( zip( PARAMETERS , combination ) ) for combination in combinations ]
+
+#########
+# SWEEP #
+#########
+
+# Run every case on a process pool and write one csv row per case as results arrive
+def sweep( model: ModelInput, cases: list, output: str, Nworkers: int = 1, progress: bool = True ):
+    
+    # Start time
+    start = time.perf_counter()
+    
+    # Time of the last progress report
+    reported = - 1.0
+    
+    # Open output table
+    with open( output , 'w' , newline = '' ) as file:
+        
+        # Table writer
+        writer = csv.DictWriter( file , fieldnames = ( 'case' , ) + PARAMETERS + RESULTS )
+        writer.writeheader()
+        
+        # Process pool ( one FEM per task )
+        with ProcessPoolExecutor( max_workers = Nworkers ) as pool:
+            
+            # Submit cases
+            futures = { pool.submit( runCase , model , case ): i for i, case in enumerate( cases ) }
+            
+            # Loop over finished cases
+            for n, future in enumerate( as_completed( futures ) , start = 1 ):
+                
+                # Case index
+                i = futures[ future ]
+                
+                # Write case row
+                writer.writerow( { 'case': i , **cases[ i ] , **future.result() } )
+                
+                # Elapsed time
+                elapsed = time.perf_counter() - start
+                
+                # Print progress ( at most twice per second )
+                if( progress and ( elapsed - reported >= 0.5 or n == len( cases ) ) ):
+                    reported = elapsed
+                    print( '\r[ %d / %d ] cases done - %.1f s elapsed - %.1f s left' % ( n , len( cases ) , elapsed , elapsed * ( len( cases ) - n ) / n ) , end = '' , file = sys.stderr , flush = True )
+    
+    # End progress line
+    if( progress ):
+        print( file = sys.stderr )
+
+################
+# COMMAND LINE #
+################
+
+# Command line entry point
+def main( argv: list = None ):
+    
+    # Argument parser
+    parser = argparse.ArgumentParser( description = 'APRICOT parameter sweep over fluence, temperature, irridiation case and geometry' )
+    parser.add_argument( '--input' , default = 'InputData.xlsx' , help = 'model input file ( .xlsx / .json / .toml / .npz )' )
+    parser.add_argument( '--phi' , type = float , nargs = '+' , default = [ 10.0 ] , help = 'fast fluence values' )
+    parser.add_argument( '--T' , type = float , nargs = '+' , default = [ 1000.0 ] , help = 'irridiation temperature values [ ºC ]' )
+    parser.add_argument( '--irrCase' , nargs = '+' , default = [ 'b' ] , choices = [ 'b' , 'c' , 'd' ] , help = 'PyC irridiation correlation cases' )
+    for name in GEOMETRY:
+        parser.add_argument( '--' + name , type = float , nargs = '+' , default = None , help = '%s values [ um ] ( model input by default )' % name )
+    parser.add_argument( '--mode' , default = 'grid' , choices = [ 'grid' , 'list' ] , help = 'grid = every combination , list = i-th values paired' )
+    parser.add_argument( '--workers' , type = int , default = None , help = 'number of worker processes ( all cores by default )' )
+    parser.add_argument( '--output' , default = 'sweep.csv' , help = 'output csv table' )
+    parser.add_argument( '--quiet' , action = 'store_true' , help = 'no progress reporting' )
+    args = parser.parse_args( argv )
+    
+    # Model input
+    model = ModelInput( args.input )
+    
+    # Parameter values ( geometry defaults to the model input )
+    values = { name: getattr( args , name ) for name in PARAMETERS }
+    for name in GEOMETRY:
+        if( values[ name ] is None ):
+            values[ name ] = [ float( getattr( model , name ) ) ]
+    
+    # Sweep cases
+    cases = sweepCases( values , args.mode )
+    
+    # Run sweep
+    sweep( model , cases , args.output , args.workers , not args.quiet )
+
+# Run from the command line
+if( __name__ == '__main__' ):
+    main()